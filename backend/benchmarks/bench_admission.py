@@ -0,0 +1,120 @@
+"""점심 직전 몰림: 요청 수락 제어를 끈 경우 vs 켠 경우 (가짜 기상청·LLM 서버)
+
+LLM 경로(/api/recommend, 매번 다른 메뉴의 /api/recipe)에 동시 요청을 많이 보내면서
+/api/weather를 적은 동시 요청으로 계속 조회해, 과부하 중에도 날씨가 빠르게 응답하는지와
+LLM 경로가 모두 함께 느려지는 대신 빨리 거절(429)되거나 LLM 없는 추천으로 낮춰지는지 봅니다.
+LLM 경로 클라이언트는 응답을 받으면 --think초 쉬고(사용자가 결과를 보는 시간),
+429를 받으면 Retry-After(최대 --max-retry-after초)만큼 쉬고 다시 요청합니다.
+
+보고 항목: 경로별 p50/p95/p99(ms), 상태 코드별 개수, 초당 성공 수, 추천 출처별 개수,
+수락 제어 결과(/admin/admission)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_admission --llm-clients 200 --weather-clients 10 --duration 20
+"""
+from collections import Counter
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from benchmarks.common import run_server, summarize
+from benchmarks.suite import SCENARIOS
+
+
+async def run_burst(app_url: str, args) -> Dict:
+    limits = httpx.Limits(max_connections=args.llm_clients + args.weather_clients + 4)
+    async with httpx.AsyncClient(base_url=app_url, timeout=60.0, limits=limits) as client:
+        counter = iter(range(10 ** 9))
+        latencies: Dict[str, List[float]] = {"weather": [], "recommend": [], "recipe": []}
+        statuses: Dict[str, Counter] = {name: Counter() for name in latencies}
+        sources: Counter = Counter()
+        stop = asyncio.Event()
+
+        async def worker(names: List[str], think: float):
+            while not stop.is_set():
+                i = next(counter)
+                name = names[i % len(names)]
+                if name == "recipe":
+                    # 캐시되지 않도록 매번 다른 메뉴 (항상 LLM 호출)
+                    method, path, kwargs = "POST", "/api/recipe", {"json": {"menu_name": f"메뉴{i}"}}
+                else:
+                    method, path, kwargs = SCENARIOS[name](i)
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    response, status = None, "error"
+                if stop.is_set():
+                    return
+                latencies[name].append(time.perf_counter() - start)
+                statuses[name][status] += 1
+                if status == 200 and name == "recommend":
+                    sources[response.json()["data"].get("source", "unknown")] += 1
+                if status == 429:
+                    await asyncio.sleep(min(float(response.headers.get("retry-after", "1")), args.max_retry_after))
+                elif think:
+                    await asyncio.sleep(think)
+
+        tasks = [asyncio.create_task(worker(["recommend", "recipe"], args.think)) for _ in range(args.llm_clients)]
+        tasks += [asyncio.create_task(worker(["weather"], 0)) for _ in range(args.weather_clients)]
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+        admission = (await client.get("/admin/admission")).json()
+
+    return {
+        "routes": {
+            name: dict(
+                summarize(samples),
+                statuses={str(status): count for status, count in sorted(statuses[name].items(), key=str)},
+                ok_per_second=round(statuses[name][200] / args.duration, 2),
+            )
+            for name, samples in latencies.items()
+        },
+        "recommend_sources": dict(sources),
+        "admission": admission["results"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-clients", type=int, default=200, help="LLM 경로 동시 요청 수")
+    parser.add_argument("--weather-clients", type=int, default=10, help="/api/weather 동시 요청 수")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="LLM_MAX_CONCURRENCY")
+    parser.add_argument("--think", type=float, default=1.0, help="LLM 경로 클라이언트가 응답 후 쉬는 시간 (초)")
+    parser.add_argument("--max-retry-after", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    report = {"params": vars(args)}
+    llm_env = {"FAKE_LLM_LATENCY": str(args.llm_latency), "FAKE_LLM_JITTER": "0.2"}
+    with run_server("benchmarks.fake_llm:app", args.port + 1, llm_env) as llm_url, \
+            run_server("benchmarks.fake_kma:app", args.port + 2) as kma_url:
+        for enabled in ("false", "true"):
+            app_env = {
+                "OPENAI_API_KEY": "fake-key",
+                "OPENAI_BASE_URL": f"{llm_url}/v1",
+                "WEATHER_API_KEY": "fake-key",
+                "WEATHER_API_BASE_URL": kma_url,
+                "LLM_MAX_CONCURRENCY": str(args.llm_concurrency),
+                "ADMISSION_ENABLED": enabled,
+                "PREFETCH_ENABLED": "false",
+                "RECIPE_CACHE_PATH": ":memory:",
+                "FEEDBACK_DB_PATH": ":memory:",
+                "LOG_LEVEL": "WARNING",
+            }
+            with run_server("main:app", args.port, app_env, ready_path="/ready") as app_url:
+                key = "admission" if enabled == "true" else "no_admission"
+                report[key] = asyncio.run(run_burst(app_url, args))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""규칙 기반 추천(_get_smart_recommendation) 초당 추천 수 마이크로벤치마크
+
+기본 카탈로그와, 같은 구조로 부풀린 대형 카탈로그(--dishes개)에서 각각 측정합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_fallback --dishes 5000
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "")
+os.environ.setdefault("RECIPE_CACHE_PATH", ":memory:")
+
+from services.ai_service import AIService
+from services.menu_catalog import DEFAULT_PATH, MenuCatalog, load_catalog
+
+FOOD_TYPES = ["상관없음", "한식", "중식", "일식", "양식", "분식"]
+MOODS = ["평범한", "기쁜", "슬픈", "화난", "피곤한", "스트레스"]
+WEATHERS = [
+    {"temperature": 3.0, "sky_condition": "맑음", "precipitation": "없음"},
+    {"temperature": 18.0, "sky_condition": "구름많음", "precipitation": "없음"},
+    {"temperature": 30.0, "sky_condition": "맑음", "precipitation": "없음"},
+    {"temperature": 15.0, "sky_condition": "흐림", "precipitation": "비"},
+]
+
+
+def inflate(catalog: MenuCatalog, size: int) -> MenuCatalog:
+    """기본 카탈로그 메뉴를 복제해 size개짜리 카탈로그 생성"""
+    items = []
+    for i, item in enumerate(itertools.islice(itertools.cycle(catalog.items), size)):
+        items.append({
+            "name": f"{item.name} #{i}",
+            "category": item.category,
+            "band": item.band,
+            "spicy": item.spicy,
+            "reason": item.reason,
+        })
+    with open(os.getenv("MENU_CATALOG_PATH", DEFAULT_PATH), encoding="utf-8") as f:
+        mood_affinity = json.load(f)["mood_affinity"]
+    return MenuCatalog(items, mood_affinity)
+
+
+def measure(service: AIService, iterations: int) -> float:
+    cases = list(itertools.product(WEATHERS, FOOD_TYPES, MOODS))
+    start = time.perf_counter()
+    for i in range(iterations):
+        weather, food_type, mood = cases[i % len(cases)]
+        service._get_smart_recommendation(weather, {"food_type": food_type, "mood": mood, "num_people": 1})
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--dishes", type=int, default=5000)
+    args = parser.parse_args()
+
+    service = AIService()
+    results = {}
+    base = load_catalog()
+    for name, catalog in (("default", base), (f"inflated_{args.dishes}", inflate(base, args.dishes))):
+        service.catalog = catalog
+        results[name] = {
+            "dishes": len(catalog),
+            "recommendations_per_sec": round(measure(service, args.iterations)),
+        }
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""단기예보 응답 파싱 벤치마크: 예전 항목별 덮어쓰기 파서 vs 발표분 전체 시계열(ForecastSeries)
+
+기상청 응답을 저장한 JSON 파일(--payload, 여러 개 가능)이나
+가짜 서버와 같은 방식으로 만든 발표분 전체 응답(격자 --cells개)을 파싱합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_forecast_parse --cells 200
+    python -m benchmarks.bench_forecast_parse --payload recorded/vilage_60_127.json
+"""
+from datetime import datetime, timedelta
+import argparse
+import json
+import time
+
+from benchmarks.fake_kma import make_items, make_response
+from services.forecast_series import ForecastSeries
+
+
+def legacy_parse(items):
+    """예전 파서 (같은 항목은 마지막 행이 덮어씀)"""
+    weather = {"temperature": None, "sky_condition": None, "precipitation": None, "humidity": None}
+    for item in items:
+        category = item["category"]
+        value = item["fcstValue"]
+        if category == "TMP":
+            weather["temperature"] = float(value)
+        elif category == "SKY":
+            weather["sky_condition"] = {"1": "맑음", "3": "구름많음", "4": "흐림"}.get(value, "알 수 없음")
+        elif category == "PTY":
+            weather["precipitation"] = {"0": "없음", "1": "비", "2": "비/눈", "3": "눈", "4": "소나기"}.get(value, "없음")
+        elif category == "REH":
+            weather["humidity"] = int(value)
+    return weather
+
+
+def load_payloads(args):
+    if args.payload:
+        payloads = []
+        for path in args.payload:
+            with open(path, encoding="utf-8") as f:
+                payloads.append(f.read())
+        return payloads
+    base_date = datetime.now().strftime("%Y%m%d")
+    return [
+        json.dumps(make_response(make_items(base_date, "0500", 50 + i % 60, 100 + i // 60)), ensure_ascii=False)
+        for i in range(args.cells)
+    ]
+
+
+def timed(fn, payloads, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            fn(payload)
+    return (time.perf_counter() - start) / (repeat * len(payloads))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payload", action="append", help="저장한 getVilageFcst JSON 응답 파일")
+    parser.add_argument("--cells", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args)
+    items = [json.loads(payload)["response"]["body"]["items"]["item"] for payload in payloads]
+    rows = sum(len(batch) for batch in items) // len(items)
+
+    def decode(payload):
+        return json.loads(payload)["response"]["body"]["items"]["item"]
+
+    decode_ms = timed(decode, payloads, args.repeat) * 1000
+    legacy_ms = timed(legacy_parse, items, args.repeat) * 1000
+    series_ms = timed(ForecastSeries.from_items, items, args.repeat) * 1000
+
+    # 같은 발표분 안의 임의 시각 조회 (업스트림 호출 없음)
+    series = ForecastSeries.from_items(items[0])
+    first = series.times[0].astype(datetime)
+    lookups = 100000
+    start = time.perf_counter()
+    for i in range(lookups):
+        series.at(first + timedelta(minutes=17 * i % (len(series) * 60)))
+    lookup_rate = lookups / (time.perf_counter() - start)
+
+    print(json.dumps({
+        "payloads": len(payloads),
+        "rows_per_payload": rows,
+        "forecast_hours": len(series),
+        "json_decode_ms": round(decode_ms, 3),
+        "legacy_parse_ms": round(legacy_ms, 3),
+        "series_parse_ms": round(series_ms, 3),
+        "series_bytes": series.times.nbytes + series.values.nbytes,
+        "lookups_per_sec": round(lookup_rate),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""위경도 → 격자 변환과 행정구역 이름 검색 초당 처리량
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_grid --points 1000000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from services.area_index import load_area_index
+from services.kma_grid import grid_coords, latlon_to_grid
+
+NAMES = ["서울", "강남", "여의도", "판교", "서울특별시 마포구", "수원", "서귀포", "강난구", "부산"]
+
+
+def rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=1000000)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(33.0, 38.6, args.points)
+    lon = rng.uniform(124.5, 131.0, args.points)
+
+    start = time.perf_counter()
+    latlon_to_grid(lat, lon)
+    bulk = args.points / (time.perf_counter() - start)
+
+    index = load_area_index()
+    results = {
+        "areas": len(index),
+        "grid_single_per_sec": round(rate(lambda i: grid_coords(lat[i], lon[i]), args.iterations)),
+        "grid_bulk_points_per_sec": round(bulk),
+        "lookup_exact_per_sec": round(rate(lambda i: index.lookup(NAMES[i % len(NAMES)]), args.iterations)),
+        "search_prefix_per_sec": round(rate(lambda i: index.search(NAMES[i % len(NAMES)][:2], 5), args.iterations)),
+        "fuzzy_per_sec": round(rate(lambda i: index.fuzzy(NAMES[i % len(NAMES)], 1), args.iterations // 10)),
+        "resolve_cached_per_sec": round(rate(lambda i: index.resolve(NAMES[i % len(NAMES)]), args.iterations)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
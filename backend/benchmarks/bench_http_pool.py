@@ -0,0 +1,91 @@
+"""요청마다 새 httpx 클라이언트 vs 공유 연결 풀 클라이언트 비교
+
+연결 수를 세는 로컬 HTTP/1.1 스텁 서버를 띄우고, 같은 수의 요청을 두 방식으로
+보내 초당 요청 수와 서버가 받은 TCP 연결 수를 비교합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_http_pool --requests 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from services.http_client import create_http_client
+
+BODY = json.dumps({"response": {"body": {"items": {"item": []}}}}).encode()
+
+
+class StubServer:
+    """keep-alive를 지원하는 최소 HTTP/1.1 서버 (연결 수 집계)"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                await asyncio.sleep(self.latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(BODY)}\r\n\r\n".encode()
+                    + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(mode: str, url: str, total: int, concurrency: int) -> float:
+    """total개 요청을 concurrency개 작업자로 보내고 초당 요청 수 반환"""
+    shared = create_http_client() if mode == "shared" else None
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            if shared is not None:
+                response = await shared.get(url)
+            else:
+                async with httpx.AsyncClient() as client:
+                    response = await client.get(url)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if shared is not None:
+        await shared.aclose()
+    return total / elapsed
+
+
+async def main(args):
+    results = {}
+    for mode in ("per_request", "shared"):
+        stub = StubServer(args.latency)
+        server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        rps = await run(mode, f"http://127.0.0.1:{port}/getVilageFcst", args.requests, args.concurrency)
+        server.close()
+        await server.wait_closed()
+        results[mode] = {"requests_per_sec": round(rps, 1), "tcp_connections": stub.connections}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005)
+    asyncio.run(main(parser.parse_args()))
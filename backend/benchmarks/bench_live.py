@@ -0,0 +1,138 @@
+"""실시간 구독(/ws/live) 유휴 연결 비용: 연결 N개의 서버 메모리·CPU와 기상청 조회 수 (가짜 기상청 서버)
+
+연결마다 위치 몇 곳 중 하나를 구독하고 첫 날씨 메시지를 받을 때까지 기다린 뒤,
+--idle 초 동안 아무것도 보내지 않고 서버 프로세스의 CPU 사용 시간을 잽니다 (uvicorn ping 포함).
+보고 항목: 연결당 RSS 증가(KB), 연결 수립 CPU(연결당 ms), 유휴 CPU(%), 기상청 요청 수, 첫 메시지까지 시간
+--deflate로 permessage-deflate를 켠 경우(uvicorn 기본값)와 비교할 수 있습니다.
+
+실행 (backend 디렉터리에서, 열 수 있는 파일 수 제한이 연결 수보다 커야 함: ulimit -n):
+    python -m benchmarks.bench_live --connections 10000 --idle 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+import websockets
+
+from benchmarks.common import BACKEND_DIR, run_server, summarize, wait_ready
+
+LOCATIONS = [
+    "서울", "강남구", "서초구", "송파구", "마포구", "종로구", "중구", "용산구", "성동구", "영등포구",
+    "판교", "부산", "대구", "인천", "광주", "대전", "울산", "수원", "성남", "고양",
+]
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def cpu_seconds(pid: int) -> float:
+    """프로세스 사용자 + 시스템 CPU 시간 (초)"""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+async def open_connections(ws_url: str, count: int, concurrency: int):
+    """연결 count개를 열고 각각 첫 날씨 메시지까지 걸린 시간과 연결 목록 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+    connections = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            location = LOCATIONS[i % len(LOCATIONS)]
+            # 클라이언트 쪽 ping은 끔 (서버 ping만 측정에 포함)
+            connection = await websockets.connect(
+                f"{ws_url}/ws/live?location={location}", ping_interval=None, open_timeout=60
+            )
+            message = json.loads(await connection.recv())
+            assert message["type"] == "weather"
+            samples.append(time.perf_counter() - start)
+            connections.append(connection)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return samples, connections
+
+
+async def measure(app_url: str, pid: int, args) -> dict:
+    ws_url = app_url.replace("http://", "ws://")
+    rss_before = rss_kb(pid)
+    cpu_before = cpu_seconds(pid)
+    started = time.perf_counter()
+    samples, connections = await open_connections(ws_url, args.connections, args.concurrency)
+    connect_seconds = time.perf_counter() - started
+    cpu_connected = cpu_seconds(pid)
+    rss_after = rss_kb(pid)
+
+    await asyncio.sleep(args.idle)
+    cpu_idle = cpu_seconds(pid) - cpu_connected
+    async with httpx.AsyncClient(base_url=app_url) as client:
+        live = (await client.get("/admin/live")).json()
+
+    await asyncio.gather(*(connection.close() for connection in connections))
+    return {
+        "connections": len(connections),
+        "connect_seconds": round(connect_seconds, 2),
+        "first_message": summarize(samples),
+        "server_rss_mb": {"before": round(rss_before / 1024, 1), "after": round(rss_after / 1024, 1)},
+        "rss_per_connection_kb": round((rss_after - rss_before) / len(connections), 2),
+        "connect_cpu_ms_per_connection": round((cpu_connected - cpu_before) * 1000 / len(connections), 3),
+        "idle_cpu_percent": round(cpu_idle / args.idle * 100, 2),
+        "cells": live["cells"],
+        "weather_fetches": live["fetches"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=200, help="동시에 여는 연결 수")
+    parser.add_argument("--idle", type=float, default=30, help="유휴 CPU 측정 시간 (초)")
+    parser.add_argument("--deflate", action="store_true", help="permessage-deflate 사용 (LIVE_PER_MESSAGE_DEFLATE=true)")
+    parser.add_argument("--port", type=int, default=8780)
+    args = parser.parse_args()
+
+    with run_server("benchmarks.fake_kma:app", args.port + 1) as kma_url:
+        env = dict(
+            os.environ,
+            WEATHER_API_KEY="fake-key",
+            WEATHER_API_BASE_URL=kma_url,
+            PREFETCH_ENABLED="false",
+            RECIPE_CACHE_PATH=":memory:",
+            LIVE_MAX_CONNECTIONS=str(args.connections * 2),
+            LOG_LEVEL="WARNING",
+        )
+        # 서버 프로세스의 메모리·CPU를 읽기 위해 직접 실행 (run_server는 pid를 알려 주지 않음)
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(args.port),
+             "--log-level", "warning", "--backlog", "4096",
+             "--ws-per-message-deflate", "true" if args.deflate else "false"],
+            cwd=BACKEND_DIR, env=env
+        )
+        try:
+            app_url = f"http://127.0.0.1:{args.port}"
+            wait_ready(app_url + "/ready")
+            report = asyncio.run(measure(app_url, proc.pid, args))
+            report["per_message_deflate"] = args.deflate
+            report["kma_requests"] = httpx.get(f"{kma_url}/stats").json()["pages"]
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""주 사용 흐름 종단 시간: 날씨 → 추천 → 레시피 3번 요청 vs POST /api/lunch 1번 (가짜 기상청·LLM 서버)
+
+반복마다 기분 값을 바꿔 추천은 매번 LLM을 호출합니다 (레시피는 메뉴가 같아 첫 회 이후 캐시).
+--rtt로 요청마다 네트워크 왕복 지연(초)을 더해 모바일 환경을 흉내 낼 수 있습니다.
+보고 항목: 흐름별 p50/p95(ms), 요청 수, 응답 바이트(압축 후, Accept-Encoding: gzip)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_lunch --iterations 30 --rtt 0.05
+"""
+from typing import Dict, List, Tuple
+import argparse
+import json
+import time
+
+import httpx
+
+from benchmarks.common import run_server, summarize
+
+
+class Flow:
+    """요청마다 rtt만큼 지연을 더하고 요청 수·바이트 수를 세는 클라이언트"""
+
+    def __init__(self, client: httpx.Client, rtt: float):
+        self.client = client
+        self.rtt = rtt
+        self.requests = 0
+        self.bytes = 0
+
+    def call(self, method: str, url: str, **kwargs) -> Dict:
+        time.sleep(self.rtt)
+        response = self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        self.requests += 1
+        self.bytes += response.num_bytes_downloaded
+        return response.json()
+
+
+def sequential(flow: Flow, body: Dict) -> None:
+    flow.call("GET", "/api/weather", params={"location": body["location"]})
+    recommendation = flow.call("POST", "/api/recommend", json=body)["data"]
+    flow.call("POST", "/api/recipe", json={"menu_name": recommendation["menu"], "num_servings": body["num_people"]})
+
+
+def composite(flow: Flow, body: Dict) -> None:
+    data = flow.call("POST", "/api/lunch", json=dict(body, include_recipe=True))["data"]
+    if data["recipe"] is None:
+        # 시간 안에 레시피가 준비되지 않았으면 이어서 요청 (생성 중인 작업에 합류)
+        flow.call("POST", "/api/recipe", json={"menu_name": data["recommendation"]["menu"], "num_servings": body["num_people"]})
+
+
+def measure(app_url: str, fn, iterations: int, rtt: float, label: str) -> Tuple[List[float], Flow]:
+    samples = []
+    with httpx.Client(base_url=app_url, timeout=60.0, headers={"Accept-Encoding": "gzip"}) as client:
+        flow = Flow(client, rtt)
+        for i in range(iterations):
+            body = {"location": "강남구", "mood": f"{label}-{i}", "num_people": 2}
+            start = time.perf_counter()
+            fn(flow, body)
+            samples.append(time.perf_counter() - start)
+    return samples, flow
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--rtt", type=float, default=0.05, help="요청당 더할 네트워크 왕복 지연 (초)")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--recipe-wait", type=float, default=2.0, help="LUNCH_RECIPE_WAIT_SECONDS")
+    parser.add_argument("--port", type=int, default=8700)
+    args = parser.parse_args()
+
+    with run_server("benchmarks.fake_llm:app", args.port + 1, {"FAKE_LLM_LATENCY": str(args.llm_latency)}) as llm_url, \
+            run_server("benchmarks.fake_kma:app", args.port + 2) as kma_url:
+        app_env = {
+            "OPENAI_API_KEY": "fake-key",
+            "OPENAI_BASE_URL": f"{llm_url}/v1",
+            "WEATHER_API_KEY": "fake-key",
+            "WEATHER_API_BASE_URL": kma_url,
+            "PREFETCH_ENABLED": "false",
+            "RECIPE_CACHE_PATH": ":memory:",
+            "LUNCH_RECIPE_WAIT_SECONDS": str(args.recipe_wait),
+            "LOG_LEVEL": "WARNING",
+        }
+        report = {"iterations": args.iterations, "rtt_ms": args.rtt * 1000, "llm_latency_ms": args.llm_latency * 1000}
+        # 흐름마다 서버를 새로 띄워 캐시 상태를 같게 맞춤
+        for label, fn in (("sequential", sequential), ("composite", composite)):
+            with run_server("main:app", args.port, app_env, ready_path="/ready") as app_url:
+                samples, flow = measure(app_url, fn, args.iterations, args.rtt, label)
+            report[label] = dict(
+                summarize(samples),
+                requests_per_flow=round(flow.requests / args.iterations, 2),
+                bytes_per_flow=round(flow.bytes / args.iterations),
+            )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
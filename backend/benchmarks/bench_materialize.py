@@ -0,0 +1,131 @@
+"""추천 사전 계산: 요청마다 계산(끄기) vs 발표분별로 미리 계산한 표 조회(켜기) (가짜 기상청·LLM 서버)
+
+인기 격자(--popular개 위치를 PREFETCH_SEED_LOCATIONS로 지정)의 사전 계산이 끝나길 기다린 뒤,
+전국 행정구역에 대해 --popular-share 비율은 인기 위치로, 나머지는 그 밖의 위치로 /api/recommend를 보냅니다.
+음식 종류·기분은 화면의 선택지에서 무작위로, 인원은 대부분 1명(일부 2~10명),
+--multi-share 비율은 다인 모드(사람별 기분)로 보냅니다.
+
+보고 항목: 사전 계산 시간(단계별), 표 행 수·크기, 실제 요청 적중률(/admin/materialize),
+추천 p50/p95/p99(ms), 추천 출처별 개수
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_materialize --requests 2000 --concurrency 20
+"""
+from collections import Counter
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from benchmarks.common import run_server, summarize
+from services.area_index import load_area_index
+
+FOOD_TYPES = ["상관없음", "한식", "중식", "일식", "양식", "분식"]
+MOODS = ["평범한", "기쁜", "슬픈", "화난", "피곤한", "스트레스"]
+
+
+def make_requests(popular: List[str], others: List[str], args) -> List[Dict]:
+    rng = random.Random(args.seed)
+    requests = []
+    for _ in range(args.requests):
+        location = rng.choice(popular if rng.random() < args.popular_share or not others else others)
+        num_people = 1 if rng.random() < 0.7 else rng.randint(2, 10)
+        body = {"location": location, "food_type": rng.choice(FOOD_TYPES), "mood": rng.choice(MOODS), "num_people": num_people}
+        if num_people > 1 and rng.random() < args.multi_share / 0.3:
+            body["moods"] = [rng.choice(MOODS) for _ in range(num_people)]
+        requests.append(body)
+    return requests
+
+
+async def wait_for_build(client: httpx.AsyncClient, timeout: float) -> Dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = (await client.get("/admin/materialize")).json()
+        if stats["builds"]:
+            return stats
+        await asyncio.sleep(0.2)
+    raise RuntimeError("사전 계산이 끝나지 않았습니다.")
+
+
+async def replay(app_url: str, requests: List[Dict], args, materialized: bool) -> Dict:
+    async with httpx.AsyncClient(base_url=app_url, timeout=60.0) as client:
+        report = {}
+        if materialized:
+            stats = await wait_for_build(client, args.build_timeout)
+            report["build"] = stats["last_build"]
+            report["table"] = stats["table"]
+        queue = iter(requests)
+        latencies: List[float] = []
+        sources: Counter = Counter()
+
+        async def worker():
+            for body in queue:
+                start = time.perf_counter()
+                response = await client.post("/api/recommend", json=body)
+                latencies.append(time.perf_counter() - start)
+                sources[response.json()["data"].get("source", "unknown") if response.status_code == 200 else response.status_code] += 1
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        report["recommend"] = summarize(latencies)
+        report["sources"] = dict(sources)
+        if materialized:
+            report["lookups"] = (await client.get("/admin/materialize")).json()["lookups"]
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--popular", type=int, default=50, help="사전 계산할 인기 위치 수 (PREFETCH_TOP_CELLS)")
+    parser.add_argument("--popular-share", type=float, default=0.9, help="인기 위치로 보내는 요청 비율")
+    parser.add_argument("--multi-share", type=float, default=0.05, help="다인 모드(사람별 기분) 요청 비율")
+    parser.add_argument("--processes", type=int, default=0, help="MATERIALIZE_PROCESSES")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="MATERIALIZE_LLM_CONCURRENCY")
+    parser.add_argument("--no-llm", action="store_true", help="OpenAI 키 없이 (규칙 기반만)")
+    parser.add_argument("--build-timeout", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args()
+
+    areas = load_area_index()
+    names = [areas._area(row).name for row in range(len(areas))]
+    random.Random(args.seed).shuffle(names)
+    popular, others = names[:args.popular], names[args.popular:]
+    requests = make_requests(popular, others, args)
+
+    report = {"params": vars(args)}
+    llm_env = {"FAKE_LLM_LATENCY": str(args.llm_latency), "FAKE_LLM_JITTER": "0.2"}
+    with run_server("benchmarks.fake_llm:app", args.port + 1, llm_env) as llm_url, \
+            run_server("benchmarks.fake_kma:app", args.port + 2) as kma_url:
+        for enabled in ("false", "true"):
+            app_env = {
+                "OPENAI_API_KEY": "" if args.no_llm else "fake-key",
+                "OPENAI_BASE_URL": f"{llm_url}/v1",
+                "WEATHER_API_KEY": "fake-key",
+                "WEATHER_API_BASE_URL": kma_url,
+                "PREFETCH_SEED_LOCATIONS": ",".join(popular),
+                "PREFETCH_TOP_CELLS": str(args.popular),
+                "MATERIALIZE_ENABLED": enabled,
+                "MATERIALIZE_PROCESSES": str(args.processes),
+                "MATERIALIZE_LLM_CONCURRENCY": str(args.llm_concurrency),
+                "MATERIALIZE_DB_PATH": ":memory:",
+                "RANKER_ENABLED": "false",
+                "ADMISSION_ENABLED": "false",
+                "RECIPE_CACHE_PATH": ":memory:",
+                "FEEDBACK_DB_PATH": ":memory:",
+                "LOG_LEVEL": "WARNING",
+            }
+            with run_server("main:app", args.port, app_env, ready_path="/ready") as app_url:
+                key = "materialized" if enabled == "true" else "on_demand"
+                report[key] = asyncio.run(replay(app_url, requests, args, enabled == "true"))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""계측 비용 마이크로벤치마크 (구간 측정·카운터·히스토그램·미들웨어, 호출당 µs)
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_metrics --iterations 1000000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from services.metrics import Counter, Histogram, MetricsMiddleware, Registry, RequestProfiler, span
+
+
+def per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def empty():
+    pass
+
+
+def with_span():
+    with span("bench.span"):
+        pass
+
+
+async def asgi_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def middleware_us(iterations: int):
+    """최소 ASGI 앱을 직접 호출해 미들웨어 유무 차이 측정"""
+    wrapped = MetricsMiddleware(asgi_app, profiler=RequestProfiler(sample_rate=0))
+    scope = {"type": "http", "method": "GET", "path": "/health"}
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        pass
+
+    async def run(app):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await app(dict(scope), receive, send)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    bare = await run(asgi_app)
+    return bare, await run(wrapped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=1000000)
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = Counter("bench_total", "bench", ("kind",), registry=registry)
+    histogram = Histogram("bench_seconds", "bench", ("kind",), registry=registry)
+
+    baseline = per_call_us(empty, args.iterations)
+    bare, wrapped = asyncio.run(middleware_us(args.iterations // 10))
+    results = {
+        "span_us": round(per_call_us(with_span, args.iterations) - baseline, 3),
+        "counter_inc_us": round(per_call_us(lambda: counter.inc("a"), args.iterations) - baseline, 3),
+        "histogram_observe_us": round(per_call_us(lambda: histogram.observe(0.012, "a"), args.iterations) - baseline, 3),
+        "middleware_us": round(wrapped - bare, 3),
+    }
+
+    start = time.perf_counter()
+    for _ in range(100):
+        registry.render()
+    results["render_ms"] = round((time.perf_counter() - start) / 100 * 1000, 3)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
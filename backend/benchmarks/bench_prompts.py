@@ -0,0 +1,141 @@
+"""프롬프트 크기 비교: 예전 들여쓰기 f-string 프롬프트 vs PromptCompiler
+
+용도별로 메시지 바이트 수, 프롬프트 토큰 수, max_tokens, 최대 비용(프롬프트 + max_tokens 전부 사용 시),
+프롬프트 생성 시간을 보고합니다. 토큰 수는 tiktoken이 있으면 그것으로, 없으면 근사치로 셉니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_prompts --batch-size 5
+"""
+import argparse
+import json
+import time
+
+from services.prompts import PromptCompiler, count_message_tokens, tokenizer_name
+
+WEATHER = {"location": "서울", "temperature": 3.5, "sky_condition": "흐림", "precipitation": "비"}
+PREFERENCES = {"num_people": 3, "food_type": "한식", "mood": "피곤한", "moods": ["피곤한", "신나는", "평범한"]}
+
+
+def legacy_recommend(weather, preferences):
+    """예전 추천 메시지 (max_tokens 500)"""
+    prompt = f"""
+        현재 날씨 정보:
+        - 위치: {weather.get("location", "서울")}
+        - 기온: {weather.get("temperature", 20)}°C
+        - 날씨: {weather.get("sky_condition", "맑음")}
+        - 강수: {weather.get("precipitation", "없음")}
+        """
+    if preferences:
+        prompt += f"""
+
+        사용자 정보:
+        - 인원: {preferences.get("num_people", 1)}명
+        - 음식 종류: {preferences.get("food_type", "상관없음")}
+        - 기분: {preferences.get("mood", "평범한")}
+            """
+        moods = preferences.get("moods", [])
+        if moods and len(moods) > 1:
+            prompt += f"\n        - 각 사람의 기분: {', '.join(moods)}"
+    prompt += """
+
+        위 정보를 바탕으로 직장인에게 적합한 점심 메뉴를 추천해주세요.
+        날씨가 추우면 따뜻한 음식, 더우면 시원한 음식을 추천하고,
+        비가 오면 국물 요리를, 맑은 날은 다양한 선택지를 제안해주세요.
+        기분 상태도 고려해서 추천해주세요.
+        """
+    system = """당신은 직장인들을 위한 점심 메뉴 추천 전문가입니다.
+                        날씨, 계절, 온도를 고려하여 최적의 메뉴를 추천해주세요.
+                        응답은 반드시 JSON 형식으로 다음 구조를 따라주세요:
+                        {
+                            "menu": "메뉴명",
+                            "category": "한식/중식/일식/양식/분식",
+                            "reason": "추천 이유 (100자 이내)",
+                            "temperature_match": "온도와의 연관성",
+                            "alternatives": ["대체 메뉴1", "대체 메뉴2"]
+                        }"""
+    return [{"role": "system", "content": system}, {"role": "user", "content": prompt}], 500
+
+
+def legacy_recipe(menu_name, num_servings):
+    """예전 레시피 메시지 (max_tokens 1000)"""
+    prompt = f"""
+            '{menu_name}' 메뉴의 {num_servings}인분 레시피를 작성해주세요.
+
+            다음 형식으로 JSON 응답해주세요:
+            {{
+                "menu_name": "메뉴명",
+                "servings": {num_servings},
+                "ingredients": [
+                    {{"name": "재료명", "amount": "양"}},
+                ],
+                "steps": [
+                    "1단계 설명",
+                    "2단계 설명",
+                ],
+                "cooking_time": "조리 시간",
+                "difficulty": "쉬움/보통/어려움"
+            }}
+            """
+    return [
+        {"role": "system", "content": "당신은 요리 전문가입니다. 자세하고 실용적인 레시피를 제공해주세요."},
+        {"role": "user", "content": prompt}
+    ], 1000
+
+
+def timed_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def summarize(messages, max_tokens, build_us, price_prompt, price_completion):
+    prompt_tokens = count_message_tokens(messages)
+    return {
+        "bytes": sum(len(m["content"].encode()) for m in messages),
+        "prompt_tokens": prompt_tokens,
+        "max_tokens": max_tokens,
+        "max_cost_usd": round((prompt_tokens * price_prompt + max_tokens * price_completion) / 1000, 6),
+        "build_us": round(build_us, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--price-prompt", type=float, default=0.0005, help="1K 토큰당 USD")
+    parser.add_argument("--price-completion", type=float, default=0.0015, help="1K 토큰당 USD")
+    args = parser.parse_args()
+
+    compiler = PromptCompiler()
+    chunk = [(WEATHER, PREFERENCES)] * args.batch_size
+    prices = (args.price_prompt, args.price_completion)
+    cases = {
+        "recommend": (
+            lambda: legacy_recommend(WEATHER, PREFERENCES),
+            lambda: compiler.recommend(WEATHER, PREFERENCES),
+        ),
+        "recipe": (
+            lambda: legacy_recipe("김치찌개", 1),
+            lambda: compiler.recipe("김치찌개", 1),
+        ),
+    }
+    report = {"tokenizer": tokenizer_name()}
+    for purpose, (legacy, compiled) in cases.items():
+        report[purpose] = {
+            "legacy": summarize(*legacy(), timed_us(legacy, args.repeat), *prices),
+            "compiled": summarize(*compiled()[::2], timed_us(compiled, args.repeat), *prices),
+        }
+    # 예전 일괄 추천은 요청 1건당 300토큰
+    batch = compiler.batch(chunk)
+    report["recommend_batch"] = {
+        "batch_size": args.batch_size,
+        "legacy_max_tokens": 300 * args.batch_size,
+        "compiled": summarize(batch.messages, batch.max_tokens, timed_us(lambda: compiler.batch(chunk), args.repeat), *prices),
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""음식점 검색: 사용자마다 카카오 API 직접 검색 vs GET /api/restaurants (셀 캐시) (가짜 카카오 서버)
+
+사무실 몇 곳 주변(반경 --spread m)에 흩어진 사용자들이 메뉴 몇 가지 중 하나로 1km 안을 검색합니다.
+direct는 브라우저처럼 사용자마다 카카오 API를 호출하고(첫 페이지), proxy는 백엔드를 거칩니다.
+보고 항목: 요청 p50/p95(ms), 카카오 API 호출 수(요청당), 백엔드 캐시 통계
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_restaurants --users 300 --concurrency 20
+"""
+from typing import Dict, List, Tuple
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+import httpx
+
+from benchmarks.common import run_server, summarize
+
+OFFICES = [(37.4979, 127.0276), (37.5665, 126.9780), (37.5219, 126.9245)]
+MENUS = ["김치찌개", "돈까스", "쌀국수"]
+
+
+def make_users(count: int, spread: float, seed: int = 7) -> List[Tuple[str, float, float]]:
+    """(메뉴, 위도, 경도) 사용자 목록 (사무실 주변 spread(m) 안에 균등 분포)"""
+    rng = random.Random(seed)
+    users = []
+    for _ in range(count):
+        lat, lon = rng.choice(OFFICES)
+        r = spread * math.sqrt(rng.random())
+        theta = rng.random() * 2 * math.pi
+        users.append((
+            rng.choice(MENUS),
+            lat + r * math.cos(theta) / 111320,
+            lon + r * math.sin(theta) / (111320 * math.cos(math.radians(lat))),
+        ))
+    return users
+
+
+async def run(users, concurrency: int, request) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(user):
+        async with semaphore:
+            start = time.perf_counter()
+            await request(*user)
+            samples.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(user) for user in users))
+    return samples
+
+
+async def direct(kakao_url: str, users, concurrency: int) -> List[float]:
+    async with httpx.AsyncClient(base_url=kakao_url, headers={"Authorization": "KakaoAK fake-key"}) as client:
+        async def request(menu, lat, lon):
+            response = await client.get("/v2/local/search/keyword.json", params={
+                "query": menu, "x": lon, "y": lat, "radius": 1000, "sort": "distance", "category_group_code": "FD6",
+            })
+            response.raise_for_status()
+        return await run(users, concurrency, request)
+
+
+async def proxy(app_url: str, users, concurrency: int) -> Tuple[List[float], Dict]:
+    async with httpx.AsyncClient(base_url=app_url, timeout=30.0) as client:
+        async def request(menu, lat, lon):
+            response = await client.get("/api/restaurants", params={"menu": menu, "lat": lat, "lon": lon, "radius": 1000})
+            response.raise_for_status()
+        samples = await run(users, concurrency, request)
+        stats = (await client.get("/admin/cache")).json()["restaurant"]
+    return samples, stats
+
+
+def kakao_pages(kakao_url: str) -> int:
+    return httpx.get(f"{kakao_url}/stats").json()["pages"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--spread", type=float, default=300, help="사무실에서 사용자까지 최대 거리 (m)")
+    parser.add_argument("--kakao-latency", type=float, default=0.08)
+    parser.add_argument("--port", type=int, default=8750)
+    args = parser.parse_args()
+
+    users = make_users(args.users, args.spread)
+    report = {"users": args.users, "concurrency": args.concurrency, "spread_m": args.spread}
+    with run_server("benchmarks.fake_kakao:app", args.port + 1, {"FAKE_KAKAO_LATENCY": str(args.kakao_latency)}) as kakao_url:
+        samples = asyncio.run(direct(kakao_url, users, args.concurrency))
+        calls = kakao_pages(kakao_url)
+        report["direct"] = dict(summarize(samples), kakao_calls=calls, calls_per_request=round(calls / args.users, 3))
+
+        app_env = {
+            "KAKAO_REST_API_KEY": "fake-key",
+            "KAKAO_API_BASE_URL": kakao_url,
+            "PREFETCH_ENABLED": "false",
+            "RECIPE_CACHE_PATH": ":memory:",
+            "LOG_LEVEL": "WARNING",
+        }
+        with run_server("main:app", args.port, app_env, ready_path="/ready") as app_url:
+            samples, stats = asyncio.run(proxy(app_url, users, args.concurrency))
+        proxy_calls = kakao_pages(kakao_url) - calls
+        report["proxy"] = dict(
+            summarize(samples),
+            kakao_calls=proxy_calls,
+            calls_per_request=round(proxy_calls / args.users, 3),
+            cache=stats,
+        )
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
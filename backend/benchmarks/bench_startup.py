@@ -0,0 +1,133 @@
+"""시작 시간 측정: main 모듈 import 시간(-X importtime)과 프로세스 시작부터 첫 응답까지의 시간
+
+측정 항목:
+    import_ms           `import main` 누적 시간 (python -X importtime 기준, 가장 느린 모듈 목록 포함)
+    ready_ms            uvicorn 프로세스 시작 → GET /ready 가 200을 반환할 때까지
+    first_weather_ms    준비 후 첫 GET /api/weather 응답 시간 (가짜 기상청 서버)
+    first_recommend_ms  준비 후 첫 POST /api/recommend 응답 시간 (가짜 LLM 서버, 첫 LLM 호출에서 SDK 로드)
+
+목표(--import-budget-ms, --ready-budget-ms)를 넘으면 종료 코드 1.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_startup --runs 5
+"""
+from typing import Dict, List
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, run_server
+
+
+def import_profile(top: int) -> Dict:
+    """-X importtime 출력 → main 누적 시간과 누적 시간이 큰 최상위 모듈"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, env=dict(os.environ, LOG_LEVEL="ERROR"),
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # 들여쓰기 깊이 1칸 = 최상위 import
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(cumulative) / 1000, depth))
+    total = next((ms for name, ms, _ in modules if name == "main"), float("nan"))
+    heaviest = sorted((m for m in modules if m[2] <= 1 and m[0] != "main"), key=lambda m: -m[1])[:top]
+    return {"import_ms": round(total, 1), "heaviest": {name: round(ms, 1) for name, ms, _ in heaviest}}
+
+
+def startup_run(port: int, llm_url: str, kma_url: str) -> Dict:
+    """서버를 새로 띄워 준비까지의 시간과 첫 요청 응답 시간 측정"""
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY="fake-key",
+        OPENAI_BASE_URL=f"{llm_url}/v1",
+        WEATHER_API_KEY="fake-key",
+        WEATHER_API_BASE_URL=kma_url,
+        PREFETCH_ENABLED="false",
+        RECIPE_CACHE_PATH=":memory:",
+        LOG_LEVEL="WARNING",
+    )
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        with httpx.Client(base_url=base_url, timeout=30.0) as client:
+            while True:
+                try:
+                    if client.get("/ready").status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.perf_counter() - started > 30:
+                    raise RuntimeError("서버가 준비되지 않았습니다.")
+                time.sleep(0.005)
+            ready = time.perf_counter() - started
+
+            start = time.perf_counter()
+            client.get("/api/weather", params={"location": "서울"})
+            first_weather = time.perf_counter() - start
+
+            start = time.perf_counter()
+            client.post("/api/recommend", json={"location": "서울"})
+            first_recommend = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {
+        "ready_ms": ready * 1000,
+        "first_weather_ms": first_weather * 1000,
+        "first_recommend_ms": first_recommend * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="보고할 느린 모듈 수")
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--import-budget-ms", type=float, default=700.0)
+    parser.add_argument("--ready-budget-ms", type=float, default=1500.0)
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.top) for _ in range(args.runs)]
+    runs: List[Dict] = []
+    with run_server("benchmarks.fake_llm:app", args.port + 1, {"FAKE_LLM_LATENCY": str(args.llm_latency)}) as llm_url, \
+            run_server("benchmarks.fake_kma:app", args.port + 2) as kma_url:
+        for _ in range(args.runs):
+            runs.append(startup_run(args.port, llm_url, kma_url))
+
+    report = {
+        "runs": args.runs,
+        "import_ms": statistics.median(p["import_ms"] for p in profiles),
+        "heaviest_imports_ms": profiles[-1]["heaviest"],
+    }
+    for key in runs[0]:
+        report[key] = round(statistics.median(run[key] for run in runs), 1)
+    report["budget"] = {
+        "import_ms": args.import_budget_ms,
+        "ready_ms": args.ready_budget_ms,
+        "ok": report["import_ms"] <= args.import_budget_ms and report["ready_ms"] <= args.ready_budget_ms,
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if not report["budget"]["ok"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
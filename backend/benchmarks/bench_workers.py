@@ -0,0 +1,76 @@
+"""워커 수별 처리량 (serve.py로 워커 1~N개 실행, 가짜 기상청·LLM 서버 사용)
+
+워커 수마다 같은 시나리오를 실행해 초당 요청 수, 지연 시간, 1워커 대비 확장 효율
+(처리량 / (1워커 처리량 × 워커 수))과 가짜 기상청 서버가 받은 요청 수를 보고합니다.
+예보 캐시를 공유하므로 워커 수가 늘어도 기상청 요청 수는 거의 같아야 합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.bench_workers --workers 1,2,4 --scenario weather --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+from benchmarks.common import run_process, run_server
+from benchmarks.suite import SCENARIOS, run_scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    cpus = os.cpu_count() or 1
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(n) for n in sorted({1, 2, 4, cpus}) if n <= cpus) or "1",
+        help="쉼표로 구분한 워커 수 목록 (기본: CPU 수까지)"
+    )
+    parser.add_argument("--scenario", default="weather", choices=sorted(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=8500)
+    args = parser.parse_args()
+
+    results = []
+    for workers in [int(n) for n in args.workers.split(",")]:
+        # 워커 수마다 가짜 서버도 새로 띄워 기상청 요청 수를 따로 셈
+        llm_env = {"FAKE_LLM_LATENCY": str(args.llm_latency)}
+        with run_server("benchmarks.fake_llm:app", args.port + 1, llm_env) as llm_url, \
+                run_server("benchmarks.fake_kma:app", args.port + 2) as kma_url:
+            app_env = {
+                "OPENAI_API_KEY": "fake-key",
+                "OPENAI_BASE_URL": f"{llm_url}/v1",
+                "WEATHER_API_KEY": "fake-key",
+                "WEATHER_API_BASE_URL": kma_url,
+                "PREFETCH_ENABLED": "false",
+                "LOG_LEVEL": "WARNING",
+            }
+            serve_args = ["serve.py", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(args.port)]
+            with run_process(serve_args, args.port, app_env, ready_path="/health", timeout=60.0) as app_url:
+                result = asyncio.run(run_scenario(app_url, args.scenario, args.concurrency, args.duration, args.warmup))
+            kma_pages = httpx.get(f"{kma_url}/stats").json()["pages"]
+
+        result = {
+            "workers": workers,
+            "throughput_rps": result["throughput_rps"],
+            "p50_ms": result["p50_ms"],
+            "p95_ms": result["p95_ms"],
+            "p99_ms": result["p99_ms"],
+            "errors": result["errors"],
+            "kma_pages": kma_pages,
+        }
+        results.append(result)
+        print(json.dumps(result), file=sys.stderr)
+
+    single = results[0]["throughput_rps"] / results[0]["workers"]
+    for result in results:
+        result["efficiency"] = round(result["throughput_rps"] / (single * result["workers"]), 2) if single else None
+    print(json.dumps({"cpu_count": cpus, "scenario": args.scenario, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
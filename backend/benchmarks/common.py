@@ -0,0 +1,70 @@
+"""벤치마크 공통 유틸리티 (서버 실행, 지연 시간 통계)"""
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """정렬 기반 백분위수 (samples 단위 그대로 반환)"""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """지연 시간(초) 목록을 ms 단위 요약 통계로 변환"""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+    }
+
+
+def wait_ready(url: str, timeout: float = 15.0):
+    """서버가 응답할 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"서버가 시작되지 않았습니다: {url}")
+
+
+@contextmanager
+def run_process(
+    args: List[str],
+    port: int,
+    env: Optional[Dict[str, str]] = None,
+    ready_path: str = "/docs",
+    timeout: float = 15.0
+):
+    """backend 디렉터리에서 python 하위 프로세스로 서버를 실행하고 응답할 때까지 대기"""
+    proc_env = dict(os.environ)
+    proc_env.update(env or {})
+    proc = subprocess.Popen([sys.executable] + args, cwd=BACKEND_DIR, env=proc_env)
+    try:
+        wait_ready(f"http://127.0.0.1:{port}{ready_path}", timeout)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def run_server(app_path: str, port: int, env: Optional[Dict[str, str]] = None, ready_path: str = "/docs"):
+    """uvicorn으로 ASGI 앱을 하위 프로세스로 실행"""
+    return run_process(
+        ["-m", "uvicorn", app_path, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        port, env, ready_path
+    )
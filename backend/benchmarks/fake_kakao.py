@@ -0,0 +1,110 @@
+"""카카오 로컬 키워드 검색 API를 흉내 내는 로컬 가짜 서버 (벤치마크용)
+
+위경도 약 60m 간격 격자점마다 (검색어, 격자점) 해시로 음식점을 결정적으로 배치하고,
+radius/page/size/sort=distance를 실제 API처럼 처리합니다 (최대 45건, 페이지당 최대 15건).
+
+실행: uvicorn benchmarks.fake_kakao:app --port 9300
+앱 실행 시 KAKAO_API_BASE_URL=http://127.0.0.1:9300, KAKAO_REST_API_KEY=아무 값 으로 지정
+환경변수:
+    FAKE_KAKAO_LATENCY      응답 지연 시간 (초, 기본 0.08)
+    FAKE_KAKAO_DENSITY      격자점에 음식점이 있을 확률 (0~1, 기본 0.03)
+받은 요청 수는 GET /stats 로 확인
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional
+from fastapi import FastAPI, Header, HTTPException
+import asyncio
+import hashlib
+import math
+import os
+
+from services.geohash import distance
+
+app = FastAPI(title="Fake Kakao Local")
+
+LATENCY = float(os.getenv("FAKE_KAKAO_LATENCY", "0.08"))
+DENSITY = float(os.getenv("FAKE_KAKAO_DENSITY", "0.03"))
+# 격자 간격 (도, 약 60m)
+STEP = 0.00055
+MAX_RESULTS = 45
+
+# 받은 요청 수 (GET /stats)
+REQUESTS = {"pages": 0}
+
+
+def _hash(*parts) -> int:
+    return int.from_bytes(hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest(), "big")
+
+
+@lru_cache(maxsize=None)
+def _place_at(query: str, i: int, j: int) -> Optional[Dict]:
+    """격자점 (i, j)의 음식점 (없으면 None)"""
+    h = _hash(query, i, j)
+    if h % 1000 >= DENSITY * 1000:
+        return None
+    # 격자점 주변으로 조금씩 흩뜨림
+    lat = (i + (h >> 10) % 100 / 200) * STEP
+    lon = (j + (h >> 20) % 100 / 200) * STEP
+    return {
+        "id": str(h % 10 ** 9),
+        "place_name": f"{query} {i % 1000}-{j % 1000}호점",
+        "category_name": "음식점 > 한식",
+        "category_group_code": "FD6",
+        "phone": f"02-{h % 9000 + 1000}-{(h >> 16) % 9000 + 1000}",
+        "address_name": f"서울 가상구 {i % 100}동 {j % 1000}",
+        "road_address_name": f"서울 가상구 가상로 {j % 1000}",
+        "x": f"{lon:.7f}",
+        "y": f"{lat:.7f}",
+        "place_url": f"http://place.map.kakao.com/{h % 10 ** 9}",
+    }
+
+
+def places_within(query: str, lat: float, lon: float, radius: float) -> List[Dict]:
+    """(lat, lon) 반경 radius(m) 안의 음식점 (거리순)"""
+    d_lat = radius / 111320
+    d_lon = radius / (111320 * math.cos(math.radians(lat)))
+    places = []
+    for i in range(math.floor((lat - d_lat) / STEP), math.ceil((lat + d_lat) / STEP) + 1):
+        for j in range(math.floor((lon - d_lon) / STEP), math.ceil((lon + d_lon) / STEP) + 1):
+            place = _place_at(query, i, j)
+            if place is None:
+                continue
+            dist = distance(lat, lon, float(place["y"]), float(place["x"]))
+            if dist <= radius:
+                places.append(dict(place, distance=str(int(dist))))
+    places.sort(key=lambda p: int(p["distance"]))
+    return places
+
+
+@app.get("/v2/local/search/keyword.json")
+async def keyword_search(
+    query: str,
+    x: float,
+    y: float,
+    radius: int = 20000,
+    page: int = 1,
+    size: int = 15,
+    sort: str = "accuracy",
+    category_group_code: str = "",
+    authorization: str = Header("")
+):
+    if not authorization.startswith("KakaoAK "):
+        raise HTTPException(status_code=401, detail="NotAuthorizedError")
+    REQUESTS["pages"] += 1
+    await asyncio.sleep(LATENCY)
+    places = places_within(query, y, x, min(radius, 20000))
+    pageable = places[:MAX_RESULTS]
+    start = (page - 1) * size
+    return {
+        "meta": {
+            "total_count": len(places),
+            "pageable_count": len(pageable),
+            "is_end": start + size >= len(pageable),
+        },
+        "documents": pageable[start:start + size],
+    }
+
+
+@app.get("/stats")
+async def stats():
+    return REQUESTS
@@ -0,0 +1,238 @@
+"""기상청 단기예보(getVilageFcst) API를 흉내 내는 로컬 가짜 서버 (벤치마크용)
+
+FAKE_KMA_RECORDINGS 디렉터리에 저장한 실제 응답(JSON)이 있으면 그 응답을 재생하고
+(요청한 발표 시각에 맞게 예보 시각만 옮김), 없으면 발표 시각 다음 시각부터 모레 자정까지
+실제와 같은 항목(12개 + TMN/TMX)을 만들어 pageNo/numOfRows로 나눠 응답합니다.
+
+실행: uvicorn benchmarks.fake_kma:app --port 9200
+앱 실행 시 WEATHER_API_BASE_URL=http://127.0.0.1:9200 으로 지정
+환경변수:
+    FAKE_KMA_LATENCY        응답 지연 시간 (초, 기본 0.05)
+    FAKE_KMA_RECORDINGS     재생할 응답 디렉터리 (기본 benchmarks/recordings)
+받은 요청 수는 GET /stats 로 확인 (워커 여러 개가 호출을 나눠 하는지 확인용)
+
+실제 응답 저장 (WEATHER_API_KEY 필요, 저장 전 응답에서 키를 지움):
+    python -m benchmarks.fake_kma record 60 127
+    python -m benchmarks.fake_kma record-locations 서울 강남 부산     # 위치마다 격자 하나씩
+benchmarks/suite.py는 시나리오 위치의 격자마다 저장한 응답이 있어야 실행됩니다.
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from fastapi import FastAPI
+import asyncio
+import glob
+import json
+import math
+import os
+import sys
+import urllib.parse
+
+app = FastAPI(title="Fake KMA")
+
+LATENCY = float(os.getenv("FAKE_KMA_LATENCY", "0.05"))
+RECORDINGS_DIR = os.getenv(
+    "FAKE_KMA_RECORDINGS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+)
+
+# 받은 요청 수 (GET /stats)
+REQUESTS = {"pages": 0}
+
+HOURLY_CATEGORIES = ("TMP", "UUU", "VVV", "VEC", "WSD", "SKY", "PTY", "POP", "WAV", "PCP", "REH", "SNO")
+
+
+def make_items(base_date: str, base_time: str, nx: int, ny: int) -> List[Dict]:
+    """발표분 전체 예보 항목 생성 (격자·시각별로 값이 달라지도록)"""
+    base = datetime.strptime(base_date + base_time, "%Y%m%d%H%M")
+    end = (base + timedelta(days=3)).replace(hour=0, minute=0)
+    items = []
+    when = base + timedelta(hours=1)
+    while when <= end:
+        hour = when.hour
+        temp = 15 + 8 * math.sin((hour - 9) / 24 * 2 * math.pi) + (nx - ny) % 5
+        rainy = (nx + ny + when.day + hour // 6) % 7 == 0
+        values = {
+            "TMP": f"{temp:.0f}",
+            "UUU": "1.2",
+            "VVV": "-0.8",
+            "VEC": "250",
+            "WSD": "1.9",
+            "SKY": "4" if rainy else ("1", "3", "4")[(hour + nx) % 3],
+            "PTY": "1" if rainy else "0",
+            "POP": "70" if rainy else "20",
+            "WAV": "0",
+            "PCP": "1.0mm" if rainy else "강수없음",
+            "REH": str(50 + (hour * 3 + ny) % 40),
+            "SNO": "적설없음",
+        }
+        if hour == 6:
+            values["TMN"] = f"{temp - 3:.1f}"
+        if hour == 15:
+            values["TMX"] = f"{temp + 2:.1f}"
+        for category, value in values.items():
+            items.append({
+                "baseDate": base_date,
+                "baseTime": base_time,
+                "category": category,
+                "fcstDate": when.strftime("%Y%m%d"),
+                "fcstTime": when.strftime("%H%M"),
+                "fcstValue": value,
+                "nx": nx,
+                "ny": ny
+            })
+        when += timedelta(hours=1)
+    return items
+
+
+def load_recordings(directory: str = RECORDINGS_DIR) -> Dict[Tuple[int, int], List[Dict]]:
+    """저장한 응답 파일들 → 격자별 item 목록 (파일 이름은 자유, 격자는 응답 내용으로 판단)"""
+    recordings = {}
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f)["response"]["body"]["items"]["item"]
+        if items:
+            recordings[(int(items[0]["nx"]), int(items[0]["ny"]))] = items
+    return recordings
+
+
+RECORDINGS = load_recordings()
+
+
+def shift_items(items: List[Dict], base_date: str, base_time: str, nx: int, ny: int) -> List[Dict]:
+    """저장한 응답의 발표·예보 시각을 요청한 발표 시각 기준으로 옮김"""
+    recorded = datetime.strptime(items[0]["baseDate"] + items[0]["baseTime"], "%Y%m%d%H%M")
+    delta = datetime.strptime(base_date + base_time, "%Y%m%d%H%M") - recorded
+    shifted = []
+    for item in items:
+        when = datetime.strptime(item["fcstDate"] + item["fcstTime"], "%Y%m%d%H%M") + delta
+        shifted.append(dict(
+            item,
+            baseDate=base_date,
+            baseTime=base_time,
+            fcstDate=when.strftime("%Y%m%d"),
+            fcstTime=when.strftime("%H%M"),
+            nx=nx,
+            ny=ny
+        ))
+    return shifted
+
+
+@lru_cache(maxsize=4096)
+def forecast_items(base_date: str, base_time: str, nx: int, ny: int) -> List[Dict]:
+    """재생할 응답이 있으면 재생(같은 격자 우선, 없으면 격자 번호로 하나 선택), 없으면 생성"""
+    if not RECORDINGS:
+        return make_items(base_date, base_time, nx, ny)
+    recorded = RECORDINGS.get((nx, ny))
+    if recorded is None:
+        keys = sorted(RECORDINGS)
+        recorded = RECORDINGS[keys[(nx * 31 + ny) % len(keys)]]
+    return shift_items(recorded, base_date, base_time, nx, ny)
+
+
+def make_response(items: List[Dict], page_no: int = 1, num_of_rows: int = 1000) -> Dict:
+    start = (page_no - 1) * num_of_rows
+    return {
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+            "body": {
+                "dataType": "JSON",
+                "items": {"item": items[start:start + num_of_rows]},
+                "pageNo": page_no,
+                "numOfRows": num_of_rows,
+                "totalCount": len(items)
+            }
+        }
+    }
+
+
+@app.get("/getVilageFcst")
+async def get_vilage_fcst(
+    base_date: str = "",
+    base_time: str = "",
+    nx: int = 60,
+    ny: int = 127,
+    pageNo: int = 1,
+    numOfRows: int = 1000
+):
+    REQUESTS["pages"] += 1
+    await asyncio.sleep(LATENCY)
+    base_date = base_date or datetime.now().strftime("%Y%m%d")
+    base_time = base_time or "0500"
+    return make_response(forecast_items(base_date, base_time, nx, ny), pageNo, numOfRows)
+
+
+@app.get("/stats")
+async def stats():
+    return REQUESTS
+
+
+def scrub(payload, secrets: List[str]):
+    """저장할 응답에서 키 필드와 키 값을 지움 (오류 응답은 요청 주소를 그대로 돌려주기도 함)"""
+    if isinstance(payload, dict):
+        return {key: scrub(value, secrets) for key, value in payload.items() if key.lower() != "servicekey"}
+    if isinstance(payload, list):
+        return [scrub(value, secrets) for value in payload]
+    if isinstance(payload, str):
+        for secret in secrets:
+            payload = payload.replace(secret, "SCRUBBED")
+    return payload
+
+
+def missing_cells(cells: List[Tuple[int, int]], directory: str = RECORDINGS_DIR) -> List[Tuple[int, int]]:
+    """저장한 응답이 없는 격자"""
+    recorded = load_recordings(directory)
+    return [cell for cell in dict.fromkeys(cells) if cell not in recorded]
+
+
+def record(nx: int, ny: int, directory: str = RECORDINGS_DIR, service=None) -> Optional[str]:
+    """실제 기상청 API 응답(발표분 전체)을 저장"""
+    import httpx
+    from services.weather_service import WeatherService
+
+    service = service or WeatherService()
+    if not service.api_key:
+        raise RuntimeError("WEATHER_API_KEY가 없습니다.")
+    base = service.base_datetime(datetime.now())
+    response = httpx.get(
+        f"{service.base_url}/getVilageFcst",
+        params={
+            "serviceKey": service.api_key,
+            "pageNo": "1",
+            "numOfRows": "1000",
+            "dataType": "JSON",
+            "base_date": base.strftime("%Y%m%d"),
+            "base_time": base.strftime("%H%M"),
+            "nx": nx,
+            "ny": ny,
+        },
+        timeout=30.0,
+    )
+    response.raise_for_status()
+    payload = scrub(response.json(), [service.api_key, urllib.parse.quote(service.api_key, safe="")])
+    result_code = payload.get("response", {}).get("header", {}).get("resultCode")
+    if result_code != "00":
+        raise RuntimeError(f"기상청 API 오류 응답 ({result_code}), 저장하지 않습니다.")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"vilage_{nx}_{ny}_{base.strftime('%Y%m%d%H%M')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    return path
+
+
+def record_locations(locations: List[str], directory: str = RECORDINGS_DIR) -> List[str]:
+    """위치들의 격자마다 응답 하나씩 저장 (같은 격자는 한 번)"""
+    from services.weather_service import WeatherService
+
+    service = WeatherService()
+    cells = dict.fromkeys(service.get_grid_coords(location) for location in locations)
+    return [record(nx, ny, directory, service) for nx, ny in cells]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "record":
+        print(record(int(sys.argv[2]), int(sys.argv[3])))
+    elif len(sys.argv) >= 3 and sys.argv[1] == "record-locations":
+        print("\n".join(record_locations(sys.argv[2:])))
+    else:
+        print(__doc__)
@@ -0,0 +1,134 @@
+"""OpenAI chat completions API를 흉내 내는 로컬 가짜 LLM 서버 (벤치마크용)
+
+실행: uvicorn benchmarks.fake_llm:app --port 9100
+환경변수:
+    FAKE_LLM_LATENCY        응답 지연 시간 (초, 기본 2.0)
+    FAKE_LLM_CHUNK_DELAY    스트리밍 시 조각 사이 지연 (초, 기본 0.02)
+    FAKE_LLM_JITTER         응답 지연 변동 비율 (0~1, 기본 0: 지연 × [1-J, 1+J] 균등 분포)
+    FAKE_LLM_MALFORMED      깨진 JSON 응답 비율 (0~1, 기본 0: 코드 펜스·끝 쉼표·잘림 중 하나)
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+
+from services.prompts import count_message_tokens, count_tokens
+
+app = FastAPI(title="Fake LLM")
+
+LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "2.0"))
+CHUNK_DELAY = float(os.getenv("FAKE_LLM_CHUNK_DELAY", "0.02"))
+JITTER = float(os.getenv("FAKE_LLM_JITTER", "0"))
+MALFORMED = float(os.getenv("FAKE_LLM_MALFORMED", "0"))
+CHUNK_SIZE = 8
+
+RECOMMENDATION = {
+    "menu": "김치찌개",
+    "category": "한식",
+    "reason": "가짜 LLM 서버의 고정 응답입니다",
+    "temperature_match": "테스트용",
+    "alternatives": ["된장찌개", "부대찌개"]
+}
+
+RECIPE = {
+    "menu_name": "김치찌개",
+    "servings": 1,
+    "ingredients": [
+        {"name": "김치", "amount": "200g"},
+        {"name": "돼지고기", "amount": "100g"},
+        {"name": "두부", "amount": "1/2모"}
+    ],
+    "steps": [
+        "김치와 돼지고기를 볶습니다.",
+        "물을 붓고 끓입니다.",
+        "두부를 넣고 한소끔 더 끓입니다."
+    ],
+    "cooking_time": "약 20분",
+    "difficulty": "쉬움"
+}
+
+
+def _latency() -> float:
+    return LATENCY * random.uniform(1 - JITTER, 1 + JITTER) if JITTER else LATENCY
+
+
+def _pick_content(body: dict) -> str:
+    """요청 프롬프트에 맞는 고정 JSON 응답 선택"""
+    prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+    if "레시피" in prompt:
+        return json.dumps(RECIPE, ensure_ascii=False)
+    if '"results"' in prompt:
+        # 일괄 추천: 프롬프트의 "[번호]" 요청마다 하나씩
+        count = len(re.findall(r"^\[\d+\]", prompt, re.MULTILINE))
+        results = [dict(RECOMMENDATION, index=i) for i in range(count)]
+        return json.dumps({"results": results}, ensure_ascii=False)
+    return json.dumps(RECOMMENDATION, ensure_ascii=False)
+
+
+def _malform(content: str):
+    """(응답, finish_reason): MALFORMED 비율로 흔한 깨짐 하나를 적용"""
+    if random.random() >= MALFORMED:
+        return content, "stop"
+    kind = random.choice(("fence", "trailing_comma", "truncated"))
+    if kind == "fence":
+        return f"```json\n{content}\n```", "stop"
+    if kind == "trailing_comma":
+        return content[:-1] + ",}", "stop"
+    # max_tokens에서 잘린 응답
+    return content[:int(len(content) * random.uniform(0.6, 0.95))], "length"
+
+
+async def _stream_chunks(model: str, content: str):
+    """OpenAI 스트리밍 형식(SSE)으로 content를 조각내어 전송"""
+    # 총 지연 시간 중 첫 조각까지의 대기 (나머지는 조각 사이 지연)
+    await asyncio.sleep(max(0.0, _latency() - CHUNK_DELAY * (len(content) // CHUNK_SIZE)))
+    for start in range(0, len(content), CHUNK_SIZE):
+        chunk = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {"index": 0, "delta": {"content": content[start:start + CHUNK_SIZE]}, "finish_reason": None}
+            ]
+        }
+        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+        await asyncio.sleep(CHUNK_DELAY)
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    content = _pick_content(body)
+    if body.get("stream"):
+        return StreamingResponse(
+            _stream_chunks(body.get("model", "fake"), content),
+            media_type="text/event-stream"
+        )
+    await asyncio.sleep(_latency())
+    content, finish_reason = _malform(content)
+    prompt_tokens = count_message_tokens(body.get("messages", []))
+    completion_tokens = count_tokens(content)
+    return {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
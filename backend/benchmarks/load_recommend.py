@@ -0,0 +1,96 @@
+"""LLM 호출 중 /health, /api/weather 지연 시간 부하 테스트
+
+가짜 LLM 서버(지연 응답)와 가짜 기상청 서버를 띄운 뒤, N개의 동시 /api/recommend
+호출이 진행되는 동안 /health, /api/weather의 p50/p99 지연 시간이 부하 없을 때와
+비슷하게 유지되는지 확인합니다.
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.load_recommend --concurrency 50 --llm-latency 3
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from benchmarks.common import run_server, summarize
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float) -> list:
+    """stop 이벤트가 설정될 때까지 주기적으로 요청하며 지연 시간 수집"""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def recommend_worker(client: httpx.AsyncClient, stop: asyncio.Event, counter: list):
+    """stop 이벤트가 설정될 때까지 /api/recommend 반복 호출"""
+    while not stop.is_set():
+        response = await client.post("/api/recommend", json={"location": "서울", "mood": "피곤한"})
+        response.raise_for_status()
+        counter.append(1)
+
+
+async def measure(base_url: str, concurrency: int, duration: float, interval: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client, \
+            httpx.AsyncClient(base_url=base_url, timeout=60.0) as probe_client:
+        # 첫 호출 비용(SDK 초기화, 연결 수립)은 측정에서 제외
+        await client.post("/api/recommend", json={"location": "서울"})
+        stop = asyncio.Event()
+        completed = []
+        workers = [
+            asyncio.create_task(recommend_worker(client, stop, completed))
+            for _ in range(concurrency)
+        ]
+        probes = [
+            asyncio.create_task(probe(probe_client, "/health", stop, interval)),
+            asyncio.create_task(probe(probe_client, "/api/weather?location=서울", stop, interval)),
+        ]
+        await asyncio.sleep(duration)
+        stop.set()
+        health, weather = await asyncio.gather(*probes)
+        await asyncio.gather(*workers)
+        return {
+            "concurrent_recommend": concurrency,
+            "recommend_completed": len(completed),
+            "health": summarize(health),
+            "weather": summarize(weather),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--llm-latency", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    fake_llm_env = {"FAKE_LLM_LATENCY": str(args.llm_latency)}
+    with run_server("benchmarks.fake_llm:app", args.port + 1, fake_llm_env) as llm_url, \
+            run_server("benchmarks.fake_kma:app", args.port + 2) as kma_url:
+        app_env = {
+            "OPENAI_API_KEY": "fake-key",
+            "OPENAI_BASE_URL": f"{llm_url}/v1",
+            "WEATHER_API_KEY": "fake-key",
+            "WEATHER_API_BASE_URL": kma_url,
+            "LLM_MAX_CONCURRENCY": str(args.concurrency),
+        }
+        with run_server("main:app", args.port, app_env, ready_path="/health") as app_url:
+            results = {
+                "idle": asyncio.run(measure(app_url, 0, args.duration, args.interval)),
+                "loaded": asyncio.run(measure(app_url, args.concurrency, args.duration, args.interval)),
+            }
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
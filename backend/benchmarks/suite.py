@@ -0,0 +1,271 @@
+"""백엔드 부하 테스트 모음 (가짜 기상청·LLM 서버 사용, 기준선 저장/비교)
+
+main:app과 가짜 기상청 서버(benchmarks/recordings/에 저장한 실제 응답 재생, benchmarks/fake_kma.py),
+가짜 OpenAI 서버(지연·스트리밍 설정 가능, benchmarks/fake_llm.py)를 띄우고
+시나리오(/api/weather, /api/recommend 1인·단체, /api/recipe)마다 동시 요청 수를 바꿔 가며
+정해진 시간 동안 요청을 반복합니다. 처리량, p50/p95/p99 지연 시간, 서버 이벤트 루프 지연
+(/metrics의 lunch_event_loop_lag_seconds 히스토그램 구간 상한 기준)을 보고합니다.
+시나리오 위치의 격자마다 저장한 응답이 있어야 하며, 없으면 저장 명령을 안내하고 끝납니다
+(--synthetic-weather면 생성한 예보로 실행하고 기준선에 표시).
+
+실행 (backend 디렉터리에서):
+    python -m benchmarks.suite --concurrency 1,10,50 --duration 10 --save
+    python -m benchmarks.suite --compare abc1234      # 저장한 기준선과 비교 (회귀 시 종료 코드 1)
+"""
+from typing import Callable, Dict, List, Tuple
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, run_server, summarize
+from benchmarks.fake_kma import RECORDINGS_DIR, missing_cells
+from services.area_index import load_area_index
+from services.weather_service import DEFAULT_GRID
+
+BASELINE_DIR = os.path.join(BACKEND_DIR, "benchmarks", "baselines")
+
+LOCATIONS = ["서울", "강남", "여의도", "판교", "부산", "대구", "인천", "광주", "대전", "수원"]
+FOOD_TYPES = ["상관없음", "한식", "중식", "일식", "양식", "분식"]
+MOODS = ["평범한", "기쁜", "슬픈", "화난", "피곤한", "스트레스"]
+MENUS = ["김치찌개", "된장찌개", "비빔밥", "짜장면", "초밥", "파스타", "떡볶이", "냉면"]
+
+# 시나리오: 요청 번호 → (메서드, 경로, httpx 요청 인자)
+Request = Tuple[str, str, Dict]
+SCENARIOS: Dict[str, Callable[[int], Request]] = {
+    "weather": lambda i: ("GET", "/api/weather", {"params": {"location": LOCATIONS[i % len(LOCATIONS)]}}),
+    "recommend": lambda i: ("POST", "/api/recommend", {"json": {
+        "location": LOCATIONS[i % len(LOCATIONS)],
+        "food_type": FOOD_TYPES[i % len(FOOD_TYPES)],
+        "mood": MOODS[i % len(MOODS)],
+    }}),
+    "recommend_group": lambda i: ("POST", "/api/recommend", {"json": {
+        "location": LOCATIONS[i % len(LOCATIONS)],
+        "food_type": FOOD_TYPES[i % len(FOOD_TYPES)],
+        "num_people": 4,
+        "moods": [MOODS[(i + k) % len(MOODS)] for k in range(4)],
+    }}),
+    "recipe": lambda i: ("POST", "/api/recipe", {"json": {
+        "menu_name": MENUS[i % len(MENUS)],
+        "num_servings": 1 + i % 4,
+    }}),
+}
+
+# 비교 시 회귀로 보는 지표 (값이 커지면 나쁨: True)
+COMPARED = {"throughput_rps": False, "p50_ms": True, "p95_ms": True, "p99_ms": True, "loop_lag_p99_ms": True}
+
+
+def parse_histogram(text: str, name: str) -> Dict:
+    """Prometheus 텍스트에서 레이블 없는 히스토그램 하나 읽기 → {"buckets": {le: 누적 개수}, "sum", "count"}"""
+    buckets, total, count = {}, 0.0, 0
+    for line in text.splitlines():
+        if line.startswith(f"{name}_bucket"):
+            le = line.split('le="', 1)[1].split('"', 1)[0]
+            buckets[float(le)] = float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f"{name}_sum"):
+            total = float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f"{name}_count"):
+            count = int(float(line.rsplit(" ", 1)[1]))
+    return {"buckets": buckets, "sum": total, "count": count}
+
+
+def lag_summary(before: Dict, after: Dict) -> Dict:
+    """두 시점 사이의 이벤트 루프 지연 (p50/p99는 구간 상한)"""
+    count = after["count"] - before["count"]
+    if count <= 0:
+        return {"loop_lag_samples": 0}
+
+    def quantile(q: float) -> float:
+        for le in sorted(after["buckets"]):
+            if after["buckets"][le] - before["buckets"].get(le, 0) >= q * count:
+                return le
+        return float("inf")
+
+    return {
+        "loop_lag_samples": count,
+        "loop_lag_mean_ms": round((after["sum"] - before["sum"]) / count * 1000, 3),
+        "loop_lag_p50_ms": quantile(0.5) * 1000,
+        "loop_lag_p99_ms": quantile(0.99) * 1000,
+    }
+
+
+async def run_scenario(base_url: str, name: str, concurrency: int, duration: float, warmup: float) -> Dict:
+    """동시 요청 concurrency개를 duration초 동안 반복 (처음 warmup초는 집계 제외)"""
+    make_request = SCENARIOS[name]
+    limits = httpx.Limits(max_connections=concurrency + 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        counter = iter(range(10 ** 9))
+        latencies: List[float] = []
+        errors = 0
+        measuring = False
+        stop = asyncio.Event()
+
+        async def worker():
+            nonlocal errors
+            while not stop.is_set():
+                method, path, kwargs = make_request(next(counter))
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if measuring:
+                    latencies.append(time.perf_counter() - start)
+                    errors += not ok
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        await asyncio.sleep(warmup)
+        lag_before = parse_histogram((await client.get("/metrics")).text, "lunch_event_loop_lag_seconds")
+        measuring = True
+        started = time.perf_counter()
+        await asyncio.sleep(duration)
+        measuring = False
+        elapsed = time.perf_counter() - started
+        lag_after = parse_histogram((await client.get("/metrics")).text, "lunch_event_loop_lag_seconds")
+        stop.set()
+        await asyncio.gather(*workers)
+
+    result = summarize(latencies)
+    result.update({
+        "concurrency": concurrency,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "errors": errors,
+    })
+    result.update(lag_summary(lag_before, lag_after))
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float) -> List[Dict]:
+    """기준선 대비 변화율과 회귀 여부 (tolerance: 허용 비율)"""
+    rows = []
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        for metric, higher_is_worse in COMPARED.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            rows.append({
+                "run": key,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change_pct": round(change * 100, 1),
+                "regression": change > tolerance if higher_is_worse else change < -tolerance,
+            })
+    return rows
+
+
+def scenario_cells() -> List[Tuple[int, int]]:
+    """시나리오 위치의 기상청 격자"""
+    areas = load_area_index()
+    cells = []
+    for location in LOCATIONS:
+        area = areas.resolve(location)
+        cells.append((area.nx, area.ny) if area is not None else DEFAULT_GRID)
+    return list(dict.fromkeys(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,10,50", help="쉼표로 구분한 동시 요청 수 목록")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--kma-latency", type=float, default=0.05)
+    parser.add_argument("--kma-recordings", default=RECORDINGS_DIR, help="재생할 기상청 응답 디렉터리")
+    parser.add_argument("--synthetic-weather", action="store_true", help="저장한 응답이 없는 격자는 생성한 예보 사용")
+    parser.add_argument("--port", type=int, default=8300)
+    parser.add_argument("--save", nargs="?", const="", default=None, help="기준선 저장 (이름 생략 시 git 커밋)")
+    parser.add_argument("--compare", help="비교할 기준선 이름 또는 파일 경로")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="회귀로 보지 않는 변화 비율")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    llm_env = {"FAKE_LLM_LATENCY": str(args.llm_latency), "FAKE_LLM_JITTER": str(args.llm_jitter)}
+    missing = missing_cells(scenario_cells(), args.kma_recordings)
+    if missing and not args.synthetic_weather:
+        sys.exit(
+            f"저장한 기상청 응답이 없는 격자: {missing}\n"
+            f"  python -m benchmarks.fake_kma record-locations {' '.join(LOCATIONS)}\n"
+            "로 저장하거나 --synthetic-weather로 실행하세요."
+        )
+
+    kma_env = {"FAKE_KMA_LATENCY": str(args.kma_latency), "FAKE_KMA_RECORDINGS": args.kma_recordings}
+    with run_server("benchmarks.fake_llm:app", args.port + 1, llm_env) as llm_url, \
+            run_server("benchmarks.fake_kma:app", args.port + 2, kma_env) as kma_url:
+        app_env = {
+            "OPENAI_API_KEY": "fake-key",
+            "OPENAI_BASE_URL": f"{llm_url}/v1",
+            "WEATHER_API_KEY": "fake-key",
+            "WEATHER_API_BASE_URL": kma_url,
+            "RECIPE_CACHE_PATH": ":memory:",
+            "LOG_LEVEL": "WARNING",
+        }
+        with run_server("main:app", args.port, app_env, ready_path="/health") as app_url:
+            results = {}
+            for name in scenarios:
+                for level in levels:
+                    key = f"{name}@{level}"
+                    results[key] = asyncio.run(run_scenario(app_url, name, level, args.duration, args.warmup))
+                    print(key, json.dumps(results[key], ensure_ascii=False), file=sys.stderr)
+
+    report = {
+        "revision": git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": {
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "llm_latency": args.llm_latency,
+            "llm_jitter": args.llm_jitter,
+            "kma_latency": args.kma_latency,
+            # 생성한 예보로 잰 격자 (비어 있으면 모두 저장한 실제 응답)
+            "synthetic_weather_cells": missing,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.compare:
+        path = args.compare if args.compare.endswith(".json") else os.path.join(BASELINE_DIR, f"{args.compare}.json")
+        with open(path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["compared_to"] = baseline["revision"]
+        report["comparison"] = compare(baseline, report, args.tolerance)
+        regressions = [row for row in report["comparison"] if row["regression"]]
+
+    if args.save is not None:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save or report['revision']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준선 저장: {path}", file=sys.stderr)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
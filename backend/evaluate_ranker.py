@@ -0,0 +1,165 @@
+"""랭킹 모델 오프라인 평가: 기록된 피드백(또는 가상 로그)으로 학습·평가
+
+피드백을 시간순으로 나눠 앞부분으로 학습하고 뒷부분으로 평가합니다.
+보고 항목:
+- log_loss, auc: 확률 예측 품질 (기준선: 학습 구간 평균 수락률)
+- hit_at_k: 좋아한 추천의 메뉴가 같은 조건의 모델 상위 k개 안에 있던 비율
+- replay: 기록된 메뉴가 모델 1위와 같았던 표본의 수락률 (무작위에 가까운 기존 추천 대비 추정치)
+- policy: 현재 정책(RANKER_MIN_CONFIDENCE, RANKER_MIN_SUPPORT, RANKER_MIN_LIFT)이면 모델로 답했을 비율과 그중 replay 수락률
+- lookup_us: 점수표 조회 시간 (조건 하나당 마이크로초)
+
+실행 (backend 디렉터리에서):
+    python evaluate_ranker.py                    # FEEDBACK_DB_PATH의 기록
+    python evaluate_ranker.py --simulate 20000   # 가상 사용자 로그
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+
+import numpy as np
+
+from services.feedback import FeedbackStore
+from services.menu_catalog import load_catalog
+from services.ranker import ANY_FOOD, BANDS, MenuRanker
+
+
+def simulate(store: FeedbackStore, catalog, count: int, seed: int):
+    """가상 로그: 무작위 후보를 보여 주고, 메뉴·조건별 숨은 선호도에 따라 수락/거절"""
+    rng = np.random.default_rng(seed)
+    names = catalog.names()
+    moods = list(catalog.by_mood)
+    foods = list(catalog.categories) + [ANY_FOOD]
+    base = {name: rng.normal(-0.5, 1.0) for name in names}
+    by_band = {(name, band): rng.normal(0, 0.8) for name in names for band in BANDS}
+    by_mood = {(name, mood): rng.normal(0, 0.8) for name in names for mood in moods}
+    for _ in range(count):
+        band, mood = BANDS[rng.integers(len(BANDS))], moods[rng.integers(len(moods))]
+        food = foods[rng.integers(len(foods))]
+        candidates = catalog.select(None if food == ANY_FOOD else (food,), band, mood)
+        item = candidates[rng.integers(len(candidates))]
+        impression_id = store.log_impression(band, mood, food, item.name, "simulated")
+        logit = base[item.name] + by_band[(item.name, band)] + by_mood[(item.name, mood)]
+        accepted = rng.random() < 1 / (1 + math.exp(-logit))
+        store.log_event(impression_id, "accept" if accepted else "reject")
+
+
+def auc(labels: np.ndarray, scores: np.ndarray) -> float:
+    """순위 기반 AUC (동점은 평균 순위)"""
+    positives = labels.sum()
+    negatives = len(labels) - positives
+    if not positives or not negatives:
+        return float("nan")
+    order = np.argsort(scores, kind="stable")
+    ranks = np.empty(len(scores))
+    sorted_scores = scores[order]
+    i = 0
+    while i < len(scores):
+        j = i
+        while j + 1 < len(scores) and sorted_scores[j + 1] == sorted_scores[i]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2 + 1
+        i = j + 1
+    return float((ranks[labels == 1].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def log_loss(labels: np.ndarray, probs: np.ndarray) -> float:
+    probs = np.clip(probs, 1e-7, 1 - 1e-7)
+    return float(-np.mean(labels * np.log(probs) + (1 - labels) * np.log(1 - probs)))
+
+
+def evaluate(samples, catalog, args) -> dict:
+    split = int(len(samples) * (1 - args.test_fraction))
+    train, test = samples[:split], samples[split:]
+    model = MenuRanker(catalog)
+    started = time.perf_counter()
+    model.fit(train, args.epochs)
+    model.build_tables()
+    train_seconds = time.perf_counter() - started
+
+    d, b, m, f, y = model.encode(test)
+    probs = model.predict(d, b, m, f)
+    baseline = np.full(len(y), np.mean([s.label for s in train]))
+
+    contexts = [(s.band, s.mood, s.food_type) for s in test]
+    hits = positives = replay_matched = replay_accepted = served = served_matched = served_accepted = 0
+    for sample, context in zip(test, contexts):
+        table = model.ranked(context) or []
+        top = [item.name for item, _ in table[:args.top_k]]
+        if sample.label:
+            positives += 1
+            hits += sample.menu in top
+        if top and top[0] == sample.menu:
+            replay_matched += 1
+            replay_accepted += sample.label
+        supported = model.supported(context, args.min_support)
+        base_rate = model.base_rate(context)
+        if (
+            supported and base_rate is not None
+            and supported[0][1] >= args.min_confidence and supported[0][1] - base_rate >= args.min_lift
+        ):
+            served += 1
+            if supported[0][0].name == sample.menu:
+                served_matched += 1
+                served_accepted += sample.label
+
+    started = time.perf_counter()
+    for context in contexts:
+        model.ranked(context)
+    lookup_seconds = time.perf_counter() - started
+
+    def ratio(a, b):
+        return round(a / b, 4) if b else None
+
+    return {
+        "samples": {"train": len(train), "test": len(test)},
+        "train_seconds": round(train_seconds, 3),
+        "log_loss": {"model": round(log_loss(y, probs), 4), "baseline": round(log_loss(y, baseline), 4)},
+        "auc": round(auc(y, probs), 4),
+        f"hit_at_{args.top_k}": ratio(hits, positives),
+        "replay": {
+            "logged_accept_rate": ratio(int(y.sum()), len(y)),
+            "matched": replay_matched,
+            "model_top1_accept_rate": ratio(replay_accepted, replay_matched),
+        },
+        "policy": {
+            "min_confidence": args.min_confidence,
+            "min_support": args.min_support,
+            "min_lift": args.min_lift,
+            "served_by_model": ratio(served, len(test)),
+            "served_top1_accept_rate": ratio(served_accepted, served_matched),
+        },
+        "lookup_us": round(lookup_seconds / max(len(contexts), 1) * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=None, help="피드백 SQLite 파일 (기본: FEEDBACK_DB_PATH)")
+    parser.add_argument("--simulate", type=int, default=0, help="가상 노출 N개를 만들어 평가 (--db 무시)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--epochs", type=int, default=int(os.getenv("RANKER_EPOCHS", "50")))
+    parser.add_argument("--top-k", type=int, default=int(os.getenv("RANKER_TOP_K", "3")))
+    parser.add_argument("--min-confidence", type=float, default=float(os.getenv("RANKER_MIN_CONFIDENCE", "0.6")))
+    parser.add_argument("--min-support", type=int, default=int(os.getenv("RANKER_MIN_SUPPORT", "20")))
+    parser.add_argument("--min-lift", type=float, default=float(os.getenv("RANKER_MIN_LIFT", "0.1")))
+    args = parser.parse_args()
+
+    catalog = load_catalog()
+    store = FeedbackStore(":memory:" if args.simulate else args.db)
+    if args.simulate:
+        random.seed(args.seed)
+        simulate(store, catalog, args.simulate, args.seed)
+    samples = store.samples()
+    store.close()
+    if len(samples) < 10:
+        print(f"평가할 피드백이 부족합니다 ({len(samples)}개).")
+        return
+    print(json.dumps(evaluate(samples, catalog, args), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,238 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+from datetime import datetime
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import logging
 import uvicorn
-from services.weather_service import WeatherService
+from services.config import get_settings
+from services.weather_service import WeatherService, lunch_time
+from services.admission import AdmissionController, AdmissionMiddleware
 from services.ai_service import AIService
+from services.feedback import EVENT_LABELS
+from services.http_client import create_http_client
+from services.idempotency import IdempotencyConflict, RequestDeduplicator
+from services.live_updates import LiveHub, websocket_options
+from services.materializer import RecommendationMaterializer
+from services.prefetcher import ForecastPrefetcher
+from services.restaurant_service import KAKAO_PAGE_SIZE, RestaurantSearchError, RestaurantService
+from services.responses import CompressionMiddleware, DefaultJSONResponse
+from services.metrics import FEEDBACK_EVENTS, REGISTRY, MetricsMiddleware, monitor_loop_lag
+from services.shared_store import SharedStoreError, get_shared_store
+
+# .env와 환경변수는 여기서 한 번 읽음
+settings = get_settings()
+
+logging.basicConfig(
+    level=settings.log_level,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+# 요청마다 남는 HTTP 클라이언트 로그는 경고 이상만
+logging.getLogger("httpx").setLevel(logging.WARNING)
+logger = logging.getLogger("main")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서비스와 공유 자원 생성/정리 (모듈 import 시에는 만들지 않음)"""
+    app.state.ready = False
+    http_client = create_http_client()
+    weather_service = WeatherService(settings)
+    weather_service.client = http_client
+    ai_service = AIService(settings)
+    prefetcher = ForecastPrefetcher(weather_service)
+    materializer = RecommendationMaterializer(weather_service, ai_service, prefetcher)
+    restaurant_service = RestaurantService(settings)
+    restaurant_service.client = http_client
+    app.state.weather_service = weather_service
+    app.state.ai_service = ai_service
+    app.state.prefetcher = prefetcher
+    app.state.materializer = materializer
+    app.state.restaurant_service = restaurant_service
+    # 실시간 날씨·그룹 추천 알림 (WebSocket /ws/live)
+    live_hub = LiveHub(weather_service)
+    live_hub.start()
+    app.state.live_hub = live_hub
+    # 같은 추천·레시피 요청의 동시 실행을 하나로 합치고 결과를 잠시 재사용
+    app.state.deduplicator = RequestDeduplicator()
+    # 피드백이 새로 쌓이면 랭킹 모델을 주기적으로 다시 학습 (RANKER_TRAIN_INTERVAL)
+    ai_service.ranking.start()
+    # 기상청 API 키가 있을 때만 인기 격자 예보를 발표 직후 미리 갱신
+    if weather_service.api_key and settings.prefetch_enabled:
+        prefetcher.start()
+    # 새 발표분마다 인기 격자 × 선호도 조합 추천을 미리 계산 (기상청 API 키가 있을 때만)
+    if materializer.enabled:
+        materializer.start()
+    # 이벤트 루프 지연 측정 (/metrics의 lunch_event_loop_lag_seconds)
+    loop_lag = asyncio.ensure_future(monitor_loop_lag(settings.loop_lag_interval))
+    app.state.ready = True
+    yield
+    app.state.ready = False
+    loop_lag.cancel()
+    await live_hub.stop()
+    await prefetcher.stop()
+    await materializer.stop()
+    await ai_service.ranking.stop()
+    await http_client.aclose()
+    ai_service.recipe_cache.close()
+    ai_service.feedback.close()
+    materializer.table.close()
+    if get_shared_store() is not None:
+        await get_shared_store().close()
 
 app = FastAPI(
     title="AI 점심 메뉴 추천 API",
     description="날씨 기반 AI 점심 메뉴 추천 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    # orjson이 설치되어 있으면 ORJSONResponse
+    default_response_class=DefaultJSONResponse
 )
 
+# 요청 수락 제어 (우선순위 등급별 동시 처리 한도, 마감 순 대기열, 과부하 시 429 또는 LLM 없는 추천)
+# CORS·메트릭 미들웨어 안쪽에 두어 거절 응답에도 CORS 헤더가 붙고 메트릭에 기록됨
+admission = AdmissionController(settings.llm_max_concurrency)
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],
+    allow_origins=list(settings.cors_origins),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 혼잡 응답(429)의 재시도 시간을 브라우저 코드에서 읽을 수 있도록
+    expose_headers=["Retry-After"],
 )
 
-# 서비스 인스턴스
-weather_service = WeatherService()
-ai_service = AIService()
+# 응답 압축 (br 또는 gzip, SSE 경로 제외)
+app.add_middleware(CompressionMiddleware)
+
+# 엔드포인트별 응답 시간·상태 코드 메트릭 (/metrics)
+app.add_middleware(MetricsMiddleware)
+
+# 서비스 인스턴스 (lifespan에서 생성해 app.state에 보관)
+def get_weather_service(request: Request) -> WeatherService:
+    return request.app.state.weather_service
+
+def get_ai_service(request: Request) -> AIService:
+    return request.app.state.ai_service
+
+def get_prefetcher(request: Request) -> ForecastPrefetcher:
+    return request.app.state.prefetcher
+
+def get_materializer(request: Request) -> RecommendationMaterializer:
+    return request.app.state.materializer
+
+def get_deduplicator(request: Request) -> RequestDeduplicator:
+    return request.app.state.deduplicator
+
+def get_restaurant_service(request: Request) -> RestaurantService:
+    return request.app.state.restaurant_service
+
+def get_live_hub(request: Request) -> LiveHub:
+    return request.app.state.live_hub
+
+def llm_allowed(request: Request) -> bool:
+    """수락 제어가 과부하로 LLM 없이 처리하도록 넘긴 요청이면 False"""
+    return getattr(request.state, "llm_allowed", True)
+
+def dedup_route(route: str, request: Request) -> str:
+    """중복 제거 구분 (LLM 없이 처리하는 요청이 LLM을 기다리는 같은 요청에 합류하지 않도록 따로)"""
+    return route if llm_allowed(request) else f"{route}_degraded"
+
+def cache_metrics():
+    """기존 캐시 통계를 메트릭으로 내보냄"""
+    if not getattr(app.state, "ready", False):
+        return
+    weather_service = app.state.weather_service
+    ai_service = app.state.ai_service
+    prefetcher = app.state.prefetcher
+    caches = {
+        "weather": weather_service.forecast_cache.stats(),
+        "recipe": ai_service.recipe_cache.stats(),
+        "recommend": ai_service.response_cache.stats(),
+        "restaurant": app.state.restaurant_service.cache.stats(),
+    }
+    results = ("hits", "stale_hits", "memory_hits", "disk_hits", "degraded_hits", "misses")
+    yield "lunch_cache_requests_total", "counter", "캐시 조회 결과별 횟수", [
+        ({"cache": cache, "result": result}, stats[result])
+        for cache, stats in caches.items()
+        for result in results if result in stats
+    ]
+    yield "lunch_prefetch_warm_ratio", "gauge", "선행 갱신 대상 격자 중 현재 발표분이 캐시에 있는 비율", [
+        ({}, prefetcher.warm_ratio() or 0)
+    ]
+
+REGISTRY.register_collector(cache_metrics)
+
+def admission_metrics():
+    """수락 제어 등급별 대기열 길이와 처리 중인 요청 수"""
+    yield "lunch_admission_queue_depth", "gauge", "수락 제어 대기열에서 기다리는 요청 수", [
+        ({"class": name}, len(klass.queue)) for name, klass in admission.classes.items()
+    ]
+    yield "lunch_admission_inflight", "gauge", "수락 제어를 통과해 처리 중인 요청 수", [
+        ({"class": name}, klass.inflight) for name, klass in admission.classes.items()
+    ]
+
+REGISTRY.register_collector(admission_metrics)
+
+def live_metrics():
+    """실시간 구독 연결·격자·그룹 수"""
+    if not getattr(app.state, "ready", False):
+        return
+    live_hub = app.state.live_hub
+    yield "lunch_live_connections", "gauge", "WebSocket 구독 연결 수", [({}, live_hub.connections)]
+    yield "lunch_live_subscriptions", "gauge", "구독 중인 날씨 격자·그룹 수", [
+        ({"kind": "cell"}, len(live_hub.cells)),
+        ({"kind": "group"}, len(live_hub.groups)),
+    ]
+
+REGISTRY.register_collector(live_metrics)
+
+def materialize_metrics():
+    """추천 사전 계산 표 크기, 마지막 계산 시간, 실제 요청의 조회 결과"""
+    if not getattr(app.state, "ready", False):
+        return
+    materializer = app.state.materializer
+    table = materializer.table.stats()
+    yield "lunch_materialized_lookups_total", "counter", "사전 계산 추천 조회 결과별 횟수", [
+        ({"result": result}, count) for result, count in materializer.lookups.items()
+    ]
+    yield "lunch_materialized_rows", "gauge", "사전 계산 추천 표의 행 수", [({}, table["rows"])]
+    yield "lunch_materialized_bytes", "gauge", "사전 계산 추천 표 크기 (바이트)", [({}, table["bytes"])]
+    yield "lunch_materialize_build_seconds", "gauge", "마지막 사전 계산에 걸린 시간 (초)", [
+        ({}, materializer.last_build.get("seconds", {}).get("total", 0))
+    ]
+
+REGISTRY.register_collector(materialize_metrics)
+
+# 클라이언트 연결 끊김 확인 주기 (초)
+DISCONNECT_POLL_INTERVAL = 0.5
+
+async def run_until_disconnected(http_request: Request, coro):
+    """클라이언트 연결이 끊기면 진행 중인 작업(LLM 호출 등)을 취소"""
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                raise HTTPException(status_code=499, detail="클라이언트 연결이 종료되었습니다.")
+    finally:
+        if not task.done():
+            task.cancel()
+
+# 일괄 추천 요청 최대 건수
+MAX_BATCH_SIZE = settings.max_batch_size
+
+# /api/lunch에서 추천 메뉴 레시피를 기다리는 최대 시간 (초, 넘으면 레시피 없이 응답하고 생성은 계속)
+LUNCH_RECIPE_WAIT_SECONDS = settings.lunch_recipe_wait_seconds
 
 # Request 모델
 class RecommendRequest(BaseModel):
@@ -32,81 +241,458 @@ class RecommendRequest(BaseModel):
     mood: Optional[str] = "평범한"
     num_people: int = 1
     moods: Optional[list] = None  # 다인 모드일 때 각 사람의 기분
+    group_id: Optional[str] = None  # 추천 결과를 /ws/live?group=로 접속한 참가자에게도 전송
+
+class BatchRecommendRequest(BaseModel):
+    requests: List[RecommendRequest]
+
+class LunchRequest(RecommendRequest):
+    include_recipe: bool = False  # 추천 메뉴 레시피를 미리 생성해 함께 반환 (레시피를 볼 클라이언트만 켬)
+    num_servings: Optional[int] = None  # 레시피 인분 수 (기본: 인원 수)
 
 class RecipeRequest(BaseModel):
     menu_name: str
     num_servings: int = 1
 
+class FeedbackRequest(BaseModel):
+    recommendation_id: str  # 추천 응답의 recommendation_id
+    event: str  # accept, reject, recipe_click, restaurant_click
+
+def get_preferences(request: RecommendRequest) -> Dict:
+    """추천 요청 → 사용자 선호도"""
+    return {
+        "food_type": request.food_type,
+        "mood": request.mood,
+        "num_people": request.num_people,
+        "moods": request.moods
+    }
+
 @app.get("/")
 async def root():
     return {
         "message": "AI 점심 메뉴 추천 API",
         "version": "1.0.0",
         "endpoints": {
-            "weather": "/api/weather?location={location}",
-            "recommend": "/api/recommend (POST)"
+            "weather": "/api/weather?location={location} 또는 ?lat={lat}&lon={lon} (&at={ISO 시각})",
+            "recommend": "/api/recommend (POST)",
+            "recommend_batch": "/api/recommend/batch (POST)",
+            "feedback": "/api/feedback (POST)",
+            "lunch": "/api/lunch (POST, 날씨 + 추천 + 추천 메뉴 레시피)",
+            "restaurants": "/api/restaurants?menu={menu}&location={location} 또는 &lat={lat}&lon={lon} (&radius=&page=&size=)",
+            "recipe": "/api/recipe (POST)",
+            "recipe_stream": "/api/recipe/stream?menu_name={menu}&num_servings={n} (SSE)",
+            "live": "/ws/live?location={location}&group={group_id} (WebSocket, 날씨·그룹 추천 알림)"
         }
     }
 
 @app.get("/api/weather")
-async def get_weather(location: str = "서울"):
-    """날씨 정보 조회"""
+async def get_weather(
+    location: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    at: Optional[datetime] = None,
+    weather_service: WeatherService = Depends(get_weather_service)
+):
+    """날씨 정보 조회 (위치명 또는 lat/lon, at: 예보 시각, 기본은 지금)"""
+    if (lat is None) != (lon is None):
+        raise HTTPException(status_code=400, detail="lat과 lon을 함께 지정해주세요.")
+    
     try:
-        weather_data = await weather_service.get_weather(location)
+        if lat is not None:
+            # 위치명이 없으면 가장 가까운 행정구역 이름 사용
+            location = location or weather_service.area_index.nearest(lat, lon).name
+            weather_data = await weather_service.get_weather(location, lat=lat, lon=lon, at=at)
+        else:
+            weather_data = await weather_service.get_weather(location or "서울", at=at)
         return {
             "success": True,
             "data": weather_data
         }
     except Exception as e:
+        logger.exception("요청 처리 오류")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/recommend")
-async def recommend_menu(request: RecommendRequest):
-    """AI 메뉴 추천"""
-    try:
-        # 1. 날씨 정보 가져오기
-        weather_data = await weather_service.get_weather(request.location)
+async def recommend_menu(
+    request: RecommendRequest,
+    http_request: Request,
+    response: Response,
+    weather_service: WeatherService = Depends(get_weather_service),
+    ai_service: AIService = Depends(get_ai_service),
+    deduplicator: RequestDeduplicator = Depends(get_deduplicator),
+    live_hub: LiveHub = Depends(get_live_hub),
+    materializer: RecommendationMaterializer = Depends(get_materializer)
+):
+    """AI 메뉴 추천 (같은 요청·Idempotency-Key가 겹치면 한 번만 처리, group_id가 있으면 그룹 참가자에게도 전송)"""
+    async def recommend():
+        # 1. 날씨 정보 가져오기 (점심 시각 예보)
+        weather_data = await weather_service.get_weather(request.location, at=lunch_time())
         
         # 2. 사용자 선호도
-        preferences = {
-            "food_type": request.food_type,
-            "mood": request.mood,
-            "num_people": request.num_people,
-            "moods": request.moods
+        preferences = get_preferences(request)
+        
+        # 3. AI 추천 (미리 계산해 둔 추천이 있으면 그것으로, 과부하면 LLM 없이)
+        recommendation, context = await ai_service.recommend_lunch(
+            weather_data,
+            preferences,
+            use_llm=llm_allowed(http_request),
+            precomputed=lambda: materializer.lookup(request.location, weather_data, preferences)
+        )
+        if request.group_id:
+            await live_hub.publish_group(request.group_id, "recommendation", recommendation)
+        return recommendation, context
+    
+    try:
+        (recommendation, context), replayed = await run_until_disconnected(
+            http_request,
+            deduplicator.run(
+                dedup_route("recommend", http_request),
+                jsonable_encoder(request),
+                recommend,
+                http_request.headers.get("Idempotency-Key")
+            )
+        )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        
+        return {
+            "success": True,
+            # 함께 처리한 요청도 응답마다 따로 노출 기록 (recommendation_id)
+            "data": ai_service.track(recommendation, context)
+        }
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("요청 처리 오류")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/restaurants")
+async def search_restaurants(
+    menu: str,
+    location: Optional[str] = None,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius: Optional[float] = None,
+    page: int = 1,
+    size: int = KAKAO_PAGE_SIZE,
+    restaurant_service: RestaurantService = Depends(get_restaurant_service)
+):
+    """주변 음식점 검색 (위치명 또는 lat/lon, radius: 미터, 거리순 페이지)
+    
+    결과는 (메뉴, geohash 셀) 단위로 캐시되어 가까운 사용자끼리 카카오 API 결과를 재사용합니다.
+    """
+    if (lat is None) != (lon is None):
+        raise HTTPException(status_code=400, detail="lat과 lon을 함께 지정해주세요.")
+    if page < 1 or not 1 <= size <= 50:
+        raise HTTPException(status_code=400, detail="page는 1 이상, size는 1~50이어야 합니다.")
+    if not restaurant_service.api_key:
+        raise HTTPException(status_code=503, detail="음식점 검색을 사용할 수 없습니다 (카카오 API 키 없음).")
+    
+    if lat is None:
+        coords = restaurant_service.resolve_location(location or "서울")
+        if coords is None:
+            raise HTTPException(status_code=404, detail=f"위치를 찾을 수 없습니다: {location}")
+        lat, lon = coords
+    
+    try:
+        result = await restaurant_service.search(menu, lat, lon, radius=radius, page=page, size=size)
+        return {
+            "success": True,
+            "data": result
         }
+    except RestaurantSearchError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception as e:
+        logger.exception("요청 처리 오류")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/lunch")
+async def lunch(
+    request: LunchRequest,
+    http_request: Request,
+    response: Response,
+    weather_service: WeatherService = Depends(get_weather_service),
+    ai_service: AIService = Depends(get_ai_service),
+    deduplicator: RequestDeduplicator = Depends(get_deduplicator),
+    live_hub: LiveHub = Depends(get_live_hub),
+    materializer: RecommendationMaterializer = Depends(get_materializer)
+):
+    """현재 날씨, 메뉴 추천, 추천 메뉴 레시피를 한 번에 반환 (/api/weather → /api/recommend → /api/recipe 대신)
+    
+    현재 날씨와 점심 시각 예보는 동시에 조회하고(같은 발표분이라 기상청 요청은 한 번),
+    레시피는 추천이 나오자마자 생성을 시작해 LUNCH_RECIPE_WAIT_SECONDS 안에 끝나면 포함합니다.
+    """
+    async def compose():
+        current, lunch_weather = await asyncio.gather(
+            weather_service.get_weather(request.location),
+            weather_service.get_weather(request.location, at=lunch_time())
+        )
+        use_llm = llm_allowed(http_request)
+        preferences = get_preferences(request)
+        recommendation, context = await ai_service.recommend_lunch(
+            lunch_weather,
+            preferences,
+            use_llm=use_llm,
+            precomputed=lambda: materializer.lookup(request.location, lunch_weather, preferences)
+        )
+        if request.group_id:
+            # 레시피를 기다리지 않고 그룹 참가자에게 바로 전송
+            await live_hub.publish_group(request.group_id, "recommendation", recommendation)
+        recipe = None
+        num_servings = request.num_servings or request.num_people
+        if request.include_recipe and use_llm:
+            recipe = await ai_service.speculative_recipe(recommendation["menu"], num_servings, LUNCH_RECIPE_WAIT_SECONDS)
+        elif request.include_recipe:
+            # 과부하: 레시피 생성은 시작하지 않고 캐시에 있을 때만 포함
+            recipe = ai_service.cached_recipe(recommendation["menu"], num_servings)
+        return {"weather": current, "recommendation": recommendation, "recipe": recipe}, context
+    
+    try:
+        (data, context), replayed = await run_until_disconnected(
+            http_request,
+            deduplicator.run(
+                dedup_route("lunch", http_request),
+                jsonable_encoder(request),
+                compose,
+                http_request.headers.get("Idempotency-Key")
+            )
+        )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+        return {
+            "success": True,
+            # 함께 처리한 요청도 응답마다 따로 노출 기록 (recommendation_id)
+            "data": dict(data, recommendation=ai_service.track(data["recommendation"], context))
+        }
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("요청 처리 오류")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/recommend/batch")
+async def recommend_batch(
+    request: BatchRecommendRequest,
+    http_request: Request,
+    weather_service: WeatherService = Depends(get_weather_service),
+    ai_service: AIService = Depends(get_ai_service)
+):
+    """여러 추천 요청 일괄 처리 (층·팀 단위 점심 계획)
+    
+    결과는 요청 순서대로 항목별 success/data 또는 success/error로 반환합니다.
+    """
+    if len(request.requests) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_SIZE}건까지 요청할 수 있습니다.")
+    
+    try:
+        # 1. 같은 격자의 날씨는 한 번만 조회
+        weathers = await weather_service.get_weather_batch(
+            [item.location for item in request.requests],
+            at=lunch_time()
+        )
         
-        # 3. AI 추천
-        recommendation = await ai_service.recommend_lunch(weather_data, preferences)
+        # 2. 일괄 추천 (LLM 요청은 묶어서 처리)
+        items = list(zip(weathers, [get_preferences(item) for item in request.requests]))
+        recommendations = await run_until_disconnected(
+            http_request, ai_service.recommend_batch(items, use_llm=llm_allowed(http_request))
+        )
         
         return {
             "success": True,
-            "data": recommendation
+            "data": [
+                {"success": False, "error": str(result)} if isinstance(result, Exception)
+                else {"success": True, "data": result}
+                for result in recommendations
+            ]
         }
+    except HTTPException:
+        raise
     except Exception as e:
+        logger.exception("요청 처리 오류")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/feedback")
+async def record_feedback(request: FeedbackRequest, ai_service: AIService = Depends(get_ai_service)):
+    """추천 피드백 기록 (랭킹 모델 학습 데이터)"""
+    if request.event not in EVENT_LABELS:
+        raise HTTPException(status_code=400, detail=f"event는 {', '.join(EVENT_LABELS)} 중 하나여야 합니다.")
+    if not ai_service.feedback.log_event(request.recommendation_id, request.event):
+        raise HTTPException(status_code=404, detail="추천을 찾을 수 없습니다.")
+    FEEDBACK_EVENTS.inc(request.event)
+    return {"success": True}
+
 @app.post("/api/recipe")
-async def get_recipe(request: RecipeRequest):
-    """레시피 생성"""
+async def get_recipe(
+    request: RecipeRequest,
+    http_request: Request,
+    response: Response,
+    ai_service: AIService = Depends(get_ai_service),
+    deduplicator: RequestDeduplicator = Depends(get_deduplicator)
+):
+    """레시피 생성 (같은 요청·Idempotency-Key가 겹치면 한 번만 처리)"""
     try:
-        recipe = await ai_service.generate_recipe(request.menu_name, request.num_servings)
+        recipe, replayed = await run_until_disconnected(
+            http_request,
+            deduplicator.run(
+                "recipe",
+                jsonable_encoder(request),
+                lambda: ai_service.generate_recipe(request.menu_name, request.num_servings),
+                http_request.headers.get("Idempotency-Key")
+            )
+        )
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
         return {
             "success": True,
             "data": recipe
         }
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
+        logger.exception("요청 처리 오류")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/recipe/stream")
+async def stream_recipe(
+    menu_name: str,
+    num_servings: int = 1,
+    ai_service: AIService = Depends(get_ai_service)
+):
+    """레시피 스트리밍 (Server-Sent Events)
+    
+    이벤트: ingredient(재료 하나), step(조리 단계 하나), meta(기타 필드), done(전체 레시피)
+    """
+    async def event_source():
+        async for event, data in ai_service.stream_recipe(menu_name, num_servings):
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.websocket("/ws/live")
+async def live_updates(websocket: WebSocket, location: Optional[str] = None, group: Optional[str] = None):
+    """실시간 알림 구독 (WebSocket)
+    
+    location: 그 위치 격자의 날씨가 바뀔 때마다 {"type": "weather"} 수신
+    group: 그룹(최대 LIVE_GROUP_SIZE명)의 추천이 나오면 {"type": "recommendation"} 수신
+    접속 후 {"location": "..."}를 보내면 구독 위치를 바꿉니다.
+    """
+    live_hub: LiveHub = websocket.app.state.live_hub
+    if live_hub.is_full():
+        await websocket.close(code=1013)
+        return
+    await websocket.accept()
+    subscriber = live_hub.connect(websocket)
+    try:
+        if group and not await live_hub.join_group(subscriber, group):
+            await websocket.close(code=1008, reason="group is full")
+            return
+        if location:
+            await live_hub.subscribe_weather(subscriber, location)
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("location"):
+                await live_hub.subscribe_weather(subscriber, str(message["location"]))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_hub.disconnect(subscriber)
+
+@app.get("/admin/cache")
+async def cache_stats(
+    weather_service: WeatherService = Depends(get_weather_service),
+    ai_service: AIService = Depends(get_ai_service),
+    deduplicator: RequestDeduplicator = Depends(get_deduplicator),
+    restaurant_service: RestaurantService = Depends(get_restaurant_service)
+):
+    """캐시 적중/미스 통계"""
+    return {
+        "weather": weather_service.forecast_cache.stats(),
+        "recipe": ai_service.recipe_cache.stats(),
+        "recommend": ai_service.response_cache.stats(),
+        # 요청 중복 제거 (진행 중 합류, 완료 결과 재사용, Idempotency-Key 충돌)
+        "dedup": deduplicator.stats(),
+        # 음식점 검색 (주변 셀 결과 재사용, 카카오 API 호출 수)
+        "restaurant": restaurant_service.stats(),
+        # serve.py로 여러 워커를 띄운 경우 공유 저장소 클라이언트 통계 (이 워커 기준)
+        "shared_store": get_shared_store().stats() if get_shared_store() is not None else None
+    }
+
+@app.get("/admin/prefetch")
+async def prefetch_stats(prefetcher: ForecastPrefetcher = Depends(get_prefetcher)):
+    """예보 선행 갱신 일정, 격자별 마지막 갱신 시각, 캐시 준비 비율"""
+    return prefetcher.stats()
+
+@app.get("/admin/materialize")
+async def materialize_stats(materializer: RecommendationMaterializer = Depends(get_materializer)):
+    """추천 사전 계산 일정, 마지막 계산 요약(단계별 시간), 표 크기, 실제 요청 적중률"""
+    return materializer.stats()
+
+@app.get("/admin/llm")
+async def llm_stats(ai_service: AIService = Depends(get_ai_service)):
+    """LLM 서킷 브레이커 상태, 용도별 지연 시간, 헤징 기준"""
+    return ai_service.llm_stats()
+
+@app.get("/admin/ranker")
+async def ranker_stats(ai_service: AIService = Depends(get_ai_service)):
+    """랭킹 모델 정책, 마지막 학습 결과, 응답 결정별 횟수, 피드백 통계"""
+    return dict(ai_service.ranking.stats(), feedback=ai_service.feedback.stats())
+
+@app.get("/admin/admission")
+async def admission_stats():
+    """수락 제어 등급별 처리 중·대기 요청 수, 최근 처리 시간, 결과별 횟수"""
+    return admission.stats()
+
+@app.get("/admin/live")
+async def live_stats(live_hub: LiveHub = Depends(get_live_hub)):
+    """실시간 구독 연결·격자·그룹 수, 날씨 조회 횟수, 메시지 처리 결과"""
+    return live_hub.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 형식 메트릭"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
-    """헬스 체크"""
+    """헬스 체크 (프로세스가 살아 있는지만 확인)"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """요청을 받을 준비가 되었는지 (서비스 생성 완료, 공유 저장소 연결). 아니면 503"""
+    checks = {"services": getattr(request.app.state, "ready", False)}
+    store = get_shared_store()
+    if store is not None:
+        try:
+            await store.call("stats")
+            checks["shared_store"] = True
+        except SharedStoreError:
+            checks["shared_store"] = False
+    ready = all(checks.values())
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "checks": checks},
+        status_code=200 if ready else 503
+    )
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        reload=True,
+        **websocket_options()
     )
 
@@ -0,0 +1,77 @@
+"""운영용 실행: 공유 저장소 프로세스 + uvicorn 워커 N개
+
+워커들은 SHARED_STORE_ADDRESS로 지정한 저장소를 통해 예보 캐시, 추천 답변 풀,
+기상청·OpenAI 호출 한도를 공유합니다 (레시피 캐시는 같은 SQLite 파일을 함께 사용).
+개발 중에는 기존처럼 `python main.py`(자동 재시작, 단일 프로세스)를 사용합니다.
+
+실행 (backend 디렉터리에서):
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+
+import uvicorn
+
+from services.area_index import AreaIndex
+from services.live_updates import websocket_options
+from services.shared_store import run_server
+
+logger = logging.getLogger("serve")
+
+
+def wait_for_socket(address: str, timeout: float = 10.0):
+    """유닉스 소켓 파일이 생길 때까지 대기 (TCP 주소면 바로 반환)"""
+    if not address.startswith("unix:"):
+        return
+    path = address[len("unix:"):]
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"공유 저장소가 시작되지 않았습니다: {address}")
+        time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "info").lower())
+    parser.add_argument(
+        "--store",
+        default=os.getenv("SHARED_STORE_ADDRESS"),
+        help="공유 저장소 주소 (unix:/경로 또는 호스트:포트, 기본: 임시 디렉터리의 유닉스 소켓)"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    address = args.store or f"unix:{os.path.join(tempfile.gettempdir(), f'lunch-store-{args.port}.sock')}"
+    store = multiprocessing.Process(target=run_server, args=(address,), name="shared-store", daemon=True)
+    store.start()
+    wait_for_socket(address)
+
+    # 행정구역 색인은 워커를 띄우기 전에 한 번 만들어 둠 (워커는 만들어진 색인을 열기만 함)
+    AreaIndex.load()
+
+    # 워커 프로세스는 환경변수를 물려받음
+    os.environ["SHARED_STORE_ADDRESS"] = address
+    os.environ.setdefault("RECOMMEND_CACHE_BACKEND", "shared")
+    if os.getenv("RECIPE_CACHE_PATH") == ":memory:":
+        logger.warning("RECIPE_CACHE_PATH=:memory: 이면 워커마다 레시피 캐시가 따로 생깁니다.")
+    logger.info("워커 %d개 시작 (공유 저장소 %s)", args.workers, address)
+    try:
+        uvicorn.run(
+            "main:app", host=args.host, port=args.port, workers=args.workers, log_level=args.log_level,
+            **websocket_options()
+        )
+    finally:
+        store.terminate()
+        store.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""요청 수락 제어 (ASGI 미들웨어): 우선순위 등급, 클라이언트별 토큰 버킷, 마감 시각 순 대기열
+
+점심 직전처럼 요청이 몰릴 때 모든 요청이 함께 느려지는 대신, 감당할 수 있는 만큼만 처리하고
+나머지는 빨리 거절(429 + Retry-After)하거나 LLM 없는 경로(캐시·랭킹 모델·규칙 기반)로 낮춰 응답합니다.
+
+- 등급: interactive(날씨·음식점·피드백) > llm(추천·레시피). 상태 확인·메트릭·관리 경로는 제한하지 않습니다.
+- 등급마다 동시 처리 수 한도가 있고, 한도를 넘으면 대기열에서 마감 시각(도착 + 등급별 허용 시간)이
+  이른 요청부터 처리합니다 (earliest-deadline-first). 자리가 나면 높은 등급부터 처리합니다.
+- 대기열이 가득 차면 더 낮은 등급 중 마감이 가장 늦은 요청을 밀어내고, 밀어낼 요청이 없으면 새 요청을 거절합니다.
+- 예상 대기 시간(대기 중인 수 × 최근 처리 시간 / 동시 처리 한도)이 허용 시간을 넘거나
+  대기 중 마감이 지나면 과부하로 봅니다. 스트리밍 응답(text/event-stream)은 끝날 때까지 자리를 잡지만
+  클라이언트가 읽는 시간까지 포함되므로 최근 처리 시간에는 넣지 않습니다.
+- 과부하일 때 추천 경로(/api/recommend, /api/lunch)는 LLM 없이 처리하도록 request.state.llm_allowed = False로
+  넘기고(ADMISSION_DOWNGRADE), 나머지는 429로 거절합니다.
+
+워커마다 따로 제한합니다 (serve.py로 워커 N개를 띄우면 전체 한도는 N배).
+"""
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import time
+
+from services.cache import TTLCache
+from services.metrics import ADMISSION_REQUESTS, ADMISSION_WAIT_SECONDS
+from services.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+LLM = "llm"
+
+# 높은 등급부터 (앞쪽이 먼저 처리되고 대기열에서 밀려나지 않음)
+PRIORITIES = (INTERACTIVE, LLM)
+
+# 경로 접두어 → 등급 (없는 경로는 제한하지 않음: /health, /ready, /metrics, /admin/*, /docs)
+ROUTE_CLASSES = (
+    ("/api/weather", INTERACTIVE),
+    ("/api/restaurants", INTERACTIVE),
+    ("/api/feedback", INTERACTIVE),
+    ("/api/recommend", LLM),
+    ("/api/lunch", LLM),
+    ("/api/recipe", LLM),
+)
+
+# 과부하일 때 거절 대신 LLM 없이 처리할 수 있는 경로
+DOWNGRADABLE = ("/api/recommend", "/api/lunch")
+
+
+def route_class(path: str) -> Optional[str]:
+    for prefix, name in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return name
+    return None
+
+
+class _Class:
+    """등급 하나의 한도·대기열·처리 시간 추정치"""
+
+    __slots__ = ("name", "priority", "max_inflight", "deadline", "inflight", "queue", "service_time")
+
+    def __init__(self, name: str, priority: int, max_inflight: int, deadline: float):
+        self.name = name
+        self.priority = priority
+        self.max_inflight = max_inflight
+        self.deadline = deadline
+        self.inflight = 0
+        # (마감 시각, 도착 순번, future)
+        self.queue: List[Tuple[float, int, asyncio.Future]] = []
+        # 최근 처리 시간 지수 이동 평균 (초, 예상 대기 시간 계산용)
+        self.service_time = 0.0
+
+    def expected_wait(self) -> float:
+        return (len(self.queue) + 1) * self.service_time / self.max_inflight
+
+
+class AdmissionController:
+    """등급별 동시 처리 한도와 대기열, 클라이언트별 토큰 버킷"""
+
+    def __init__(self, llm_max_concurrency: int = 8):
+        self.enabled = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+        self.downgrade = os.getenv("ADMISSION_DOWNGRADE", "true").lower() == "true"
+        self.queue_size = int(os.getenv("ADMISSION_QUEUE_SIZE", "256"))
+        self.max_inflight = int(os.getenv("ADMISSION_MAX_INFLIGHT", "256"))
+        self.classes: Dict[str, _Class] = {
+            INTERACTIVE: _Class(
+                INTERACTIVE, 0,
+                int(os.getenv("ADMISSION_INTERACTIVE_INFLIGHT", "128")),
+                float(os.getenv("ADMISSION_INTERACTIVE_DEADLINE", "2")),
+            ),
+            # 캐시·랭킹 모델로 끝나는 요청도 있어 LLM 동시 호출 수의 2배까지 (더 받으면 LLM 슬롯 앞에서 기다리기만 함)
+            LLM: _Class(
+                LLM, 1,
+                int(os.getenv("ADMISSION_LLM_INFLIGHT", str(llm_max_concurrency * 2))),
+                float(os.getenv("ADMISSION_LLM_DEADLINE", "3")),
+            ),
+        }
+        # 클라이언트별 초당 요청 수 (0이면 제한 없음). 프록시 뒤에서는 ADMISSION_CLIENT_HEADER로 클라이언트 구분
+        self.client_rate = float(os.getenv("ADMISSION_CLIENT_RATE", "0"))
+        self.client_burst = float(os.getenv("ADMISSION_CLIENT_BURST", "20"))
+        self.client_header = os.getenv("ADMISSION_CLIENT_HEADER", "").lower().encode("latin-1")
+        self.clients = TTLCache(maxsize=int(os.getenv("ADMISSION_CLIENT_CACHE_SIZE", "10000")))
+        self._seq = itertools.count()
+        self.inflight = 0
+
+    def queued(self) -> int:
+        return sum(len(klass.queue) for klass in self.classes.values())
+
+    def client_key(self, scope) -> str:
+        if self.client_header:
+            for name, value in scope.get("headers", ()):
+                if name == self.client_header:
+                    return value.decode("latin-1").split(",", 1)[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def check_client(self, key: str) -> Optional[float]:
+        """클라이언트 토큰을 하나 쓰고 None, 남은 토큰이 없으면 다시 시도할 때까지의 초 반환"""
+        if self.client_rate <= 0:
+            return None
+        bucket = self.clients.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.client_rate, self.client_burst)
+        # 버킷이 가득 차는 시간이 지나도록 요청이 없으면 버킷을 버려도 같음
+        self.clients.set(key, bucket, ttl=bucket.burst / bucket.rate + 1)
+        if bucket.try_acquire():
+            return None
+        return bucket.retry_after()
+
+    async def acquire(self, name: str) -> Tuple[bool, float]:
+        """처리 자리를 얻으면 (True, 대기 시간), 과부하면 (False, 권장 재시도 시간)"""
+        klass = self.classes[name]
+        if not klass.queue and self._has_room(klass):
+            self._grant(klass)
+            return True, 0.0
+
+        expected = klass.expected_wait()
+        if expected > klass.deadline:
+            ADMISSION_REQUESTS.inc(name, "shed_expected_wait")
+            return False, expected
+        if self.queued() >= self.queue_size and not self._evict(klass):
+            ADMISSION_REQUESTS.inc(name, "shed_queue_full")
+            return False, expected or klass.deadline
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        start = loop.time()
+        entry = (start + klass.deadline, next(self._seq), future)
+        heapq.heappush(klass.queue, entry)
+        try:
+            await asyncio.wait({future}, timeout=klass.deadline)
+        except asyncio.CancelledError:
+            # 기다리던 요청이 취소됨: 이미 받은 자리는 돌려주고, 아니면 대기열에서 뺌
+            if future.done() and not future.cancelled() and future.result():
+                self.release(name)
+            else:
+                self._remove(klass, entry)
+            raise
+        if not future.done():
+            # 마감이 지나도록 자리가 나지 않음
+            self._remove(klass, entry)
+            ADMISSION_REQUESTS.inc(name, "shed_deadline")
+            return False, klass.expected_wait() or klass.deadline
+        if not future.result():
+            # 더 높은 등급 요청에 밀려남
+            return False, klass.expected_wait() or klass.deadline
+        waited = loop.time() - start
+        ADMISSION_WAIT_SECONDS.observe(waited, name)
+        return True, waited
+
+    def release(self, name: str, service_time: Optional[float] = None):
+        """자리 반환 (service_time이 있으면 처리 시간 추정치에 반영)"""
+        klass = self.classes[name]
+        klass.inflight -= 1
+        self.inflight -= 1
+        if service_time is not None:
+            klass.service_time = (
+                service_time if not klass.service_time else 0.8 * klass.service_time + 0.2 * service_time
+            )
+        self._dispatch()
+
+    def _remove(self, klass: _Class, entry: Tuple[float, int, asyncio.Future]):
+        entry[2].cancel()
+        try:
+            klass.queue.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(klass.queue)
+
+    def _has_room(self, klass: _Class) -> bool:
+        return klass.inflight < klass.max_inflight and self.inflight < self.max_inflight
+
+    def _grant(self, klass: _Class):
+        klass.inflight += 1
+        self.inflight += 1
+
+    def _dispatch(self):
+        """높은 등급부터, 등급 안에서는 마감이 이른 순서로 빈자리에 배정"""
+        now = asyncio.get_running_loop().time()
+        for name in PRIORITIES:
+            klass = self.classes[name]
+            while klass.queue and self._has_room(klass):
+                deadline, _, future = heapq.heappop(klass.queue)
+                if future.done() or deadline <= now:
+                    # 마감이 지난 요청 (기다리던 쪽에서 과부하로 처리)
+                    continue
+                self._grant(klass)
+                future.set_result(True)
+
+    def _evict(self, incoming: _Class) -> bool:
+        """대기열이 가득 찼을 때 incoming보다 낮은 등급 중 마감이 가장 늦은 요청을 밀어냄"""
+        for name in reversed(PRIORITIES):
+            klass = self.classes[name]
+            if klass.priority <= incoming.priority:
+                return False
+            if not klass.queue:
+                continue
+            victim = max(klass.queue, key=lambda entry: entry[0])
+            klass.queue.remove(victim)
+            heapq.heapify(klass.queue)
+            victim[2].set_result(False)
+            ADMISSION_REQUESTS.inc(name, "shed_evicted")
+            return True
+        return False
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "downgrade": self.downgrade,
+            "inflight": self.inflight,
+            "max_inflight": self.max_inflight,
+            "queue_size": self.queue_size,
+            "classes": {
+                name: {
+                    "inflight": klass.inflight,
+                    "max_inflight": klass.max_inflight,
+                    "queued": len(klass.queue),
+                    "deadline_seconds": klass.deadline,
+                    "service_time_ms": round(klass.service_time * 1000, 2),
+                }
+                for name, klass in self.classes.items()
+            },
+            "client_rate": self.client_rate or None,
+            "clients": len(self.clients),
+            "results": {
+                f"{name}:{result}": count for (name, result), count in sorted(ADMISSION_REQUESTS.values.items())
+            },
+        }
+
+
+class AdmissionMiddleware:
+    """경로 등급에 따라 수락·대기·강등·거절 (ASGI 미들웨어, HTTP 요청만)"""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        controller = self.controller
+        name = route_class(scope["path"]) if scope["type"] == "http" and controller.enabled else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = controller.check_client(controller.client_key(scope))
+        if retry_after is not None:
+            ADMISSION_REQUESTS.inc(name, "rate_limited")
+            await self._reject(send, retry_after, "요청이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            return
+
+        admitted, wait = await controller.acquire(name)
+        if not admitted:
+            if controller.downgrade and scope["path"].startswith(DOWNGRADABLE):
+                # 자리를 잡지 않고 LLM 없이 처리 (캐시·랭킹 모델·규칙 기반)
+                ADMISSION_REQUESTS.inc(name, "downgraded")
+                scope.setdefault("state", {})["llm_allowed"] = False
+                await self.app(scope, receive, send)
+                return
+            await self._reject(send, wait, "서버가 혼잡합니다. 잠시 후 다시 시도해주세요.")
+            return
+
+        ADMISSION_REQUESTS.inc(name, "admitted" if not wait else "admitted_after_wait")
+        start = time.perf_counter()
+        streaming = False
+
+        async def send_checked(message):
+            nonlocal streaming
+            if message["type"] == "http.response.start":
+                streaming = any(
+                    key == b"content-type" and value.startswith(b"text/event-stream")
+                    for key, value in message.get("headers", ())
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_checked)
+        finally:
+            controller.release(name, None if streaming else time.perf_counter() - start)
+
+    async def _reject(self, send, retry_after: float, detail: str):
+        body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
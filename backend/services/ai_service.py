@@ -1,186 +1,727 @@
-from openai import OpenAI
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from itertools import islice
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
-import json
+import random
+import time
+from services.cache import SingleFlight
+from services.config import Settings, get_settings
+from services.feedback import FeedbackStore
+from services.json_stream import IncrementalJSONParser
+from services.llm_output import BatchRecommendation, Recipe, Recommendation, parse_items, parse_model
+from services.menu_catalog import MenuItem, load_catalog, temperature_band
+from services.metrics import (
+    DEGRADED, FALLBACKS, LLM_COST, LLM_PARSE, LLM_TOKENS, RECOMMENDATIONS, SPAN_SECONDS, SPECULATIVE,
+    UPSTREAM_ERRORS, span
+)
+from services.prompts import CompiledPrompt, PromptCompiler, count_tokens, tokenizer_name
+from services.rate_limit import create_rate_limiter
+from services.resilience import CLOSED, CircuitBreaker, CircuitOpenError, LatencyTracker, hedged
+from services.ranker import Context, RankingPolicy, ranking_context
+from services.recipe_cache import RecipeCache, normalize_menu_name, scale_recipe
+from services.response_cache import RecommendationCache, recommendation_key
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 레시피 스트리밍: 배열 필드 → 요소 하나당 보내는 이벤트 이름
+RECIPE_EVENTS = {"ingredients": "ingredient", "steps": "step"}
+
+# 후보 메뉴가 없을 때의 기본 메뉴
+DEFAULT_MENU = {
+    "name": "비빔밥",
+    "category": "한식",
+    "spicy": "보통",
+    "reason": "영양 균형이 잡힌 건강식입니다"
+}
+
+# 레시피 캐시에 저장하는 기준 인분 수 (요청 인분 수로는 환산해서 응답)
+BASE_SERVINGS = 1
+
+# 용도별 LLM 지연 시간 목표(초): SLO_<용도>_SECONDS 환경변수로 변경
+DEFAULT_SLOS = {
+    "recommend": 8.0,
+    "recommend_batch": 15.0,
+    "recipe": 15.0,
+    "recipe_stream": 20.0,
+    "materialize": 30.0,
+}
+
+def weather_summary(weather: Dict) -> Dict:
+    """응답에 포함할 날씨 요약"""
+    return {
+        "location": weather.get("location"),
+        "temperature": weather.get("temperature"),
+        "condition": weather.get("sky_condition")
+    }
+
+
+def temperature_match(weather: Dict) -> str:
+    """기온·강수에 맞춘 추천 설명 (규칙 기반 추천, 다른 날씨에서 받은 답변을 재사용할 때)"""
+    # 예보 시계열에 기온이 없으면 None (weather_bucket과 같이 20°C로 봄)
+    temp = weather.get("temperature")
+    temp = 20 if temp is None else temp
+    precipitation = weather.get("precipitation") or "없음"
+    if temp < 10:
+        text = f"쌀쌀한 날씨({temp}°C)에 따뜻한 음식으로 몸을 녹이세요"
+    elif temp > 25:
+        text = f"더운 날씨({temp}°C)에 시원한 음식으로 더위를 식히세요"
+    else:
+        text = f"적당한 날씨({temp}°C)에 어떤 메뉴든 좋습니다"
+    if precipitation != "없음":
+        text += f". {precipitation}가 내리니 따뜻한 국물 요리가 제격입니다"
+    return text
+
+
+def build_rule_recommendation(
+    weather: Dict,
+    candidates: Sequence[MenuItem],
+    selected: Optional[MenuItem] = None
+) -> Dict:
+    """후보 중 하나(selected가 없으면 무작위)를 골라 규칙 기반 추천 응답 생성 (대체 메뉴는 후보 순서대로)
+
+    AIService 없이 호출할 수 있어 추천 사전 계산 작업의 프로세스 풀에서도 사용합니다.
+    """
+    if selected is not None:
+        selected = selected.to_dict()
+    elif candidates:
+        selected = random.choice(candidates).to_dict()
+    else:
+        # 기본 메뉴
+        selected = DEFAULT_MENU
+    
+    # 대체 메뉴 생성
+    alternatives = list(islice((c.name for c in candidates if c.name != selected["name"]), 3))
+    if not alternatives:
+        alternatives = ["김치찌개", "짜장면", "돈카츠"]
+    
+    return {
+        "menu": selected["name"],
+        "category": selected["category"],
+        "reason": selected["reason"],
+        "temperature_match": temperature_match(weather),
+        "alternatives": alternatives,
+        "weather_info": weather_summary(weather)
+    }
 
 class AIService:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-            self.model = "gpt-3.5-turbo"
-            self.use_ai = True
-            print("✅ OpenAI API 연결됨")
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        self.settings = settings
+        # LLM 호출 제한: 동시 호출 수, 호출당 시간 제한(초, 대기 시간 포함)
+        self.llm_timeout = settings.llm_timeout
+        self.llm_max_concurrency = settings.llm_max_concurrency
+        self._llm_slots = asyncio.Semaphore(self.llm_max_concurrency)
+        # OpenAI 요청 수 한도 (초당, 워커 전체 합산, 0이면 제한 없음)
+        self.llm_rate_limiter = create_rate_limiter(
+            "llm",
+            rate=float(os.getenv("LLM_RATE_PER_SEC", "0")),
+            burst=float(os.getenv("LLM_BURST", "10"))
+        )
+        # 용도별 지연 시간 목표 (LLM 호출은 min(목표, llm_timeout) 안에 끝나야 함)
+        self.slos = {
+            purpose: float(os.getenv(f"SLO_{purpose.upper()}_SECONDS", str(default)))
+            for purpose, default in DEFAULT_SLOS.items()
+        }
+        # 최근 지연 시간 p95가 지나도 응답이 없으면 같은 요청을 한 번 더 보냄 (먼저 온 응답 사용)
+        self.hedge_enabled = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+        self.hedge_min_delay = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+        self.llm_latency = LatencyTracker()
+        # 오류·느린 응답이 몰리면 LLM 호출을 멈추고 캐시·규칙 기반으로 응답
+        self.llm_breaker = CircuitBreaker("llm")
+        self.slow_call_fraction = float(os.getenv("BREAKER_SLOW_CALL_FRACTION", "0.8"))
+        # 일괄 추천 시 completion 하나에 묶는 요청 수
+        self.llm_batch_size = settings.llm_batch_size
+        # JSON 모드(response_format) 요청 여부 (지원하지 않는 호환 서버면 false)
+        self.json_mode = os.getenv("LLM_JSON_MODE", "true").lower() == "true"
+        # 메뉴명 기준 레시피 캐시 (메모리 + SQLite), 같은 메뉴 동시 생성은 한 번만
+        self.recipe_cache = RecipeCache()
+        self._recipe_inflight = SingleFlight()
+        # 추천 응답 캐시 (양자화된 날씨·선호도별 LLM 답변 풀)
+        self.response_cache = RecommendationCache()
+        # 규칙 기반 추천용 메뉴 카탈로그 (프로세스당 한 번 로드)
+        self.catalog = load_catalog()
+        # 추천 노출·피드백 기록과 피드백으로 학습한 랭킹 모델 (확신이 있으면 LLM 없이 응답)
+        self.feedback = FeedbackStore()
+        self.ranking = RankingPolicy(self.catalog, self.feedback)
+        self.model = settings.openai_model
+        # 용도별 메시지·max_tokens 생성, 1K 토큰당 가격(USD, 요청당 비용 기록용)
+        self.prompts = PromptCompiler(self.model)
+        self.price_prompt = float(os.getenv("LLM_PRICE_PROMPT_PER_1K", "0.0005"))
+        self.price_completion = float(os.getenv("LLM_PRICE_COMPLETION_PER_1K", "0.0015"))
+        self.use_ai = settings.openai_api_key is not None
+        self._client = None
+        if self.use_ai:
+            logger.info("OpenAI API 사용 (모델: %s)", self.model)
         else:
-            self.client = None
-            self.use_ai = False
-            print("⚠️  OpenAI API 키가 없습니다. 규칙 기반 추천 로직을 사용합니다.")
+            logger.warning("OpenAI API 키가 없습니다. 규칙 기반 추천 로직을 사용합니다.")
+    
+    @property
+    def client(self):
+        """OpenAI 클라이언트 (SDK 가져오기가 무거워 첫 LLM 호출 때 생성, 키가 없으면 None)"""
+        if self._client is None and self.use_ai:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(
+                api_key=self.settings.openai_api_key,
+                base_url=self.settings.openai_base_url,
+                timeout=self.llm_timeout
+            )
+        return self._client
     
     async def recommend_lunch(
         self,
         weather: Dict,
-        preferences: Optional[Dict] = None
-    ) -> Dict:
-        """날씨와 선호도를 기반으로 점심 메뉴 추천"""
+        preferences: Optional[Dict] = None,
+        use_llm: bool = True,
+        precomputed: Optional[Callable[[], Optional[Dict]]] = None
+    ) -> Tuple[Dict, Context]:
+        """날씨와 선호도를 기반으로 점심 메뉴 추천, (출처(source)를 붙인 추천, 랭킹 조건) 반환
+        
+        랭킹 모델이 확신하면 모델로, 미리 계산해 둔 추천이 있으면 그것으로,
+        아니면 LLM(키가 없으면 규칙 기반)으로 응답합니다.
+        precomputed는 미리 계산한 추천을 찾는 함수로, 랭킹 모델이 답하지 않을 때만 호출합니다 (적중률 집계).
+        use_llm이 False(과부하)면 LLM 대신 캐시된 LLM 답변 → 규칙 기반 순서로 응답합니다.
+        중복 요청이 결과를 함께 쓰므로 피드백용 recommendation_id는 응답마다 track()으로 붙입니다.
+        """
+        context = ranking_context(weather, preferences)
+        ranked = self.ranking.decide(context)
+        materialized = precomputed() if ranked is None and precomputed is not None else None
+        if ranked is not None:
+            recommendation, source = self._model_recommendation(weather, ranked), "model"
+        elif materialized is not None:
+            recommendation = self._reuse_answer(materialized, weather)
+            source = "materialized"
+        elif use_llm or not self.use_ai:
+            recommendation, source = await self._recommend_without_ranker(weather, preferences)
+        else:
+            FALLBACKS.inc("recommend", "overload")
+            recommendation, source = await self._degraded_recommendation(
+                recommendation_key(weather, preferences), weather, preferences
+            )
+        return dict(recommendation, source=source), context
+    
+    def _model_recommendation(self, weather: Dict, ranked) -> Dict:
+        """랭킹 모델 상위 후보 중 하나로 추천 응답 생성"""
+        selected, score = self.ranking.choose(ranked)
+        recommendation = self._build_rule_recommendation(weather, [item for item, _ in ranked], selected)
+        recommendation["score"] = round(score, 4)
+        return recommendation
+    
+    def track(self, recommendation: Dict, context: Context) -> Dict:
+        """응답 하나의 노출 기록 후 recommendation_id를 붙인 사본 반환 (기록에 실패해도 추천은 그대로 응답)"""
+        source = recommendation["source"]
+        RECOMMENDATIONS.inc(source)
+        recommendation = dict(recommendation)
+        try:
+            recommendation["recommendation_id"] = self.feedback.log_impression(
+                *context, recommendation["menu"], source, recommendation.get("score")
+            )
+        except Exception:
+            logger.exception("추천 노출 기록 오류")
+        return recommendation
+    
+    async def _recommend_without_ranker(self, weather: Dict, preferences: Optional[Dict]) -> Tuple[Dict, str]:
+        """LLM 추천 (키가 없으면 규칙 기반), (추천, 출처) 반환"""
         
         # API 키가 없으면 규칙 기반 추천 사용
         if not self.use_ai:
-            return self._get_smart_recommendation(weather, preferences)
+            return self._get_smart_recommendation(weather, preferences), "rule"
         
-        # 프롬프트 생성
-        prompt = self._build_prompt(weather, preferences)
+        # 같은 조건(양자화된 날씨·선호도)의 답변 풀이 차 있으면 그중 하나로 응답
+        cache_key = recommendation_key(weather, preferences)
+        cached = await self.response_cache.lookup(cache_key)
+        if cached is not None:
+            return self._reuse_answer(cached, weather), "llm_cache"
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """당신은 직장인들을 위한 점심 메뉴 추천 전문가입니다. 
-                        날씨, 계절, 온도를 고려하여 최적의 메뉴를 추천해주세요.
-                        응답은 반드시 JSON 형식으로 다음 구조를 따라주세요:
-                        {
-                            "menu": "메뉴명",
-                            "category": "한식/중식/일식/양식/분식",
-                            "reason": "추천 이유 (100자 이내)",
-                            "temperature_match": "온도와의 연관성",
-                            "alternatives": ["대체 메뉴1", "대체 메뉴2"]
-                        }"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.8,
-                max_tokens=500
-            )
-            
-            # 응답 파싱
-            content = response.choices[0].message.content
+            # 프롬프트 생성
+            with span("llm.prompt_build"):
+                prompt = self.prompts.recommend(weather, preferences)
             
-            # JSON 파싱 시도
-            try:
-                recommendation = json.loads(content)
-            except json.JSONDecodeError:
-                # JSON 파싱 실패 시 텍스트에서 추출
-                recommendation = {
-                    "menu": "김치찌개",
-                    "category": "한식",
-                    "reason": content[:100] if len(content) > 100 else content,
-                    "temperature_match": "따뜻한 음식으로 적합합니다.",
-                    "alternatives": ["된장찌개", "부대찌개"]
-                }
+            response = await self._chat(prompt, purpose="recommend", temperature=0.8)
             
-            # 날씨 정보 추가
-            recommendation["weather_info"] = {
-                "location": weather.get("location"),
-                "temperature": weather.get("temperature"),
-                "condition": weather.get("sky_condition")
-            }
-            
-            return recommendation
+            # 응답 파싱 (깨진 JSON은 복구 후 스키마 검증)
+            choice = response.choices[0]
+            with span("llm.json_parse"):
+                recommendation, outcome = parse_model(choice.message.content, Recommendation, "recommend")
+            if recommendation is not None:
+                # 잘린 응답을 복구한 답변은 이번에만 사용
+                if choice.finish_reason != "length":
+                    await self.response_cache.add(cache_key, dict(recommendation))
+                
+                # 날씨 정보 추가
+                recommendation["weather_info"] = self._weather_info(weather)
+                
+                return recommendation, "llm"
+            FALLBACKS.inc("recommend", outcome)
             
+        except CircuitOpenError:
+            FALLBACKS.inc("recommend", "circuit_open")
         except Exception as e:
-            print(f"AI 추천 오류: {str(e)}")
-            return self._get_fallback_recommendation(weather)
+            FALLBACKS.inc("recommend", "llm_error")
+            logger.warning("AI 추천 오류: %r", e)
+        return await self._degraded_recommendation(cache_key, weather, preferences)
     
-    def _build_prompt(self, weather: Dict, preferences: Optional[Dict]) -> str:
-        """프롬프트 생성"""
-        temp = weather.get("temperature", 20)
-        condition = weather.get("sky_condition", "맑음")
-        location = weather.get("location", "서울")
-        
-        prompt = f"""
-        현재 날씨 정보:
-        - 위치: {location}
-        - 기온: {temp}°C
-        - 날씨: {condition}
-        - 강수: {weather.get("precipitation", "없음")}
+    async def _degraded_recommendation(
+        self, cache_key: str, weather: Dict, preferences: Optional[Dict]
+    ) -> Tuple[Dict, str]:
+        """LLM 답변을 못 받았을 때의 대체 순서: 캐시된 LLM 답변 → 규칙 기반 → 기본 추천"""
+        cached = await self.response_cache.lookup_any(cache_key)
+        if cached is not None:
+            DEGRADED.inc("recommend", "cache")
+            return self._reuse_answer(cached, weather), "llm_cache"
+        try:
+            recommendation = self._get_smart_recommendation(weather, preferences)
+            DEGRADED.inc("recommend", "rule")
+            return recommendation, "rule"
+        except Exception:
+            logger.exception("규칙 기반 추천 오류")
+            DEGRADED.inc("recommend", "default")
+            return self._get_fallback_recommendation(weather), "default"
+    
+    async def recommend_batch(
+        self, items: List[Tuple[Dict, Optional[Dict]]], use_llm: bool = True
+    ) -> List[Union[Dict, Exception]]:
+        """(날씨, 선호도) 목록을 한꺼번에 추천 (결과는 요청 순서대로, 항목별 오류는 예외 객체)
+        
+        랭킹 모델이 확신하는 항목은 모델로 응답하고, 나머지는 LLM에 llm_batch_size개씩 묶어
+        한 번의 completion으로 추천받고, 빠지거나 잘못된 항목만 규칙 기반으로 채웁니다.
+        use_llm이 False(과부하)면 나머지도 규칙 기반으로 응답합니다.
         """
+        contexts = [ranking_context(weather, preferences) for weather, preferences in items]
+        decisions = [self.ranking.decide(context) for context in contexts]
+        results: List[Union[Dict, Exception]] = [None] * len(items)
+        sources = ["model"] * len(items)
+        for i, ranked in enumerate(decisions):
+            if ranked is not None:
+                results[i] = self._model_recommendation(items[i][0], ranked)
         
-        if preferences:
-            food_type = preferences.get("food_type", "상관없음")
-            mood = preferences.get("mood", "평범한")
-            num_people = preferences.get("num_people", 1)
-            moods = preferences.get("moods", [])
-            
-            prompt += f"""
+        # 랭킹 모델이 답하지 않은 항목만 LLM(키가 없으면 규칙 기반)으로
+        rest = [i for i, ranked in enumerate(decisions) if ranked is None]
+        if rest:
+            rest_items = [items[i] for i in rest]
+            if not self.use_ai or not use_llm:
+                if self.use_ai:
+                    FALLBACKS.inc("recommend_batch", "overload", amount=len(rest_items))
+                answered = [(result, "rule") for result in self._get_smart_recommendations(rest_items)]
+            else:
+                chunks = [rest_items[i:i + self.llm_batch_size] for i in range(0, len(rest_items), self.llm_batch_size)]
+                chunk_results = await asyncio.gather(*(self._recommend_chunk(chunk) for chunk in chunks))
+                answered = [answer for answers in chunk_results for answer in answers]
+            for i, (result, source) in zip(rest, answered):
+                results[i] = result
+                sources[i] = source
         
-        사용자 정보:
-        - 인원: {num_people}명
-        - 음식 종류: {food_type}
-        - 기분: {mood}
-            """
-            
-            if moods and len(moods) > 1:
-                prompt += f"\n        - 각 사람의 기분: {', '.join(moods)}"
+        return [
+            result if isinstance(result, Exception) else self.track(dict(result, source=source), context)
+            for result, context, source in zip(results, contexts, sources)
+        ]
+    
+    async def _recommend_chunk(
+        self, chunk: List[Tuple[Dict, Optional[Dict]]]
+    ) -> List[Tuple[Union[Dict, Exception], str]]:
+        """요청 여러 개를 한 번의 completion으로 추천 ((추천, 출처) 목록)"""
+        answers = await self.batch_answers(chunk)
+        
+        # 응답에 없는 항목은 캐시된 LLM 답변, 그다음 규칙 기반으로
+        missing = [i for i in range(len(chunk)) if i not in answers]
+        if missing:
+            FALLBACKS.inc("recommend_batch", "missing", amount=len(missing))
+        fallbacks = {}
+        for i in missing:
+            cached = await self.response_cache.lookup_any(recommendation_key(*chunk[i]))
+            if cached is not None:
+                DEGRADED.inc("recommend_batch", "cache")
+                fallbacks[i] = self._reuse_answer(cached, chunk[i][0])
+        missing = [i for i in missing if i not in fallbacks]
+        if missing:
+            DEGRADED.inc("recommend_batch", "rule", amount=len(missing))
+        fallbacks.update(zip(missing, self._get_smart_recommendations([chunk[i] for i in missing])))
+        
+        results = []
+        for i, (weather, _) in enumerate(chunk):
+            if i in fallbacks:
+                results.append((fallbacks[i], "llm_cache" if i not in missing else "rule"))
+            else:
+                results.append((dict(answers[i], weather_info=self._weather_info(weather)), "llm"))
+        return results
+    
+    async def batch_answers(
+        self, chunk: List[Tuple[Dict, Optional[Dict]]], purpose: str = "recommend_batch"
+    ) -> Dict[int, Dict]:
+        """요청 여러 개를 한 번의 completion으로 추천 (순번 → LLM 답변, 빠지거나 잘못된 항목은 없음)"""
+        answers = {}
+        try:
+            response = await self._chat(self.prompts.batch(chunk), purpose=purpose, temperature=0.8)
+            content = response.choices[0].message.content
+            with span("llm.json_parse"):
+                parsed, _ = parse_items(content, "results", BatchRecommendation, purpose)
+            for answer in parsed:
+                index = answer.pop("index")
+                if 0 <= index < len(chunk):
+                    answers[index] = answer
+        except CircuitOpenError:
+            FALLBACKS.inc(purpose, "circuit_open")
+        except Exception as e:
+            logger.warning("AI 일괄 추천 오류: %r", e)
+        return answers
+    
+    def _weather_info(self, weather: Dict) -> Dict:
+        """응답에 포함할 날씨 요약"""
+        return weather_summary(weather)
+    
+    def _reuse_answer(self, answer: Dict, weather: Dict) -> Dict:
+        """같은 구간의 다른 날씨에서 받은 답변(풀·사전 계산)을 이번 날씨 기준으로 (날씨 요약·기온 설명 다시 채움)"""
+        return dict(answer, weather_info=self._weather_info(weather), temperature_match=temperature_match(weather))
+    
+    def llm_stats(self) -> Dict:
+        """서킷 브레이커 상태, 용도별 최근 지연 시간, 지연 시간 목표와 헤징 기준"""
+        return {
+            "breaker": self.llm_breaker.stats(),
+            "rate_limit": self.llm_rate_limiter.stats() if self.llm_rate_limiter is not None else None,
+            "latency": self.llm_latency.stats(),
+            "slo_seconds": {purpose: self._budget(purpose) for purpose in self.slos},
+            # 용도별 JSON 해석 결과 수 (ok/repaired/partial/invalid_json/invalid_schema)
+            "parse": {
+                purpose: {outcome: count for (p, outcome), count in LLM_PARSE.values.items() if p == purpose}
+                for purpose in sorted({p for p, _ in LLM_PARSE.values})
+            },
+            "hedge_after": {
+                purpose: self._hedge_delay(purpose, self._budget(purpose)) for purpose in self.slos
+            },
+            "tokens": self._token_stats(),
+        }
+    
+    def _token_stats(self) -> Dict:
+        """용도별 요청당 평균 토큰 수·비용과 출력 토큰 한도 (prompt_estimated: 로컬 토크나이저 추정치)"""
+        per_request = {}
+        for (purpose,) in list(LLM_COST.series):
+            requests = LLM_COST.count(purpose)
+            per_request[purpose] = {
+                "requests": requests,
+                "usd_total": round(LLM_COST.total(purpose), 6),
+                "usd_per_request": round(LLM_COST.total(purpose) / requests, 6),
+                **{
+                    f"{kind}_tokens": round(LLM_TOKENS.get(purpose, kind) / requests, 1)
+                    for kind in ("prompt", "prompt_estimated", "completion")
+                },
+            }
+        return {
+            "tokenizer": tokenizer_name(self.model),
+            "max_tokens": {
+                "recommend": self.prompts.recommend_tokens,
+                "recommend_batch_item": self.prompts.batch_item_tokens,
+                "recipe": self.prompts.recipe_tokens,
+                "margin": self.prompts.margin,
+            },
+            "per_request": per_request,
+        }
+    
+    def _budget(self, purpose: str) -> float:
+        """용도별 LLM 호출 시간 제한 (지연 시간 목표와 LLM_TIMEOUT 중 짧은 쪽)"""
+        return min(self.slos.get(purpose, self.llm_timeout), self.llm_timeout)
+    
+    def _hedge_delay(self, purpose: str, budget: float) -> Optional[float]:
+        """최근 p95 지연 시간 (표본이 부족하거나 제한 시간을 넘으면 헤징하지 않음)"""
+        if not self.hedge_enabled:
+            return None
+        p95 = self.llm_latency.quantile(purpose, 0.95)
+        if p95 is None:
+            return None
+        delay = max(p95, self.hedge_min_delay)
+        return delay if delay < budget else None
+    
+    async def _chat(self, prompt: CompiledPrompt, purpose: str = "chat", **kwargs):
+        """동시 호출 수·시간 제한·헤징·서킷 브레이커를 적용한 chat completion 호출 (purpose: 용도/메트릭 레이블)
+        
+        브레이커가 열려 있으면 CircuitOpenError, 제한 시간을 넘기면 asyncio.TimeoutError를 냅니다.
+        """
+        if not self.llm_breaker.allow():
+            raise CircuitOpenError("LLM 서킷 브레이커가 열려 있습니다.")
         
-        prompt += """
+        kwargs.setdefault("max_tokens", prompt.max_tokens)
+        if self.json_mode:
+            kwargs.setdefault("response_format", {"type": "json_object"})
         
-        위 정보를 바탕으로 직장인에게 적합한 점심 메뉴를 추천해주세요.
-        날씨가 추우면 따뜻한 음식, 더우면 시원한 음식을 추천하고,
-        비가 오면 국물 요리를, 맑은 날은 다양한 선택지를 제안해주세요.
-        기분 상태도 고려해서 추천해주세요.
+        async def call():
+            async with self._llm_slots:
+                if self.llm_rate_limiter is not None:
+                    await self.llm_rate_limiter.acquire()
+                return await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=prompt.messages,
+                    **kwargs
+                )
+        
+        # 슬롯 대기 시간까지 포함해 제한
+        budget = self._budget(purpose)
+        start = time.perf_counter()
+        try:
+            with span(f"llm.call.{purpose}"):
+                response = await hedged(call, self._hedge_delay(purpose, budget), budget, purpose)
+        except asyncio.CancelledError:
+            self.llm_breaker.release()
+            raise
+        except Exception as e:
+            UPSTREAM_ERRORS.inc("llm", type(e).__name__)
+            self.llm_breaker.record(False)
+            raise
+        elapsed = time.perf_counter() - start
+        self.llm_latency.add(purpose, elapsed)
+        self.llm_breaker.record(True, slow=elapsed > budget * self.slow_call_fraction)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self._record_usage(purpose, prompt, usage.prompt_tokens or 0, usage.completion_tokens or 0)
+        else:
+            self._record_usage(purpose, prompt, prompt.prompt_tokens, count_tokens(
+                response.choices[0].message.content or "", self.model
+            ))
+        return response
+    
+    def _record_usage(self, purpose: str, prompt: CompiledPrompt, prompt_tokens: int, completion_tokens: int):
+        """토큰 수와 요청당 비용 기록 (로컬 추정 프롬프트 토큰 수도 함께 기록해 실제 값과 비교)"""
+        LLM_TOKENS.inc(purpose, "prompt", amount=prompt_tokens)
+        LLM_TOKENS.inc(purpose, "prompt_estimated", amount=prompt.prompt_tokens)
+        LLM_TOKENS.inc(purpose, "completion", amount=completion_tokens)
+        cost = (prompt_tokens * self.price_prompt + completion_tokens * self.price_completion) / 1000
+        LLM_COST.observe(cost, purpose)
+    
+    async def _chat_stream(self, prompt: CompiledPrompt, purpose: str = "chat_stream", **kwargs) -> AsyncIterator[str]:
+        """스트리밍 chat completion의 텍스트 조각을 순서대로 반환 (제한은 _chat과 동일)
+        
+        스트리밍 응답에는 usage가 없어 토큰 수는 받은 텍스트로 추정해 기록합니다.
         """
+        if not self.llm_breaker.allow():
+            raise CircuitOpenError("LLM 서킷 브레이커가 열려 있습니다.")
+        kwargs.setdefault("max_tokens", prompt.max_tokens)
+        if self.json_mode:
+            kwargs.setdefault("response_format", {"type": "json_object"})
+        
+        loop = asyncio.get_running_loop()
+        budget = self._budget(purpose)
+        deadline = loop.time() + budget
+        
+        def remaining() -> float:
+            return max(0.0, deadline - loop.time())
         
-        return prompt
+        started = loop.time()
+        try:
+            await asyncio.wait_for(self._llm_slots.acquire(), timeout=remaining())
+            if self.llm_rate_limiter is not None:
+                try:
+                    await asyncio.wait_for(self.llm_rate_limiter.acquire(), timeout=remaining())
+                except BaseException:
+                    self._llm_slots.release()
+                    raise
+        except asyncio.TimeoutError:
+            UPSTREAM_ERRORS.inc("llm", "TimeoutError")
+            self.llm_breaker.record(False)
+            raise
+        except asyncio.CancelledError:
+            self.llm_breaker.release()
+            raise
+        stream = None
+        outcome = None
+        received: List[str] = []
+        try:
+            stream = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=self.model,
+                    messages=prompt.messages,
+                    stream=True,
+                    **kwargs
+                ),
+                timeout=remaining()
+            )
+            chunks = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+                except StopAsyncIteration:
+                    break
+                if chunk.choices and chunk.choices[0].delta.content:
+                    received.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+            outcome = True
+        except (asyncio.CancelledError, GeneratorExit):
+            raise
+        except Exception as e:
+            UPSTREAM_ERRORS.inc("llm", type(e).__name__)
+            outcome = False
+            raise
+        finally:
+            if stream is not None:
+                await stream.response.aclose()
+                self._record_usage(
+                    purpose, prompt, prompt.prompt_tokens, count_tokens("".join(received), self.model)
+                )
+            self._llm_slots.release()
+            elapsed = loop.time() - started
+            SPAN_SECONDS.observe(elapsed, f"llm.call.{purpose}")
+            if outcome is None:
+                self.llm_breaker.release()
+            else:
+                self.llm_breaker.record(outcome, slow=outcome and elapsed > budget * self.slow_call_fraction)
     
     async def generate_recipe(self, menu_name: str, num_servings: int = 1) -> Dict:
-        """레시피 생성"""
+        """레시피 생성 (캐시된 기준 레시피가 있으면 인분 수만 환산)"""
         if not self.use_ai:
             return self._get_fallback_recipe(menu_name, num_servings)
         
+        recipe = self.recipe_cache.get(menu_name)
+        if recipe is None:
+            recipe = await self._recipe_inflight.do(
+                normalize_menu_name(menu_name),
+                lambda: self._create_base_recipe(menu_name)
+            )
+        if recipe is None:
+            return self._get_fallback_recipe(menu_name, num_servings)
+        return scale_recipe(recipe, num_servings)
+    
+    async def _create_base_recipe(self, menu_name: str) -> Optional[Dict]:
+        """LLM으로 기준 인분 레시피를 생성해 캐시에 저장 (실패 시 None)"""
         try:
-            prompt = f"""
-            '{menu_name}' 메뉴의 {num_servings}인분 레시피를 작성해주세요.
-            
-            다음 형식으로 JSON 응답해주세요:
-            {{
-                "menu_name": "메뉴명",
-                "servings": {num_servings},
-                "ingredients": [
-                    {{"name": "재료명", "amount": "양"}},
-                ],
-                "steps": [
-                    "1단계 설명",
-                    "2단계 설명",
-                ],
-                "cooking_time": "조리 시간",
-                "difficulty": "쉬움/보통/어려움"
-            }}
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 요리 전문가입니다. 자세하고 실용적인 레시피를 제공해주세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=1000
+            response = await self._chat(
+                self.prompts.recipe(menu_name, BASE_SERVINGS),
+                purpose="recipe",
+                temperature=0.7
             )
             
-            content = response.choices[0].message.content
+            choice = response.choices[0]
+            with span("llm.json_parse"):
+                recipe, outcome = parse_model(
+                    choice.message.content, Recipe, "recipe", non_empty=("ingredients", "steps")
+                )
+            if recipe is None:
+                FALLBACKS.inc("recipe", outcome)
+                return None
             
-            try:
-                recipe = json.loads(content)
-                return recipe
-            except json.JSONDecodeError:
-                return self._get_fallback_recipe(menu_name, num_servings)
-                
+        except CircuitOpenError:
+            FALLBACKS.inc("recipe", "circuit_open")
+            return None
         except Exception as e:
-            print(f"레시피 생성 오류: {str(e)}")
+            FALLBACKS.inc("recipe", "llm_error")
+            logger.warning("레시피 생성 오류: %r", e)
+            return None
+        
+        recipe["servings"] = BASE_SERVINGS
+        # 잘린 응답을 복구한 레시피는 단계가 빠졌을 수 있어 저장하지 않음
+        if choice.finish_reason != "length":
+            self.recipe_cache.put(menu_name, recipe)
+        return recipe
+    
+    def cached_recipe(self, menu_name: str, num_servings: int) -> Optional[Dict]:
+        """캐시에 있는 레시피만 반환 (LLM 호출 없음, 없으면 None)"""
+        cached = self.recipe_cache.get(menu_name)
+        return scale_recipe(cached, num_servings) if cached is not None else None
+    
+    async def speculative_recipe(self, menu_name: str, num_servings: int, wait: float) -> Optional[Dict]:
+        """추천 메뉴의 레시피를 미리 생성해 wait초 안에 끝나면 반환 (아니면 None)
+        
+        시간 안에 못 끝난 생성은 계속 진행되어 캐시에 저장되므로 이어지는 레시피 요청은 바로 응답합니다.
+        이 요청이 취소되면(연결 끊김) 다른 요청이 기다리지 않는 생성은 취소합니다.
+        브레이커가 닫혀 있지 않으면(LLM 장애·과부하) 시작하지 않습니다.
+        """
+        if not self.use_ai:
             return self._get_fallback_recipe(menu_name, num_servings)
+        
+        cached = self.recipe_cache.get(menu_name)
+        if cached is not None:
+            SPECULATIVE.inc("cached")
+            return scale_recipe(cached, num_servings)
+        if self.llm_breaker.state != CLOSED:
+            SPECULATIVE.inc("skipped")
+            return None
+        
+        key = normalize_menu_name(menu_name)
+        future = self._recipe_inflight.start(key, lambda: self._create_base_recipe(menu_name))
+        try:
+            done, _ = await asyncio.wait({future}, timeout=wait)
+        except asyncio.CancelledError:
+            if self._recipe_inflight.cancel_unwaited(key):
+                SPECULATIVE.inc("cancelled")
+            raise
+        if not done:
+            SPECULATIVE.inc("pending")
+            return None
+        SPECULATIVE.inc("ready")
+        # 생성에 실패했으면 None (레시피 요청 때 다시 시도하거나 기본 레시피)
+        recipe = None if future.cancelled() else future.result()
+        return scale_recipe(recipe, num_servings) if recipe is not None else None
+    
+    async def warm_recipe_cache(self, menu_names: List[str]) -> Dict:
+        """캐시에 없는 메뉴의 레시피를 미리 생성 (동시 호출 수는 LLM 제한을 따름)"""
+        missing = [name for name in dict.fromkeys(menu_names) if name not in self.recipe_cache]
+        results = await asyncio.gather(*(self._create_base_recipe(name) for name in missing))
+        return {
+            "requested": len(menu_names),
+            "generated": sum(1 for recipe in results if recipe is not None),
+            "failed": [name for name, recipe in zip(missing, results) if recipe is None],
+        }
+    
+    async def stream_recipe(self, menu_name: str, num_servings: int = 1) -> AsyncIterator[Tuple[str, object]]:
+        """레시피를 (이벤트, 데이터) 단위로 스트리밍
+        
+        재료 하나, 조리 단계 하나가 완성될 때마다 "ingredient"/"step" 이벤트를,
+        그 밖의 필드는 "meta" 이벤트를 보내고 마지막에 전체 레시피로 "done"을 보냅니다.
+        """
+        if not self.use_ai:
+            for event in self._recipe_events(self._get_fallback_recipe(menu_name, num_servings)):
+                yield event
+            return
+        
+        cached = self.recipe_cache.get(menu_name)
+        if cached is not None:
+            for event in self._recipe_events(scale_recipe(cached, num_servings)):
+                yield event
+            return
+        
+        # 기준 인분으로 생성해 캐시에 저장하고, 보내는 재료만 요청 인분으로 환산
+        parser = IncrementalJSONParser(array_keys=RECIPE_EVENTS)
+        recipe = {key: [] for key in RECIPE_EVENTS}
+        reason = "llm_error"
+        try:
+            async for text in self._chat_stream(
+                self.prompts.recipe(menu_name, BASE_SERVINGS),
+                purpose="recipe_stream",
+                temperature=0.7
+            ):
+                for kind, key, value in parser.feed(text):
+                    if kind == "item":
+                        recipe[key].append(value)
+                        if key == "ingredients":
+                            value = scale_recipe({"ingredients": [value]}, num_servings)["ingredients"][0]
+                        yield RECIPE_EVENTS[key], value
+                    elif key not in RECIPE_EVENTS:
+                        recipe[key] = value
+                        yield "meta", {key: num_servings if key == "servings" else value}
+        except CircuitOpenError:
+            reason = "circuit_open"
+        except Exception as e:
+            logger.warning("레시피 스트리밍 오류: %r", e)
+        
+        LLM_PARSE.inc("recipe_stream", "ok" if parser.done else "partial" if parser.fields else "invalid_json")
+        if not recipe["ingredients"] and not recipe["steps"]:
+            FALLBACKS.inc("recipe_stream", reason)
+            # 아무것도 보내지 못했으면 기본 레시피를 같은 방식으로 전송
+            for event in self._recipe_events(self._get_fallback_recipe(menu_name, num_servings)):
+                yield event
+            return
+        
+        recipe["servings"] = BASE_SERVINGS
+        if parser.done:
+            self.recipe_cache.put(menu_name, recipe)
+        yield "done", scale_recipe(recipe, num_servings)
+    
+    def _recipe_events(self, recipe: Dict):
+        """완성된 레시피를 스트리밍과 같은 이벤트 순서로 변환"""
+        for key, value in recipe.items():
+            if key in RECIPE_EVENTS:
+                for item in value:
+                    yield RECIPE_EVENTS[key], item
+            else:
+                yield "meta", {key: value}
+        yield "done", recipe
     
     def _get_fallback_recipe(self, menu_name: str, num_servings: int) -> Dict:
         """기본 레시피"""
@@ -206,168 +747,50 @@ class AIService:
             "note": "AI API 연동 시 더 상세한 레시피가 제공됩니다."
         }
     
-    def _get_smart_recommendation(self, weather: Dict, preferences: Optional[Dict] = None) -> Dict:
-        """규칙 기반 스마트 추천"""
+    def _rule_key(self, weather: Dict, preferences: Optional[Dict]) -> Tuple:
+        """규칙 기반 후보 선택 조건 (음식 종류들, 온도 구분, 기분)"""
         temp = weather.get("temperature", 20)
-        condition = weather.get("sky_condition", "맑음")
         precipitation = weather.get("precipitation", "없음")
         
-        # 음식 데이터베이스
-        menu_db = {
-            "한식": {
-                "따뜻한": [
-                    {"name": "김치찌개", "spicy": "매움", "reason": "얼큰한 국물로 몸을 녹이기 좋습니다"},
-                    {"name": "된장찌개", "spicy": "안 매움", "reason": "구수한 맛이 일품인 건강 메뉴입니다"},
-                    {"name": "부대찌개", "spicy": "보통", "reason": "든든하고 푸짐한 한 끼입니다"},
-                    {"name": "갈비탕", "spicy": "안 매움", "reason": "영양 만점 보양식입니다"},
-                    {"name": "육개장", "spicy": "매움", "reason": "얼큰하고 시원한 국물이 속을 풀어줍니다"},
-                ],
-                "시원한": [
-                    {"name": "냉면", "spicy": "안 매움", "reason": "시원한 육수가 더위를 식혀줍니다"},
-                    {"name": "비빔냉면", "spicy": "매움", "reason": "새콤달콤 매콤한 맛이 일품입니다"},
-                    {"name": "콩국수", "spicy": "안 매움", "reason": "고소하고 시원한 여름 별미입니다"},
-                ],
-                "중간": [
-                    {"name": "비빔밥", "spicy": "보통", "reason": "영양 균형이 잡힌 건강식입니다"},
-                    {"name": "불고기", "spicy": "안 매움", "reason": "달콤한 양념이 식욕을 돋웁니다"},
-                    {"name": "제육볶음", "spicy": "매움", "reason": "매콤한 맛이 밥도둑입니다"},
-                ]
-            },
-            "중식": {
-                "따뜻한": [
-                    {"name": "짬뽕", "spicy": "매움", "reason": "얼큰한 국물로 추위를 날립니다"},
-                    {"name": "짜장면", "spicy": "안 매움", "reason": "부담 없이 즐기는 국민 메뉴입니다"},
-                    {"name": "마라탕", "spicy": "아주 매움", "reason": "얼얼한 맛이 중독성 있습니다"},
-                ],
-                "시원한": [
-                    {"name": "냉짬뽕", "spicy": "매움", "reason": "시원하고 얼큰한 맛의 조화입니다"},
-                    {"name": "냉짜장", "spicy": "안 매움", "reason": "시원하게 즐기는 짜장면입니다"},
-                ],
-                "중간": [
-                    {"name": "볶음밥", "spicy": "보통", "reason": "간단하고 맛있는 한 끼입니다"},
-                    {"name": "탕수육", "spicy": "안 매움", "reason": "바삭하고 달콤한 인기 메뉴입니다"},
-                ]
-            },
-            "일식": {
-                "중간": [
-                    {"name": "초밥", "spicy": "안 매움", "reason": "신선한 재료로 깔끔한 한 끼"},
-                    {"name": "돈카츠", "spicy": "안 매움", "reason": "바삭하고 든든한 식사"},
-                    {"name": "라멘", "spicy": "보통", "reason": "진한 국물이 일품인 면 요리"},
-                    {"name": "우동", "spicy": "안 매움", "reason": "부드럽고 담백한 면 요리"},
-                ]
-            },
-            "양식": {
-                "중간": [
-                    {"name": "파스타", "spicy": "안 매움", "reason": "다양한 소스로 즐기는 면 요리"},
-                    {"name": "스테이크", "spicy": "안 매움", "reason": "육즙 가득한 고급 식사"},
-                    {"name": "리조또", "spicy": "안 매움", "reason": "크리미하고 고소한 맛"},
-                ]
-            },
-            "분식": {
-                "따뜻한": [
-                    {"name": "떡볶이", "spicy": "매움", "reason": "매콤달콤 간식 같은 한 끼"},
-                    {"name": "라볶이", "spicy": "매움", "reason": "라면과 떡볶이의 환상 조합"},
-                ],
-                "중간": [
-                    {"name": "김밥", "spicy": "안 매움", "reason": "간편하고 든든한 한 끼"},
-                    {"name": "우동", "spicy": "안 매움", "reason": "담백하고 부드러운 면 요리"},
-                ]
-            }
-        }
-        
         # 선호도 가져오기
         pref_type = preferences.get("food_type", "상관없음") if preferences else "상관없음"
         pref_mood = preferences.get("mood", "평범한") if preferences else "평범한"
-        num_people = preferences.get("num_people", 1) if preferences else 1
-        
-        # 온도에 따른 카테고리 선택
-        if temp < 10:
-            temp_category = "따뜻한"
-        elif temp > 25:
-            temp_category = "시원한"
-        else:
-            temp_category = "중간"
-        
-        # 비 오는 날은 국물 요리
-        if precipitation != "없음":
-            temp_category = "따뜻한"
-        
-        # 음식 종류 필터링
-        if pref_type != "상관없음":
-            available_types = [pref_type]
-        else:
-            available_types = list(menu_db.keys())
-        
-        # 후보 메뉴 수집
-        candidates = []
-        for food_type in available_types:
-            if temp_category in menu_db[food_type]:
-                for item in menu_db[food_type][temp_category]:
-                    item["category"] = food_type
-                    candidates.append(item)
-            elif "중간" in menu_db[food_type]:
-                for item in menu_db[food_type]["중간"]:
-                    item["category"] = food_type
-                    candidates.append(item)
-        
-        # 기분에 따른 필터링
-        import random
-        
-        # 기분별 추천 메뉴 조정
-        mood_preferences = {
-            "기쁜": ["분식", "양식"],  # 가벼운 음식
-            "슬픈": ["한식", "중식"],  # 위로되는 음식
-            "화난": ["한식", "중식"],  # 매운 음식
-            "피곤한": ["한식", "일식"],  # 든든한 음식
-            "스트레스": ["중식", "한식"],  # 얼큰한 음식
-            "평범한": None  # 제한 없음
-        }
-        
-        if pref_mood in mood_preferences and mood_preferences[pref_mood]:
-            mood_types = mood_preferences[pref_mood]
-            mood_filtered = [c for c in candidates if c["category"] in mood_types]
-            if mood_filtered:
-                candidates = mood_filtered
-        
-        if candidates:
-            selected = random.choice(candidates)
-        else:
-            # 기본 메뉴
-            selected = {
-                "name": "비빔밥",
-                "category": "한식",
-                "spicy": "보통",
-                "reason": "영양 균형이 잡힌 건강식입니다"
-            }
-        
-        # 대체 메뉴 생성
-        alternatives = [c["name"] for c in candidates if c["name"] != selected["name"]][:3]
-        if not alternatives:
-            alternatives = ["김치찌개", "짜장면", "돈카츠"]
-        
-        # 온도 매칭 설명
-        if temp < 10:
-            temp_match = f"쌀쌀한 날씨({temp}°C)에 따뜻한 음식으로 몸을 녹이세요"
-        elif temp > 25:
-            temp_match = f"더운 날씨({temp}°C)에 시원한 음식으로 더위를 식히세요"
-        else:
-            temp_match = f"적당한 날씨({temp}°C)에 어떤 메뉴든 좋습니다"
         
-        if precipitation != "없음":
-            temp_match += f". {precipitation}가 내리니 따뜻한 국물 요리가 제격입니다"
+        # 온도·강수 구분과 음식 종류·기분 조건 (카탈로그 인덱스 조회 키)
+        band = temperature_band(temp, precipitation)
+        categories = None if pref_type == "상관없음" else (pref_type,)
+        return categories, band, pref_mood
+    
+    def _get_smart_recommendation(self, weather: Dict, preferences: Optional[Dict] = None) -> Dict:
+        """규칙 기반 스마트 추천"""
+        candidates = self.catalog.select(*self._rule_key(weather, preferences))
+        return self._build_rule_recommendation(weather, candidates)
+    
+    def _get_smart_recommendations(self, items: List[Tuple[Dict, Optional[Dict]]]) -> List[Union[Dict, Exception]]:
+        """규칙 기반 일괄 추천
         
-        return {
-            "menu": selected["name"],
-            "category": selected["category"],
-            "reason": selected["reason"],
-            "temperature_match": temp_match,
-            "alternatives": alternatives,
-            "weather_info": {
-                "location": weather.get("location"),
-                "temperature": weather.get("temperature"),
-                "condition": weather.get("sky_condition")
-            }
-        }
+        같은 조건 조합의 후보는 한 번만 계산합니다. 항목별 오류는 예외 객체로 반환합니다.
+        """
+        candidates_by_key = {}
+        results = []
+        for weather, preferences in items:
+            try:
+                key = self._rule_key(weather, preferences)
+                if key not in candidates_by_key:
+                    candidates_by_key[key] = self.catalog.select(*key)
+                results.append(self._build_rule_recommendation(weather, candidates_by_key[key]))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _build_rule_recommendation(
+        self,
+        weather: Dict,
+        candidates: Sequence[MenuItem],
+        selected: Optional[MenuItem] = None
+    ) -> Dict:
+        """후보 중 하나(selected가 없으면 무작위)를 골라 추천 응답 생성 (대체 메뉴는 후보 순서대로)"""
+        return build_rule_recommendation(weather, candidates, selected)
     
     def _get_fallback_recommendation(self, weather: Dict) -> Dict:
         """API 오류 시 기본 추천 (간단 버전)"""
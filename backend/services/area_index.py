@@ -0,0 +1,256 @@
+"""행정구역(시/군/구/동) 이름 → 기상청 격자 색인
+
+원본은 기상청이 배포하는 '단기예보 격자_위경도' 표를 CSV로 저장한 파일
+(열: 1단계, 2단계, 3단계, 격자 X, 격자 Y, 경도(초/100), 위도(초/100))이고,
+기본으로는 주요 시/도·시/군/구만 담은 data/areas_seed.csv를 사용합니다.
+
+전국 읍/면/동 색인을 쓰려면 AREA_SOURCE_PATH에 전체 표 CSV 경로를 지정합니다.
+색인은 처음 사용할 때(또는 원본이 바뀌었을 때) data/area_index/에 생성되며 (serve.py는 워커를 띄우기 전에 생성),
+미리 만들 수도 있습니다:
+    python -m services.area_index build 격자_위경도.csv
+"""
+from contextlib import contextmanager
+from difflib import get_close_matches
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+import csv
+import fcntl
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unicodedata
+
+import numpy as np
+
+from services.cache import TTLCache
+from services.kma_grid import latlon_to_grid
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DEFAULT_SOURCE = os.path.join(DATA_DIR, "areas_seed.csv")
+DEFAULT_INDEX_DIR = os.path.join(DATA_DIR, "area_index")
+
+# 행정구역 이름에서 떼어 낸 짧은 이름도 색인 ("강남구" → "강남", "서울특별시" → "서울")
+SUFFIXES = ("특별자치시", "특별자치도", "특별시", "광역시", "도", "시", "군", "구")
+
+# 행정구역 이름이 아닌 통칭
+ALIASES = {
+    "여의도": "여의동",
+    "판교": "판교동",
+}
+
+
+class Area(NamedTuple):
+    name: str
+    nx: int
+    ny: int
+    lat: float
+    lon: float
+
+
+def normalize_name(name: str) -> str:
+    """색인 키용 이름 정규화 (유니코드 정규화, 공백 제거)"""
+    return "".join(unicodedata.normalize("NFC", name).split())
+
+
+def _short_name(name: str) -> Optional[str]:
+    for suffix in SUFFIXES:
+        if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+            return name[:-len(suffix)]
+    return None
+
+
+def _read_source(path: str) -> List[dict]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = []
+        for row in csv.DictReader(f):
+            levels = [(row.get(level) or "").strip() for level in ("1단계", "2단계", "3단계")]
+            lat = float(row["위도(초/100)"])
+            lon = float(row["경도(초/100)"])
+            rows.append({
+                "levels": [level for level in levels if level],
+                "nx": row.get("격자 X") or "",
+                "ny": row.get("격자 Y") or "",
+                "lat": lat,
+                "lon": lon,
+            })
+    return rows
+
+
+@contextmanager
+def _index_lock(index_dir: str):
+    """색인 디렉터리의 생성 잠금 (여러 워커가 동시에 만들지 않도록)"""
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, ".lock"), "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _is_stale(source: str, index_dir: str) -> bool:
+    try:
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        return meta["source"] != os.path.abspath(source) or meta["mtime"] != os.path.getmtime(source)
+    except (OSError, ValueError, KeyError):
+        return True
+
+
+def build_index(source: str = DEFAULT_SOURCE, index_dir: str = DEFAULT_INDEX_DIR) -> str:
+    """CSV 원본으로 메모리 매핑용 색인(.npy) 생성
+
+    임시 디렉터리에 모두 쓴 뒤 파일마다 os.replace로 바꾸고 meta.json을 마지막에 바꾸므로,
+    이미 열어 둔 색인(mmap)은 이전 파일을 계속 읽고 새로 여는 쪽은 완성된 파일만 봅니다.
+    """
+    rows = _read_source(source)
+
+    lat = np.array([row["lat"] for row in rows], dtype=np.float64)
+    lon = np.array([row["lon"] for row in rows], dtype=np.float64)
+    nx, ny = latlon_to_grid(lat, lon)
+    # 원본에 격자 값이 있으면 그 값을 우선 (기상청 공식 값)
+    for i, row in enumerate(rows):
+        if row["nx"] and row["ny"]:
+            nx[i], ny[i] = int(row["nx"]), int(row["ny"])
+
+    # 키 → 행 (같은 키는 원본에서 먼저 나온 행이 우선)
+    key_rows = {}
+    for i, row in enumerate(rows):
+        levels = row["levels"]
+        keys = ["".join(levels[start:]) for start in range(len(levels))]
+        keys.append(levels[-1])
+        short = _short_name(levels[-1])
+        if short:
+            keys.append(short)
+        for key in keys:
+            key_rows.setdefault(normalize_name(key), i)
+    for alias, target in ALIASES.items():
+        if target in key_rows:
+            key_rows.setdefault(alias, key_rows[target])
+
+    keys = sorted(key_rows)
+    os.makedirs(index_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=".build-", dir=index_dir)
+    try:
+        np.save(os.path.join(build_dir, "keys.npy"), np.array(keys, dtype=str))
+        np.save(os.path.join(build_dir, "key_rows.npy"), np.array([key_rows[k] for k in keys], dtype=np.int32))
+        np.save(os.path.join(build_dir, "names.npy"), np.array([" ".join(row["levels"]) for row in rows], dtype=str))
+        np.save(os.path.join(build_dir, "grid.npy"), np.stack([nx, ny], axis=1).astype(np.int16))
+        np.save(os.path.join(build_dir, "coords.npy"), np.stack([lat, lon], axis=1).astype(np.float32))
+        with open(os.path.join(build_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"source": os.path.abspath(source), "mtime": os.path.getmtime(source), "rows": len(rows)}, f)
+        for name in ("keys.npy", "key_rows.npy", "names.npy", "grid.npy", "coords.npy", "meta.json"):
+            os.replace(os.path.join(build_dir, name), os.path.join(index_dir, name))
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+    return index_dir
+
+
+class AreaIndex:
+    """메모리 매핑된 행정구역 색인 (정확/접두어/유사 이름 검색, 가장 가까운 지역 찾기)"""
+
+    def __init__(self, index_dir: str = DEFAULT_INDEX_DIR):
+        def load(name):
+            return np.load(os.path.join(index_dir, name), mmap_mode="r")
+
+        self.keys = load("keys.npy")
+        self.key_rows = load("key_rows.npy")
+        self.names = load("names.npy")
+        self.grid = load("grid.npy")
+        self.coords = load("coords.npy")
+        self._key_list = None
+        # 이름 → resolve() 결과 (사용자 입력이라 LRU로 크기 제한, 못 찾은 이름도 보관)
+        self._resolved = TTLCache(maxsize=4096)
+
+    @classmethod
+    def load(cls, source: Optional[str] = None, index_dir: Optional[str] = None) -> "AreaIndex":
+        """색인을 열되, 없거나 원본 CSV가 바뀌었으면 먼저 다시 생성 (동시에 여러 프로세스가 열면 하나만 생성)"""
+        source = source or os.getenv("AREA_SOURCE_PATH", DEFAULT_SOURCE)
+        index_dir = index_dir or os.getenv("AREA_INDEX_DIR", DEFAULT_INDEX_DIR)
+        if _is_stale(source, index_dir):
+            with _index_lock(index_dir):
+                if _is_stale(source, index_dir):
+                    build_index(source, index_dir)
+        return cls(index_dir)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _area(self, row: int) -> Area:
+        return Area(
+            str(self.names[row]),
+            int(self.grid[row, 0]),
+            int(self.grid[row, 1]),
+            float(self.coords[row, 0]),
+            float(self.coords[row, 1]),
+        )
+
+    def lookup(self, name: str) -> Optional[Area]:
+        """정확히 일치하는 이름"""
+        key = normalize_name(name)
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return self._area(int(self.key_rows[i]))
+        return None
+
+    def search(self, prefix: str, limit: int = 10) -> List[Area]:
+        """접두어로 시작하는 지역 (키 정렬 순서, 같은 지역은 한 번만)"""
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        start = int(np.searchsorted(self.keys, key))
+        end = int(np.searchsorted(self.keys, key + "\uffff"))
+        rows = list(dict.fromkeys(int(row) for row in self.key_rows[start:end]))
+        return [self._area(row) for row in rows[:limit]]
+
+    def fuzzy(self, name: str, limit: int = 5, cutoff: float = 0.6) -> List[Area]:
+        """오타·부분 일치 허용 검색"""
+        if self._key_list is None:
+            self._key_list = [str(key) for key in self.keys]
+        matches = get_close_matches(normalize_name(name), self._key_list, n=limit, cutoff=cutoff)
+        rows = dict.fromkeys(int(self.key_rows[self._key_list.index(match)]) for match in matches)
+        return [self._area(row) for row in rows]
+
+    def resolve(self, name: str) -> Optional[Area]:
+        """정확 → 접두어 → 유사 이름 순서로 찾기"""
+        found = self._resolved.lookup(name, count=False)
+        if found is not None:
+            return found[0]
+        area = self._resolve(name)
+        self._resolved.set(name, area)
+        return area
+
+    def _resolve(self, name: str) -> Optional[Area]:
+        area = self.lookup(name)
+        if area is not None:
+            return area
+        for finder in (self.search, self.fuzzy):
+            found = finder(name, limit=1)
+            if found:
+                return found[0]
+        return None
+
+    def nearest(self, lat: float, lon: float) -> Area:
+        """가장 가까운 지역 (위경도 평면 근사)"""
+        coords = np.asarray(self.coords, dtype=np.float64)
+        d_lat = coords[:, 0] - lat
+        d_lon = (coords[:, 1] - lon) * np.cos(np.radians(lat))
+        return self._area(int(np.argmin(d_lat * d_lat + d_lon * d_lon)))
+
+
+@lru_cache(maxsize=None)
+def load_area_index() -> AreaIndex:
+    """프로세스당 한 번만 색인을 엶"""
+    return AreaIndex.load()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "build":
+        index_dir = os.getenv("AREA_INDEX_DIR", DEFAULT_INDEX_DIR)
+        with _index_lock(index_dir):
+            out = build_index(sys.argv[2], index_dir)
+        print(f"색인 생성 완료: {out} ({len(AreaIndex(out))}개 지역)")
+    else:
+        print(__doc__)
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import time
+
+
+class TTLCache:
+    """만료 시각과 최대 크기(LRU)를 가진 인메모리 캐시
+
+    만료된 항목도 stale_ttl(초) 동안은 보관되어 lookup()으로 꺼낼 수 있습니다
+    (stale-while-revalidate 용도).
+    """
+
+    def __init__(self, maxsize: int = 1024, stale_ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.lookup(key, count=False) is not None
+
+    def lookup(self, key: Hashable, count: bool = True) -> Optional[Tuple[Any, bool]]:
+        """(값, 신선 여부) 반환. 보관 기간이 지났거나 없으면 None"""
+        entry = self._data.get(key)
+        if entry is None:
+            if count:
+                self.misses += 1
+            return None
+
+        expires_at, value = entry
+        now = time.time()
+        if now >= expires_at + self.stale_ttl:
+            del self._data[key]
+            if count:
+                self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        fresh = now < expires_at
+        if count:
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return value, fresh
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """만료되지 않은 값만 반환"""
+        found = self.lookup(key)
+        if found is None or not found[1]:
+            return default
+        return found[0]
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None, ttl: Optional[float] = None):
+        """expires_at(epoch 초) 또는 ttl(초) 중 하나로 만료 시각 지정. 둘 다 없으면 만료 없음"""
+        if expires_at is None:
+            expires_at = time.time() + ttl if ttl is not None else float("inf")
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+
+
+class SingleFlight:
+    """같은 키에 대한 동시 비동기 작업을 하나로 합치는 도우미
+
+    먼저 들어온 호출이 작업을 시작하고, 이후 호출은 같은 결과를 기다립니다.
+    한 호출자가 취소되어도 공유 작업은 계속 진행됩니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # do()로 결과를 기다리는 호출 수
+        self._waiters: Dict[Hashable, int] = {}
+        self.started = 0
+        self.shared = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """진행 중인 작업이 있으면 그 작업을, 없으면 새 작업을 반환"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return future
+
+        self.started += 1
+        future = asyncio.ensure_future(fn())
+        self._inflight[key] = future
+
+        def _done(f: asyncio.Future):
+            if self._inflight.get(key) is f:
+                del self._inflight[key]
+            # 아무도 기다리지 않는 작업의 예외 경고 방지
+            if not f.cancelled():
+                f.exception()
+
+        future.add_done_callback(_done)
+        return future
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self.start(key, fn)
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def cancel_unwaited(self, key: Hashable) -> bool:
+        """do()로 기다리는 호출이 없는 진행 중 작업 취소 (start()로 미리 시작한 작업 정리용)"""
+        future = self._inflight.get(key)
+        if future is None or future.done() or self._waiters.get(key):
+            return False
+        del self._inflight[key]
+        future.cancel()
+        return True
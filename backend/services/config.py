@@ -0,0 +1,78 @@
+"""앱 설정 (환경변수·.env를 프로세스당 한 번 읽어 타입이 있는 값으로 보관)
+
+세부 조정값(캐시 크기, 브레이커 임계값 등)은 각 모듈이 os.getenv로 읽으며,
+.env 내용은 get_settings()를 처음 호출할 때 환경변수로 올라갑니다.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+import os
+
+from dotenv import load_dotenv
+
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+@dataclass(frozen=True)
+class Settings:
+    openai_api_key: Optional[str]
+    openai_base_url: Optional[str]
+    openai_model: str
+    llm_timeout: float
+    llm_max_concurrency: int
+    llm_batch_size: int
+    weather_api_key: Optional[str]
+    weather_api_base_url: str
+    weather_publish_delay_minutes: int
+    weather_page_size: int
+    weather_cache_size: int
+    weather_cache_stale_seconds: float
+    kakao_rest_api_key: Optional[str]
+    kakao_api_base_url: str
+    prefetch_enabled: bool
+    max_batch_size: int
+    lunch_recipe_wait_seconds: float
+    cors_origins: Tuple[str, ...]
+    log_level: str
+    loop_lag_interval: float
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            openai_api_key=os.getenv("OPENAI_API_KEY") or None,
+            openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
+            openai_model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
+            llm_timeout=float(os.getenv("LLM_TIMEOUT", "20")),
+            llm_max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+            llm_batch_size=int(os.getenv("LLM_BATCH_SIZE", "5")),
+            weather_api_key=os.getenv("WEATHER_API_KEY") or None,
+            weather_api_base_url=os.getenv(
+                "WEATHER_API_BASE_URL",
+                "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"
+            ),
+            weather_publish_delay_minutes=int(os.getenv("WEATHER_PUBLISH_DELAY_MINUTES", "10")),
+            weather_page_size=int(os.getenv("WEATHER_PAGE_SIZE", "1000")),
+            weather_cache_size=int(os.getenv("WEATHER_CACHE_SIZE", "1024")),
+            weather_cache_stale_seconds=float(os.getenv("WEATHER_CACHE_STALE_SECONDS", "1800")),
+            kakao_rest_api_key=os.getenv("KAKAO_REST_API_KEY") or None,
+            kakao_api_base_url=os.getenv("KAKAO_API_BASE_URL", "https://dapi.kakao.com"),
+            prefetch_enabled=_flag("PREFETCH_ENABLED", "true"),
+            max_batch_size=int(os.getenv("MAX_BATCH_SIZE", "200")),
+            lunch_recipe_wait_seconds=float(os.getenv("LUNCH_RECIPE_WAIT_SECONDS", "2")),
+            cors_origins=tuple(
+                origin.strip()
+                for origin in os.getenv("CORS_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173").split(",")
+                if origin.strip()
+            ),
+            log_level=os.getenv("LOG_LEVEL", "INFO"),
+            loop_lag_interval=float(os.getenv("LOOP_LAG_INTERVAL", "0.1")),
+        )
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """.env를 한 번 읽고 설정 생성 (이후 호출은 같은 객체)"""
+    load_dotenv()
+    return Settings.from_env()
@@ -0,0 +1,125 @@
+"""추천 노출·피드백 기록 (SQLite, 랭킹 모델 학습 데이터)
+
+추천 응답마다 노출(impression)을 남기고 recommendation_id를 붙여 보냅니다.
+사용자가 추천을 받아들이거나(accept) 다시 추천받거나(reject), 레시피·음식점을 눌렀을 때
+POST /api/feedback으로 그 id와 이벤트를 기록합니다.
+"""
+from typing import Dict, List, NamedTuple, Optional
+import os
+import sqlite3
+import time
+import uuid
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "feedback.sqlite3")
+
+# 이벤트 → 학습 레이블 (1: 좋아함, 0: 싫어함)
+EVENT_LABELS = {
+    "accept": 1,
+    "recipe_click": 1,
+    "restaurant_click": 1,
+    "reject": 0,
+}
+
+
+class Sample(NamedTuple):
+    """학습 표본 하나 (노출 하나에 레이블 하나: 긍정 이벤트가 하나라도 있으면 1)"""
+    event_id: int
+    band: str
+    mood: str
+    food_type: str
+    menu: str
+    label: int
+    source: str
+    created_at: float
+
+
+class FeedbackStore:
+    """노출·이벤트 저장소 (워커 여러 개가 같은 파일을 WAL 모드로 함께 씀)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("FEEDBACK_DB_PATH", DEFAULT_PATH)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # 노출은 추천마다 기록하므로 커밋마다 fsync하지 않음 (WAL에서는 체크포인트 때만)
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS impressions ("
+            " id TEXT PRIMARY KEY,"
+            " band TEXT NOT NULL,"
+            " mood TEXT NOT NULL,"
+            " food_type TEXT NOT NULL,"
+            " menu TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " score REAL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " impression_id TEXT NOT NULL,"
+            " event TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS events_impression ON events (impression_id)")
+        self._db.commit()
+        self.impressions = 0
+        self.events = 0
+
+    def log_impression(
+        self,
+        band: str,
+        mood: str,
+        food_type: str,
+        menu: str,
+        source: str,
+        score: Optional[float] = None
+    ) -> str:
+        """노출 기록 후 recommendation_id 반환"""
+        impression_id = uuid.uuid4().hex
+        self._db.execute(
+            "INSERT INTO impressions (id, band, mood, food_type, menu, source, score, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (impression_id, band, mood, food_type, menu, source, score, time.time())
+        )
+        self._db.commit()
+        self.impressions += 1
+        return impression_id
+
+    def log_event(self, impression_id: str, event: str) -> bool:
+        """이벤트 기록 (없는 recommendation_id면 False)"""
+        found = self._db.execute("SELECT 1 FROM impressions WHERE id = ?", (impression_id,)).fetchone()
+        if found is None:
+            return False
+        self._db.execute(
+            "INSERT INTO events (impression_id, event, created_at) VALUES (?, ?, ?)",
+            (impression_id, event, time.time())
+        )
+        self._db.commit()
+        self.events += 1
+        return True
+
+    def last_event_id(self) -> int:
+        return self._db.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+
+    def samples(self, limit: int = 100000) -> List[Sample]:
+        """피드백이 있는 노출 중 최근 limit개 (오래된 것부터)"""
+        rows = self._db.execute(
+            "SELECT MAX(e.id), i.band, i.mood, i.food_type, i.menu,"
+            " MAX(CASE WHEN e.event = 'reject' THEN 0 ELSE 1 END), i.source, i.created_at"
+            " FROM impressions i JOIN events e ON e.impression_id = i.id"
+            " GROUP BY i.id ORDER BY MAX(e.id) DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [Sample(*row) for row in reversed(rows)]
+
+    def stats(self) -> Dict:
+        return {
+            "impressions": self._db.execute("SELECT COUNT(*) FROM impressions").fetchone()[0],
+            "events": dict(self._db.execute("SELECT event, COUNT(*) FROM events GROUP BY event").fetchall()),
+            "logged_by_worker": {"impressions": self.impressions, "events": self.events},
+        }
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,131 @@
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+import re
+
+import numpy as np
+
+# 저장할 단기예보 항목 (열 순서)
+CATEGORIES = ("TMP", "SKY", "PTY", "REH", "POP", "PCP", "SNO", "WSD", "TMN", "TMX")
+CATEGORY_INDEX = {category: i for i, category in enumerate(CATEGORIES)}
+
+SKY_CODES = {1: "맑음", 3: "구름많음", 4: "흐림"}
+PTY_CODES = {0: "없음", 1: "비", 2: "비/눈", 3: "눈", 4: "소나기"}
+
+_AMOUNT = re.compile(r"[\d.]+")
+
+
+def parse_amount(value: str) -> float:
+    """강수량(PCP)·신적설(SNO) 문자열 → 숫자 (mm/cm)
+
+    "강수없음"/"적설없음" → 0, "1mm 미만" → 0.5, "30.0~50.0mm" → 30, "50.0mm 이상" → 50
+    """
+    if "없음" in value:
+        return 0.0
+    match = _AMOUNT.search(value)
+    if match is None:
+        return float("nan")
+    amount = float(match.group())
+    return amount / 2 if "미만" in value else amount
+
+
+def _to_number(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return parse_amount(value)
+
+
+class ForecastSeries:
+    """격자 하나의 발표분 전체(최대 3일)를 담은 열 기반 시계열
+
+    times는 예보 시각(분 단위 datetime64, 오름차순), values[i, j]는 times[i]의 CATEGORIES[j] 값이며
+    값이 없으면 NaN입니다.
+    """
+
+    __slots__ = ("times", "values")
+
+    def __init__(self, times: np.ndarray, values: np.ndarray):
+        self.times = times
+        self.values = values
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict]) -> "ForecastSeries":
+        """getVilageFcst 응답 item 목록(여러 페이지를 이어 붙인 것 포함) 파싱"""
+        stamps: Dict[str, int] = {}
+        numbers: Dict[str, float] = {}
+        rows, columns, values = [], [], []
+        for item in items:
+            column = CATEGORY_INDEX.get(item["category"])
+            if column is None:
+                continue
+            stamp = item["fcstDate"] + item["fcstTime"]
+            row = stamps.get(stamp)
+            if row is None:
+                row = stamps[stamp] = len(stamps)
+            # 같은 값 문자열이 반복되므로 변환 결과를 재사용
+            value = item["fcstValue"]
+            number = numbers.get(value)
+            if number is None:
+                number = numbers[value] = _to_number(value)
+            rows.append(row)
+            columns.append(column)
+            values.append(number)
+
+        # 응답 순서와 무관하게 예보 시각 오름차순으로 정렬
+        order = sorted(stamps, key=stamps.get)
+        times = np.array([f"{s[:4]}-{s[4:6]}-{s[6:8]}T{s[8:10]}:{s[10:12]}" for s in order], dtype="datetime64[m]")
+        sort = np.argsort(times, kind="stable")
+        rank = np.empty_like(sort)
+        rank[sort] = np.arange(len(sort))
+
+        table = np.full((len(times), len(CATEGORIES)), np.nan, dtype=np.float32)
+        if rows:
+            table[rank[np.array(rows, dtype=np.intp)], np.array(columns, dtype=np.intp)] = values
+        return cls(times[sort], table)
+
+    def to_dict(self) -> Dict:
+        """JSON으로 보낼 수 있는 형태 (공유 저장소용, 값 없음은 NaN 그대로)"""
+        return {"times": self.times.astype(np.int64).tolist(), "values": self.values.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ForecastSeries":
+        times = np.array(data["times"], dtype=np.int64).astype("datetime64[m]")
+        values = np.array(data["values"], dtype=np.float32).reshape(len(times), len(CATEGORIES))
+        return cls(times, values)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def nearest_index(self, when: datetime) -> int:
+        """when과 가장 가까운 예보 시각의 행 번호"""
+        target = np.datetime64(when.replace(second=0, microsecond=0), "m")
+        i = int(np.searchsorted(self.times, target))
+        if i == 0:
+            return 0
+        if i == len(self.times):
+            return i - 1
+        return i if self.times[i] - target < target - self.times[i - 1] else i - 1
+
+    def row(self, index: int) -> Dict[str, Optional[float]]:
+        """행 하나를 항목 → 값(없으면 None) 사전으로"""
+        return {
+            category: None if number != number else number  # NaN → None
+            for category, number in zip(CATEGORIES, self.values[index].tolist())
+        }
+
+    def at(self, when: datetime) -> Dict:
+        """when과 가장 가까운 예보 시각의 날씨 (응답 형식)"""
+        if not len(self.times):
+            return {"temperature": None, "sky_condition": None, "precipitation": None, "humidity": None}
+
+        index = self.nearest_index(when)
+        row = self.row(index)
+        sky, pty, humidity, pop = row["SKY"], row["PTY"], row["REH"], row["POP"]
+        return {
+            "temperature": row["TMP"],
+            "sky_condition": None if sky is None else SKY_CODES.get(int(sky), "알 수 없음"),
+            "precipitation": None if pty is None else PTY_CODES.get(int(pty), "없음"),
+            "humidity": None if humidity is None else int(humidity),
+            "precipitation_probability": None if pop is None else int(pop),
+            "forecast_time": str(self.times[index]),
+        }
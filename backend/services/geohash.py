@@ -0,0 +1,91 @@
+"""geohash 인코딩과 셀 계산 (음식점 검색 캐시의 공간 버킷)
+
+정밀도 p의 셀 크기: 경도 비트 ceil(5p/2), 위도 비트 floor(5p/2)
+(p=6 약 1.2km × 0.6km, p=7 약 153m × 153m)
+"""
+from typing import List, Tuple
+import math
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+# 지구 반지름 (m)
+EARTH_RADIUS = 6371000.0
+
+
+def encode(lat: float, lon: float, precision: int) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # 경도 비트부터
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(위도 높이, 경도 너비) 도 단위"""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def decode(cell: str) -> Tuple[float, float]:
+    """셀 중심 (위도, 경도)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for c in cell:
+        value = _DECODE[c]
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if value >> shift & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def neighbors(cell: str) -> List[str]:
+    """주변 8개 셀"""
+    lat, lon = decode(cell)
+    height, width = cell_size(len(cell))
+    return [
+        encode(lat + d_lat * height, lon + d_lon * width, len(cell))
+        for d_lat in (-1, 0, 1)
+        for d_lon in (-1, 0, 1)
+        if d_lat or d_lon
+    ]
+
+
+def cell_radius(precision: int, lat: float) -> float:
+    """셀 중심에서 꼭짓점까지의 거리 (m, 해당 위도 기준)"""
+    height, width = cell_size(precision)
+    half_h = math.radians(height / 2) * EARTH_RADIUS
+    half_w = math.radians(width / 2) * EARTH_RADIUS * math.cos(math.radians(lat))
+    return math.hypot(half_h, half_w)
+
+
+def distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 지점 사이 거리 (m, 하버사인)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    d_lat = p2 - p1
+    d_lon = math.radians(lon2 - lon1)
+    a = math.sin(d_lat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
@@ -0,0 +1,62 @@
+from typing import Optional
+import asyncio
+import os
+import random
+
+import httpx
+
+
+def _http2_available() -> bool:
+    """h2 패키지가 설치되어 있을 때만 HTTP/2 사용"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """앱 전체에서 공유하는 연결 풀 클라이언트 생성 (lifespan에서 한 번 호출)"""
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    )
+    use_http2 = os.getenv("HTTP2_ENABLED", "true").lower() == "true" and _http2_available()
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=use_http2,
+        timeout=httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "10")))
+    )
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retries: Optional[int] = None,
+    backoff: Optional[float] = None,
+    **kwargs
+) -> httpx.Response:
+    """5xx 응답과 타임아웃·연결 오류를 지터가 섞인 지수 백오프로 재시도
+
+    마지막 시도의 응답(5xx 포함)을 그대로 반환하고, 마지막 시도의 예외는 다시 발생시킵니다.
+    """
+    if retries is None:
+        retries = int(os.getenv("HTTP_RETRIES", "2"))
+    if backoff is None:
+        backoff = float(os.getenv("HTTP_RETRY_BACKOFF", "0.2"))
+
+    for attempt in range(retries + 1):
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:  # 타임아웃·연결 오류
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code < 500 or attempt == retries:
+                return response
+            await response.aclose()
+
+        # full jitter: 0 ~ backoff * 2^attempt 사이에서 무작위 대기
+        await asyncio.sleep(random.uniform(0, backoff * (2 ** attempt)))
@@ -0,0 +1,191 @@
+"""요청 단위 중복 제거: 같은 요청의 동시 실행을 하나로 합치고, 끝난 결과는 잠시 재사용
+
+진행 중인 작업은 항상 정규화한 요청 본문(경로 + 정렬된 JSON의 해시)으로 합치고,
+끝난 결과는 Idempotency-Key 헤더가 있으면 그 키로, 없으면 본문 해시로 재사용합니다.
+같은 Idempotency-Key로 다른 본문을 보내면 IdempotencyConflict.
+
+- 진행 중인 같은 본문의 요청이 있으면 Idempotency-Key가 달라도 그 결과를 함께 기다림
+  (두 번 누르기처럼 키를 새로 만든 요청도 LLM 호출은 한 번, 기다리는 요청이 모두 끊기면 작업 취소)
+- 성공한 결과는 DEDUP_REPLAY_SECONDS 동안 그대로 재사용 (공유 저장소가 있으면 워커 간에도)
+- 실패한 결과는 저장하지 않음 (그때 기다리던 요청만 같은 예외를 받음)
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import os
+
+from services.cache import TTLCache
+from services.metrics import DEDUP
+from services.shared_store import SharedStore, SharedStoreError, get_shared_store
+
+
+class IdempotencyConflict(Exception):
+    """같은 Idempotency-Key로 다른 요청 본문을 보낸 경우"""
+
+
+def request_fingerprint(route: str, payload: Dict) -> str:
+    """경로 + 요청 본문(키 정렬, 공백 없는 JSON)의 SHA-256"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{route}\n{canonical}".encode()).hexdigest()
+
+
+class _Flight:
+    """진행 중인 요청 하나 (본문 키, 요청 본문 해시, 공유 작업, 기다리는 요청 수, 결과를 저장할 재사용 키)"""
+
+    __slots__ = ("key", "fingerprint", "future", "waiters", "replay_keys")
+
+    def __init__(self, key: str, fingerprint: str):
+        self.key = key
+        self.fingerprint = fingerprint
+        self.future: Optional[asyncio.Future] = None
+        self.waiters = 0
+        self.replay_keys = set()
+
+
+class RequestDeduplicator:
+    """경로별 요청 중복 제거 (lunch_dedup_requests_total에 결과별 횟수 기록)"""
+
+    PREFIX = "dedup:"
+
+    def __init__(
+        self,
+        replay_seconds: Optional[float] = None,
+        maxsize: Optional[int] = None,
+        store: Optional[SharedStore] = None
+    ):
+        self.enabled = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+        self.replay_seconds = (
+            replay_seconds if replay_seconds is not None else float(os.getenv("DEDUP_REPLAY_SECONDS", "10"))
+        )
+        # 요청 키 → (요청 본문 해시, 결과)
+        self.results = TTLCache(maxsize=maxsize or int(os.getenv("DEDUP_CACHE_SIZE", "1024")))
+        self.store = store or get_shared_store()
+        # 본문 키 → 진행 중인 작업, Idempotency-Key 재사용 키 → 그 키로 합류한 작업 (충돌 확인용)
+        self._inflight: Dict[str, _Flight] = {}
+        self._keys: Dict[str, _Flight] = {}
+
+    @staticmethod
+    def request_key(route: str, fingerprint: str, idempotency_key: Optional[str] = None) -> str:
+        if idempotency_key:
+            return f"{route}:key:{idempotency_key}"
+        return f"{route}:body:{fingerprint}"
+
+    async def run(
+        self,
+        route: str,
+        payload: Dict,
+        fn: Callable[[], Awaitable[Any]],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Any, bool]:
+        """(결과, 다른 요청의 결과를 재사용했는지). 결과는 JSON으로 직렬화할 수 있어야 함"""
+        if not self.enabled:
+            return await fn(), False
+
+        fingerprint = request_fingerprint(route, payload)
+        body_key = self.request_key(route, fingerprint)
+        # 끝난 결과는 Idempotency-Key가 있으면 그 키로만 재사용 (새 키는 새 요청)
+        replay_key = self.request_key(route, fingerprint, idempotency_key)
+
+        replay = self.results.get(replay_key)
+        if replay is None:
+            replay = await self._shared_get(replay_key)
+        if replay is not None:
+            self._check(route, replay_key, replay[0], fingerprint)
+            DEDUP.inc(route, "replayed")
+            return replay[1], True
+
+        claimed = self._keys.get(replay_key)
+        if claimed is not None:
+            self._check(route, replay_key, claimed.fingerprint, fingerprint)
+
+        # 진행 중인 작업은 Idempotency-Key와 관계없이 같은 본문이면 합류
+        flight = self._inflight.get(body_key)
+        if flight is not None:
+            DEDUP.inc(route, "inflight")
+            self._claim(flight, replay_key)
+            return await self._wait(flight), True
+
+        DEDUP.inc(route, "executed")
+        flight = _Flight(body_key, fingerprint)
+        self._inflight[body_key] = flight
+        self._claim(flight, replay_key)
+        flight.future = asyncio.ensure_future(self._execute(flight, fn))
+
+        def _done(future: asyncio.Future):
+            self._forget(flight)
+            # 아무도 기다리지 않는 작업의 예외 경고 방지
+            if not future.cancelled():
+                future.exception()
+
+        flight.future.add_done_callback(_done)
+        return await self._wait(flight), False
+
+    def _claim(self, flight: _Flight, replay_key: str):
+        """작업이 끝나면 replay_key로도 결과를 저장"""
+        flight.replay_keys.add(replay_key)
+        if ":key:" in replay_key:
+            self._keys[replay_key] = flight
+
+    def _check(self, route: str, key: str, stored: str, fingerprint: str):
+        if stored != fingerprint:
+            DEDUP.inc(route, "conflict")
+            raise IdempotencyConflict(f"이미 다른 요청에 사용한 Idempotency-Key입니다: {key.split(':key:', 1)[-1]}")
+
+    async def _wait(self, flight: _Flight) -> Any:
+        """공유 작업 결과 대기 (이 요청이 취소되어도 작업은 계속, 마지막 요청까지 취소되면 작업도 취소)"""
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.future.done():
+                # 취소 중인 작업에 새 요청이 합류하지 않도록 바로 목록에서 뺌
+                self._forget(flight)
+                flight.future.cancel()
+
+    def _forget(self, flight: _Flight):
+        if self._inflight.get(flight.key) is flight:
+            del self._inflight[flight.key]
+        for replay_key in flight.replay_keys:
+            if self._keys.get(replay_key) is flight:
+                del self._keys[replay_key]
+
+    async def _execute(self, flight: _Flight, fn: Callable[[], Awaitable[Any]]) -> Any:
+        result = await fn()
+        if self.replay_seconds > 0:
+            for replay_key in list(flight.replay_keys):
+                self.results.set(replay_key, (flight.fingerprint, result), ttl=self.replay_seconds)
+                if self.store is not None:
+                    try:
+                        await self.store.set(
+                            self.PREFIX + replay_key,
+                            {"fingerprint": flight.fingerprint, "result": result},
+                            ttl=self.replay_seconds
+                        )
+                    except SharedStoreError:
+                        pass
+        return result
+
+    async def _shared_get(self, key: str) -> Optional[Tuple[str, Any]]:
+        """다른 워커가 저장한 결과 (없거나 저장소 오류면 None)"""
+        if self.store is None or self.replay_seconds <= 0:
+            return None
+        try:
+            data = await self.store.get(self.PREFIX + key)
+        except SharedStoreError:
+            return None
+        if data is None:
+            return None
+        return data["fingerprint"], data["result"]
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "replay_seconds": self.replay_seconds,
+            "inflight": len(self._inflight),
+            "replayable": len(self.results),
+            "requests": {
+                f"{route}:{result}": count for (route, result), count in sorted(DEDUP.values.items())
+            },
+        }
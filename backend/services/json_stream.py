@@ -0,0 +1,113 @@
+from typing import Any, Iterable, List, Optional, Tuple
+import json
+
+WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONParser:
+    """조각난 텍스트로 들어오는 JSON 객체를 완성되는 부분부터 꺼내는 파서
+
+    feed()에 LLM 스트리밍 조각을 넣으면 다음 이벤트를 반환합니다.
+        ("item", key, value)   array_keys에 속한 최상위 배열의 요소 하나가 완성됨
+        ("field", key, value)  최상위 필드 하나의 값 전체가 완성됨
+    첫 '{' 이전(코드 펜스 등)과 마지막 '}' 이후의 텍스트는 무시합니다.
+    """
+
+    def __init__(self, array_keys: Iterable[str] = ()):
+        self.array_keys = set(array_keys)
+        self.fields = {}
+        self.done = False
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start: Optional[int] = None
+        self._in_array = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        events = []
+        self._buf += chunk
+        buf = self._buf
+
+        for i in range(self._pos, len(buf)):
+            if self.done:
+                break
+            c = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = json.loads(buf[self._key_start:i + 1])
+                        self._expect_key = False
+                continue
+
+            if self._depth == 0:
+                if c == "{":
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+
+            if c in WHITESPACE:
+                continue
+
+            # 값/배열 요소의 시작 위치 기록
+            if self._depth == 1 and not self._expect_key and self._value_start is None and c not in ":,}":
+                self._value_start = i
+            if self._depth == 2 and self._in_array and self._item_start is None and c not in ",]":
+                self._item_start = i
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = i
+            elif c in "{[":
+                if self._depth == 1 and c == "[" and self._key in self.array_keys:
+                    self._in_array = True
+                self._depth += 1
+            elif c in "}]":
+                if self._depth == 2 and self._in_array:
+                    self._emit_item(i, events)
+                    self._in_array = False
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit_field(i, events)
+                    self.done = True
+            elif c == ",":
+                if self._depth == 1:
+                    self._emit_field(i, events)
+                    self._expect_key = True
+                elif self._depth == 2 and self._in_array:
+                    self._emit_item(i, events)
+
+        self._pos = len(buf)
+        return events
+
+    def _emit_item(self, end: int, events: list):
+        if self._item_start is not None:
+            try:
+                events.append(("item", self._key, json.loads(self._buf[self._item_start:end])))
+            except json.JSONDecodeError:
+                pass
+        self._item_start = None
+
+    def _emit_field(self, end: int, events: list):
+        if self._key is not None and self._value_start is not None:
+            try:
+                value = json.loads(self._buf[self._value_start:end])
+            except json.JSONDecodeError:
+                pass
+            else:
+                self.fields[self._key] = value
+                events.append(("field", self._key, value))
+        self._key = None
+        self._value_start = None
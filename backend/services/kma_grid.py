@@ -0,0 +1,71 @@
+from typing import Tuple, Union
+import numpy as np
+
+# 기상청 단기예보 격자 (Lambert Conformal Conic) 투영 상수
+RE = 6371.00877     # 지구 반경 (km)
+GRID = 5.0          # 격자 간격 (km)
+SLAT1 = 30.0        # 표준 위도 1
+SLAT2 = 60.0        # 표준 위도 2
+OLON = 126.0        # 기준점 경도
+OLAT = 38.0         # 기준점 위도
+XO = 43             # 기준점 X 격자 좌표
+YO = 136            # 기준점 Y 격자 좌표
+
+DEGRAD = np.pi / 180.0
+
+_re = RE / GRID
+_slat1 = SLAT1 * DEGRAD
+_slat2 = SLAT2 * DEGRAD
+_olon = OLON * DEGRAD
+_olat = OLAT * DEGRAD
+_sn = np.log(np.cos(_slat1) / np.cos(_slat2)) / np.log(
+    np.tan(np.pi * 0.25 + _slat2 * 0.5) / np.tan(np.pi * 0.25 + _slat1 * 0.5)
+)
+_sf = np.tan(np.pi * 0.25 + _slat1 * 0.5) ** _sn * np.cos(_slat1) / _sn
+_ro = _re * _sf / np.tan(np.pi * 0.25 + _olat * 0.5) ** _sn
+
+ArrayLike = Union[float, np.ndarray, list]
+
+
+def latlon_to_grid(lat: ArrayLike, lon: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """위경도 → 기상청 격자 (nx, ny)
+
+    스칼라나 배열을 받아 같은 모양의 정수 배열 두 개를 반환합니다 (배열 한 번에 변환).
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+
+    ra = _re * _sf / np.tan(np.pi * 0.25 + lat * DEGRAD * 0.5) ** _sn
+    theta = lon * DEGRAD - _olon
+    theta = np.where(theta > np.pi, theta - 2.0 * np.pi, theta)
+    theta = np.where(theta < -np.pi, theta + 2.0 * np.pi, theta)
+    theta = theta * _sn
+
+    nx = np.floor(ra * np.sin(theta) + XO + 0.5).astype(np.int32)
+    ny = np.floor(_ro - ra * np.cos(theta) + YO + 0.5).astype(np.int32)
+    return nx, ny
+
+
+def grid_to_latlon(nx: ArrayLike, ny: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """기상청 격자 (nx, ny) → 격자 중심 위경도"""
+    xn = np.asarray(nx, dtype=np.float64) - XO
+    yn = _ro - (np.asarray(ny, dtype=np.float64) - YO)
+
+    ra = np.sqrt(xn * xn + yn * yn)
+    if _sn < 0:
+        ra = -ra
+    alat = 2.0 * np.arctan((_re * _sf / ra) ** (1.0 / _sn)) - np.pi * 0.5
+
+    theta = np.where(
+        np.abs(xn) <= 0.0,
+        0.0,
+        np.where(np.abs(yn) <= 0.0, np.sign(xn) * np.pi * 0.5, np.arctan2(xn, yn))
+    )
+    alon = theta / _sn + _olon
+    return alat / DEGRAD, alon / DEGRAD
+
+
+def grid_coords(lat: float, lon: float) -> Tuple[int, int]:
+    """위경도 한 쌍 → (nx, ny) 정수 튜플"""
+    nx, ny = latlon_to_grid(lat, lon)
+    return int(nx), int(ny)
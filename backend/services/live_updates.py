@@ -0,0 +1,306 @@
+"""실시간 날씨·추천 알림 (WebSocket 구독)
+
+- 날씨: 위치를 구독하면 기상청 격자 단위로 묶어, 격자마다 LIVE_REFRESH_SECONDS마다 한 번 조회하고
+  값이 바뀌었을 때만 그 격자 구독자 모두에게 같은 메시지(한 번 직렬화)를 보냅니다.
+- 그룹: 같은 그룹 ID로 접속한 참가자(최대 LIVE_GROUP_SIZE명)에게 그 그룹의 추천 결과를 바로 보냅니다.
+  마지막 결과는 LIVE_GROUP_TTL 동안 보관해 늦게 들어온 참가자에게도 보냅니다.
+  공유 저장소가 있으면(serve.py) 결과를 저장소 채널에도 올리고, 워커마다 LIVE_GROUP_POLL_SECONDS마다
+  채널을 읽어 다른 워커에 접속한 참가자에게도 보냅니다 (그룹 인원 제한은 워커별).
+- 느린 클라이언트: 보내지 못한 메시지는 종류별로 최신 것 하나만 남기고(conflated),
+  한 번 보내는 데 LIVE_SEND_TIMEOUT을 넘기면 연결을 끊습니다 (1013).
+
+구독 상태(격자·그룹 참가자)는 워커마다 따로 관리합니다.
+"""
+from typing import Dict, Optional, Set, Tuple
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+from starlette.websockets import WebSocket
+
+from services.cache import TTLCache
+from services.metrics import LIVE_MESSAGES
+from services.shared_store import SharedStoreError, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+# 느린 클라이언트 연결을 끊을 때의 종료 코드 (Try Again Later)
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# 워커 간 그룹 알림 채널과 그룹별 마지막 메시지 키 (공유 저장소)
+GROUP_CHANNEL = "live:groups"
+GROUP_PREFIX = "live:group:"
+
+
+def websocket_options() -> Dict:
+    """uvicorn WebSocket 설정 (serve.py, main.py 실행용)
+
+    permessage-deflate는 연결마다 zlib 상태를 잡아 유휴 연결 메모리가 몇 배로 늘고(benchmarks/bench_live.py),
+    보내는 메시지는 작아 압축 이득이 적으므로 기본으로 끕니다.
+    """
+    return {
+        "ws_per_message_deflate": os.getenv("LIVE_PER_MESSAGE_DEFLATE", "false").lower() == "true",
+        "ws_ping_interval": float(os.getenv("LIVE_PING_INTERVAL", "20")),
+    }
+
+
+def encode_message(kind: str, data) -> str:
+    return json.dumps({"type": kind, "data": data}, ensure_ascii=False, separators=(",", ":"))
+
+
+class Subscriber:
+    """WebSocket 연결 하나 (보낼 메시지가 있을 때만 전송 작업을 만듦)"""
+
+    __slots__ = ("websocket", "cell", "group", "pending", "sender", "closed")
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.cell: Optional[Tuple[int, int]] = None
+        self.group: Optional[str] = None
+        # 종류 → 아직 보내지 못한 최신 메시지
+        self.pending: Dict[str, str] = {}
+        self.sender: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def push(self, kind: str, message: str, send_timeout: float):
+        if self.closed:
+            return
+        if kind in self.pending:
+            LIVE_MESSAGES.inc(kind, "conflated")
+        self.pending[kind] = message
+        if self.sender is None:
+            self.sender = asyncio.ensure_future(self._drain(send_timeout))
+
+    async def _drain(self, send_timeout: float):
+        try:
+            while self.pending and not self.closed:
+                kind = next(iter(self.pending))
+                message = self.pending.pop(kind)
+                try:
+                    await asyncio.wait_for(self.websocket.send_text(message), send_timeout)
+                except asyncio.TimeoutError:
+                    LIVE_MESSAGES.inc(kind, "slow_consumer")
+                    self.closed = True
+                    await self._close(SLOW_CONSUMER_CLOSE_CODE)
+                except Exception:
+                    # 이미 끊긴 연결 (수신 쪽에서 정리)
+                    LIVE_MESSAGES.inc(kind, "failed")
+                    self.closed = True
+                else:
+                    LIVE_MESSAGES.inc(kind, "sent")
+        finally:
+            self.sender = None
+
+    async def _close(self, code: int):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), 1.0)
+        except Exception:
+            pass
+
+
+class _Cell:
+    """격자 하나의 구독자와 마지막 날씨 메시지"""
+
+    __slots__ = ("location", "subscribers", "message", "refreshing")
+
+    def __init__(self, location: str):
+        self.location = location
+        self.subscribers: Set[Subscriber] = set()
+        self.message: Optional[str] = None
+        self.refreshing: Optional[asyncio.Future] = None
+
+
+class LiveHub:
+    """격자·그룹별 구독자 관리와 메시지 전달"""
+
+    def __init__(self, weather_service):
+        self.weather_service = weather_service
+        self.refresh_seconds = float(os.getenv("LIVE_REFRESH_SECONDS", "300"))
+        self.refresh_concurrency = int(os.getenv("LIVE_REFRESH_CONCURRENCY", "8"))
+        self.send_timeout = float(os.getenv("LIVE_SEND_TIMEOUT", "5"))
+        self.max_connections = int(os.getenv("LIVE_MAX_CONNECTIONS", "20000"))
+        self.group_size = int(os.getenv("LIVE_GROUP_SIZE", "10"))
+        self.group_ttl = float(os.getenv("LIVE_GROUP_TTL", "1800"))
+        self.group_poll_seconds = float(os.getenv("LIVE_GROUP_POLL_SECONDS", "0.2"))
+        self.store = get_shared_store()
+        # 자기가 올린 채널 메시지를 다시 보내지 않도록 구분
+        self.worker_id = uuid.uuid4().hex
+        self.cells: Dict[Tuple[int, int], _Cell] = {}
+        self.groups: Dict[str, Set[Subscriber]] = {}
+        # 그룹 ID → (종류, 마지막 메시지)
+        self.group_messages = TTLCache(maxsize=int(os.getenv("LIVE_GROUP_CACHE_SIZE", "4096")))
+        self.connections = 0
+        self.fetches = 0
+        self.remote_messages = 0
+        self._task: Optional[asyncio.Task] = None
+        self._group_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        if self._group_task is None and self.store is not None:
+            self._group_task = asyncio.ensure_future(self._poll_groups())
+
+    async def stop(self):
+        for task in (self._task, self._group_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._group_task = None
+
+    def is_full(self) -> bool:
+        return self.connections >= self.max_connections
+
+    def connect(self, websocket: WebSocket) -> Subscriber:
+        self.connections += 1
+        return Subscriber(websocket)
+
+    def disconnect(self, subscriber: Subscriber):
+        self.connections -= 1
+        subscriber.closed = True
+        subscriber.pending.clear()
+        self._leave_cell(subscriber)
+        self._leave_group(subscriber)
+
+    async def subscribe_weather(self, subscriber: Subscriber, location: str):
+        """위치의 격자 구독 (이전 구독은 해제). 격자의 마지막 날씨가 있으면 바로, 없으면 조회 후 전송"""
+        key = self.weather_service.get_grid_coords(location)
+        if subscriber.cell == key:
+            return
+        self._leave_cell(subscriber)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = _Cell(location)
+        cell.subscribers.add(subscriber)
+        subscriber.cell = key
+        if cell.message is not None:
+            subscriber.push("weather", cell.message, self.send_timeout)
+        else:
+            await self._refresh_cell(key, cell)
+
+    async def join_group(self, subscriber: Subscriber, group: str) -> bool:
+        """그룹 참가 (인원이 다 찼으면 False). 그룹의 마지막 추천이 있으면 바로 전송"""
+        members = self.groups.setdefault(group, set())
+        if len(members) >= self.group_size:
+            if not members:
+                del self.groups[group]
+            return False
+        members.add(subscriber)
+        subscriber.group = group
+        last = self.group_messages.get(group)
+        if last is None and self.store is not None:
+            try:
+                last = await self.store.get(GROUP_PREFIX + group)
+            except SharedStoreError:
+                pass
+        if last is not None:
+            subscriber.push(*last, self.send_timeout)
+        return True
+
+    async def publish_group(self, group: str, kind: str, data) -> int:
+        """그룹 참가자 모두에게 전송하고 이 워커에서 보낸 연결 수 반환 (다른 워커는 공유 저장소 채널로)"""
+        message = encode_message(kind, data)
+        sent = self._deliver(group, kind, message)
+        if self.store is not None:
+            try:
+                await self.store.set(GROUP_PREFIX + group, [kind, message], ttl=self.group_ttl)
+                await self.store.publish(
+                    GROUP_CHANNEL, {"origin": self.worker_id, "group": group, "kind": kind, "message": message}
+                )
+            except SharedStoreError:
+                logger.warning("그룹 알림을 공유 저장소에 올리지 못했습니다: %s", group)
+        return sent
+
+    def _deliver(self, group: str, kind: str, message: str) -> int:
+        self.group_messages.set(group, (kind, message), ttl=self.group_ttl)
+        members = self.groups.get(group, ())
+        for subscriber in members:
+            subscriber.push(kind, message, self.send_timeout)
+        return len(members)
+
+    def _leave_cell(self, subscriber: Subscriber):
+        if subscriber.cell is None:
+            return
+        cell = self.cells.get(subscriber.cell)
+        if cell is not None:
+            cell.subscribers.discard(subscriber)
+            if not cell.subscribers:
+                del self.cells[subscriber.cell]
+        subscriber.cell = None
+
+    def _leave_group(self, subscriber: Subscriber):
+        if subscriber.group is None:
+            return
+        members = self.groups.get(subscriber.group)
+        if members is not None:
+            members.discard(subscriber)
+            if not members:
+                del self.groups[subscriber.group]
+        subscriber.group = None
+
+    async def _refresh_cell(self, key: Tuple[int, int], cell: _Cell):
+        """격자 날씨를 한 번 조회해 바뀌었으면 구독자 모두에게 전송 (동시 호출은 조회 하나를 공유)"""
+        if cell.refreshing is not None:
+            await asyncio.shield(cell.refreshing)
+            return
+        cell.refreshing = asyncio.get_running_loop().create_future()
+        try:
+            self.fetches += 1
+            weather = await self.weather_service.get_weather(cell.location)
+            message = encode_message("weather", weather)
+            if message != cell.message:
+                cell.message = message
+                for subscriber in cell.subscribers:
+                    subscriber.push("weather", message, self.send_timeout)
+        finally:
+            cell.refreshing.set_result(None)
+            cell.refreshing = None
+
+    async def _run(self):
+        slots = asyncio.Semaphore(self.refresh_concurrency)
+
+        async def refresh(key, cell):
+            async with slots:
+                try:
+                    await self._refresh_cell(key, cell)
+                except Exception:
+                    logger.exception("실시간 날씨 갱신 오류 %s", key)
+
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await asyncio.gather(*(refresh(key, cell) for key, cell in list(self.cells.items())))
+
+    async def _poll_groups(self):
+        """공유 저장소 그룹 채널에서 다른 워커가 올린 메시지를 읽어 이 워커의 참가자에게 전송"""
+        after = None
+        while True:
+            try:
+                result = await self.store.poll(GROUP_CHANNEL, after)
+            except SharedStoreError:
+                await asyncio.sleep(self.group_poll_seconds)
+                continue
+            after = result["sequence"]
+            for event in result["messages"]:
+                if event["origin"] != self.worker_id:
+                    self.remote_messages += 1
+                    self._deliver(event["group"], event["kind"], event["message"])
+            await asyncio.sleep(self.group_poll_seconds)
+
+    def stats(self) -> Dict:
+        return {
+            "connections": self.connections,
+            "cells": len(self.cells),
+            "groups": len(self.groups),
+            "fetches": self.fetches,
+            "shared_groups": self.store is not None,
+            "remote_messages": self.remote_messages,
+            "refresh_seconds": self.refresh_seconds,
+            "messages": {
+                f"{kind}:{result}": count for (kind, result), count in sorted(LIVE_MESSAGES.values.items())
+            },
+        }
@@ -0,0 +1,208 @@
+"""LLM JSON 응답 해석: 흔한 깨짐(코드 펜스, 끝 쉼표, max_tokens 잘림) 복구 + Pydantic 스키마 검증
+
+복구 순서는 json.loads가 실패했을 때만 진행합니다.
+    1. 코드 펜스·앞뒤 설명 제거 (첫 '{' 또는 '['부터)
+    2. 닫는 괄호 앞의 쉼표 제거
+    3. 잘린 응답은 마지막으로 완성된 값까지만 남기고 열린 괄호를 닫음
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type
+import json
+import re
+
+from pydantic import BaseModel, ValidationError
+
+from services.metrics import LLM_PARSE
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+
+
+class Recommendation(BaseModel):
+    menu: str
+    category: str = ""
+    reason: str = ""
+    temperature_match: str = ""
+    alternatives: List[str] = []
+
+
+class BatchRecommendation(Recommendation):
+    index: int
+
+
+class Ingredient(BaseModel):
+    name: str
+    amount: str = ""
+
+
+class Recipe(BaseModel):
+    menu_name: str = ""
+    servings: Any = None  # 저장 시 기준 인분 수로 덮어씀
+    ingredients: List[Ingredient]
+    steps: List[str]
+    cooking_time: str = ""
+    difficulty: str = ""
+
+
+def _validate(model: Type[BaseModel], data: Any) -> BaseModel:
+    # pydantic v1/v2 모두 지원
+    if hasattr(model, "model_validate"):
+        return model.model_validate(data)
+    return model.parse_obj(data)
+
+
+def _dump(value: BaseModel) -> Dict:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return value.dict()
+
+
+def _strip_wrapping(text: str) -> str:
+    """코드 펜스 안쪽, 첫 '{'/'['부터의 텍스트"""
+    match = _FENCE.search(text)
+    if match:
+        text = match.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    return text[min(starts):] if starts else text
+
+
+def _drop_trailing_commas(text: str) -> str:
+    """문자열 밖에서 '}'/']' 바로 앞(공백 무시)의 쉼표 제거"""
+    out: List[str] = []
+    in_string = escape = False
+    for c in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "}]":
+            # 직전 공백을 건너뛰고 쉼표가 있으면 제거
+            i = len(out) - 1
+            while i >= 0 and out[i] in " \t\r\n":
+                i -= 1
+            if i >= 0 and out[i] == ",":
+                del out[i]
+        out.append(c)
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> str:
+    """잘린 JSON을 마지막으로 완성된 값 위치에서 자르고 열린 괄호를 닫음
+
+    끝나지 않은 문자열·숫자, 값이 없는 키는 버립니다.
+    """
+    # 열린 괄호: [괄호, 객체에서 키를 기다리는 중인지]
+    stack: List[List] = []
+    in_string = escape = False
+    string_is_key = False
+    scalar = False
+    safe_end, safe_stack = 0, ""
+
+    def mark(end: int):
+        nonlocal safe_end, safe_stack
+        safe_end, safe_stack = end, "".join(frame[0] for frame in stack)
+
+    for i, c in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+                if not string_is_key:
+                    mark(i + 1)
+            continue
+
+        if c in ",}]" or c in " \t\r\n:":
+            if scalar:
+                scalar = False
+                mark(i)
+        if c == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1][0] == "{" and stack[-1][1]
+        elif c in "{[":
+            stack.append([c, c == "{"])
+            mark(i + 1)
+        elif c in "}]":
+            if stack:
+                stack.pop()
+            mark(i + 1)
+            if not stack:
+                return text[:i + 1]
+        elif c == ":":
+            if stack:
+                stack[-1][1] = False
+        elif c == ",":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = True
+        elif c not in " \t\r\n":
+            scalar = True
+
+    if not stack and not in_string and not scalar:
+        return text
+    closers = "".join("}" if opener == "{" else "]" for opener in reversed(safe_stack))
+    return text[:safe_end].rstrip().rstrip(",") + closers
+
+
+def parse_json(text: Optional[str]) -> Tuple[Any, str]:
+    """LLM 응답 텍스트 → (값, 결과). 결과: "ok", "repaired", "invalid_json"(값은 None)"""
+    if not text:
+        return None, "invalid_json"
+    try:
+        return json.loads(text), "ok"
+    except ValueError:
+        pass
+    repaired = _drop_trailing_commas(_close_truncated(_strip_wrapping(text)))
+    try:
+        return json.loads(repaired), "repaired"
+    except ValueError:
+        return None, "invalid_json"
+
+
+def parse_model(
+    text: Optional[str],
+    model: Type[BaseModel],
+    purpose: str,
+    non_empty: Tuple[str, ...] = ()
+) -> Tuple[Optional[Dict], str]:
+    """JSON 해석 + 스키마 검증 → (사전 또는 None, 결과). 결과는 lunch_llm_parse_total에 기록
+
+    non_empty의 필드가 비어 있어도 스키마 오류로 봅니다 (잘린 응답에서 목록이 통째로 빠진 경우).
+    결과: "ok", "repaired", "invalid_json", "invalid_schema"
+    """
+    data, outcome = parse_json(text)
+    if data is not None:
+        try:
+            data = _dump(_validate(model, data))
+        except ValidationError:
+            data = None
+        if data is None or not all(data[field] for field in non_empty):
+            data, outcome = None, "invalid_schema"
+    LLM_PARSE.inc(purpose, outcome)
+    return data, outcome
+
+
+def parse_items(text: Optional[str], key: str, model: Type[BaseModel], purpose: str) -> Tuple[List[Dict], str]:
+    """{key: [항목, ...]} 응답에서 스키마에 맞는 항목만 (일괄 추천처럼 일부만 잘못될 수 있는 응답용)
+
+    결과: 해석 결과(ok/repaired) 중 하나, 맞는 항목이 일부뿐이면 "partial", 하나도 없으면 "invalid_schema"
+    """
+    data, outcome = parse_json(text)
+    items = data.get(key) if isinstance(data, dict) else None
+    valid = []
+    for item in items if isinstance(items, list) else []:
+        try:
+            valid.append(_dump(_validate(model, item)))
+        except ValidationError:
+            continue
+    if data is not None:
+        if not valid:
+            outcome = "invalid_schema"
+        elif len(valid) < len(items):
+            outcome = "partial"
+    LLM_PARSE.inc(purpose, outcome)
+    return valid, outcome
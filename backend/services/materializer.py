@@ -0,0 +1,390 @@
+"""발표분별 추천 사전 계산 (인기 격자 × 음식 종류 × 기분 × 인원 구분)
+
+새 단기예보 발표분이 반영되면 예보 선행 갱신 대상 격자마다 다음 점심 시각 예보로
+모든 선호도 조합의 추천을 미리 계산해 SQLite 표에 저장합니다.
+점심시간 /api/recommend, /api/lunch 요청은 (격자, 조합, 발표 시각) 키 조회 한 번으로 응답합니다.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sqlite3
+import time
+
+from services.ai_service import build_rule_recommendation
+from services.menu_catalog import load_catalog
+from services.ranker import ANY_FOOD, ranking_context
+from services.response_cache import people_bucket, recommendation_key, weather_bucket
+from services.shared_store import SharedStoreError, get_shared_store
+from services.weather_service import LUNCH_HOUR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "materialized.sqlite3")
+
+# 기분을 고르지 않은 요청의 기분
+DEFAULT_MOOD = "평범한"
+
+
+def next_lunch(now: datetime) -> datetime:
+    """사전 계산에 쓸 예보 시각: 다음 점심 (점심 시각이 지났으면 내일 점심)"""
+    lunch = now.replace(hour=LUNCH_HOUR, minute=0, second=0, microsecond=0)
+    return lunch if now.hour < LUNCH_HOUR else lunch + timedelta(days=1)
+
+
+def rule_answers(task: Tuple[Dict, List[Tuple[str, str]], int]) -> List[List[Dict]]:
+    """격자 하나의 날씨로 (음식 종류, 기분) 조합별 규칙 기반 답변 최대 pool_size개 (프로세스 풀 작업 단위)"""
+    weather, combos, pool_size = task
+    catalog = load_catalog()
+    results = []
+    for food_type, mood in combos:
+        band, mood, food_type = ranking_context(weather, {"food_type": food_type, "mood": mood})
+        candidates = catalog.select(None if food_type == ANY_FOOD else (food_type,), band, mood)
+        # 서로 다른 메뉴를 골라 두고 조회할 때 무작위로 하나 (다양성 유지)
+        selected = random.sample(candidates, min(pool_size, len(candidates))) or [None]
+        results.append([build_rule_recommendation(weather, candidates, item) for item in selected])
+    return results
+
+
+class MaterializedTable:
+    """사전 계산한 추천 표 (SQLite, 키 조회용 WITHOUT ROWID 기본 키 순서로 저장)
+
+    워커 여러 개가 같은 파일을 함께 읽고, 계산을 맡은 워커 하나만 씁니다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("MATERIALIZE_DB_PATH", DEFAULT_PATH)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # 읽기는 메모리 매핑으로 (페이지를 읽기 버퍼로 복사하지 않음)
+        self._db.execute("PRAGMA mmap_size=67108864")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS recommendations ("
+            " nx INTEGER NOT NULL,"
+            " ny INTEGER NOT NULL,"
+            " food_type TEXT NOT NULL,"
+            " mood TEXT NOT NULL,"
+            " people TEXT NOT NULL,"
+            " base_time TEXT NOT NULL,"
+            " weather TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " answers TEXT NOT NULL,"
+            " PRIMARY KEY (nx, ny, food_type, mood, people, base_time)"
+            ") WITHOUT ROWID"
+        )
+        self._db.commit()
+
+    def get(
+        self, cell: Tuple[int, int], food_type: str, mood: str, people: str, base_times: Sequence[str]
+    ) -> Optional[Tuple[str, str, str]]:
+        """base_times 중 가장 최근 발표분의 (날씨 구분, 출처, 답변 JSON 배열)"""
+        placeholders = ",".join("?" * len(base_times))
+        return self._db.execute(
+            "SELECT weather, source, answers FROM recommendations"
+            " WHERE nx = ? AND ny = ? AND food_type = ? AND mood = ? AND people = ?"
+            f" AND base_time IN ({placeholders}) ORDER BY base_time DESC LIMIT 1",
+            (*cell, food_type, mood, people, *base_times)
+        ).fetchone()
+
+    def replace(self, rows: List[Tuple], keep: Sequence[str]):
+        """발표분 하나의 행을 한 트랜잭션으로 저장하고 keep에 없는 발표분은 삭제"""
+        placeholders = ",".join("?" * len(keep))
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO recommendations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._db.execute(f"DELETE FROM recommendations WHERE base_time NOT IN ({placeholders})", tuple(keep))
+
+    def stats(self) -> Dict:
+        by_base = dict(self._db.execute(
+            "SELECT base_time, COUNT(*) FROM recommendations GROUP BY base_time ORDER BY base_time"
+        ).fetchall())
+        page_count = self._db.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._db.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "path": self.path,
+            "rows": sum(by_base.values()),
+            "base_times": by_base,
+            "bytes": page_count * page_size,
+        }
+
+    def close(self):
+        self._db.close()
+
+
+class RecommendationMaterializer:
+    """새 발표분이 반영될 때마다 인기 격자의 모든 선호도 조합 추천을 미리 계산하는 백그라운드 작업
+
+    규칙 기반 답변은 프로세스 풀(MATERIALIZE_PROCESSES, 0이면 스레드 하나)에서 격자 단위로 계산하고,
+    LLM 키가 있으면 응답 캐시 키가 같은 조합끼리 묶어 LLM_BATCH_SIZE개씩, 동시 호출 수를 제한해 받은 답변으로 대체합니다.
+    받은 LLM 답변은 추천 응답 캐시에도 넣습니다.
+    """
+
+    def __init__(self, weather_service, ai_service, prefetcher, table: Optional[MaterializedTable] = None):
+        self.weather_service = weather_service
+        self.ai_service = ai_service
+        self.prefetcher = prefetcher
+        # 기상청 API 키가 없으면 예보가 더미 값이라 계산하지 않음
+        self.enabled = (
+            os.getenv("MATERIALIZE_ENABLED", "true").lower() == "true" and bool(weather_service.api_key)
+        )
+        self.processes = int(os.getenv("MATERIALIZE_PROCESSES", "0"))
+        self.llm_enabled = os.getenv("MATERIALIZE_LLM", "true").lower() == "true"
+        self.llm_concurrency = int(os.getenv("MATERIALIZE_LLM_CONCURRENCY", "2"))
+        self.pool_size = int(os.getenv("MATERIALIZE_POOL_SIZE", "3"))
+        # 발표분 반영 후 선행 갱신이 예보를 받아 둘 때까지 기다리는 시간 (초)
+        self.delay = float(os.getenv("MATERIALIZE_DELAY_SECONDS", "30"))
+        # 인원 구분별 대표 인원 수 (1명, 2~4명, 5명 이상)
+        self.people = [
+            int(value) for value in os.getenv("MATERIALIZE_PEOPLE", "1,2,5").split(",") if value.strip()
+        ]
+        catalog = ai_service.catalog
+        self.food_types = list(catalog.categories) + [ANY_FOOD]
+        self.moods = list(dict.fromkeys(list(catalog.by_mood) + [DEFAULT_MOOD]))
+        self.table = table or MaterializedTable()
+        self.store = get_shared_store()
+
+        self._task: Optional[asyncio.Task] = None
+        self.next_run: Optional[datetime] = None
+        self.last_build: Dict = {}
+        self.builds = 0
+        self.skipped = 0
+        self.failed = 0
+        # 실제 요청의 조회 결과 (stale: 계산 이후 예보가 바뀌었거나 점심 시각이 아닌 요청, unsupported: 다인 모드,
+        # rule_only: LLM 키가 있는데 LLM 답변을 받지 못해 규칙 기반으로 채운 행 → 응답 캐시·LLM 경로로)
+        self.lookups = {"hits": 0, "misses": 0, "stale": 0, "unsupported": 0, "rule_only": 0}
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # 시작 직후 현재 발표분부터 계산하고, 이후 새 발표분이 반영될 때마다 다시 계산
+        while True:
+            try:
+                await self.build_once()
+            except Exception:
+                self.failed += 1
+                logger.exception("추천 사전 계산 오류")
+            self.next_run = self.prefetcher.next_run_at(datetime.now()) + timedelta(seconds=self.delay)
+            delay = (self.next_run - datetime.now()).total_seconds()
+            await asyncio.sleep(max(delay, 0))
+
+    async def _claim(self, base: datetime) -> bool:
+        """워커가 여러 개일 때 이번 발표분 계산을 맡을 워커 하나만 True (나머지는 같은 SQLite 파일을 읽음)"""
+        if self.store is None:
+            return True
+        service = self.weather_service
+        ttl = (service.next_base_datetime(base) - base).total_seconds()
+        try:
+            return await self.store.add(f"materialize:{base:%Y%m%d%H%M}", os.getpid(), ttl=ttl)
+        except SharedStoreError:
+            return True
+
+    def _base_times(self, base: datetime) -> Tuple[str, str]:
+        """이번 발표분과 직전 발표분 (새 발표분 계산이 끝나기 전에는 직전 발표분 행으로 응답)"""
+        previous = self.weather_service.previous_base_datetime(base)
+        return f"{base:%Y%m%d%H%M}", f"{previous:%Y%m%d%H%M}"
+
+    async def build_once(self) -> Dict:
+        """선택한 격자의 모든 조합을 한 번 계산해 표에 저장하고 결과 요약 반환"""
+        now = datetime.now()
+        base = self.weather_service.base_datetime(now)
+        if not await self._claim(base):
+            self.skipped += 1
+            return self.last_build
+        started_at = now
+        started = time.perf_counter()
+        target = next_lunch(now)
+
+        # 1. 격자별 다음 점심 시각 예보 (선행 갱신이 받아 둔 캐시, 없으면 조회)
+        cells = self.prefetcher.select_cells()
+        slots = asyncio.Semaphore(self.prefetcher.concurrency)
+
+        async def forecast(cell):
+            async with slots:
+                try:
+                    return await self.weather_service.forecast_at(*cell, target)
+                except Exception:
+                    logger.exception("추천 사전 계산 예보 조회 오류 %s", cell)
+                    return None
+
+        forecasts = await asyncio.gather(*(forecast(cell) for cell in cells))
+        cell_weather = [
+            (cell, weather) for cell, weather in zip(cells, forecasts)
+            if weather is not None and weather.get("temperature") is not None
+        ]
+        weather_seconds = time.perf_counter() - started
+
+        # 2. 규칙 기반 답변 (음식 종류 × 기분, 인원 구분과 무관)
+        combos = [(food_type, mood) for food_type in self.food_types for mood in self.moods]
+        rule_started = time.perf_counter()
+        rule_results = await self._rule_answers([(weather, combos, self.pool_size) for _, weather in cell_weather])
+        rule_seconds = time.perf_counter() - rule_started
+
+        # 3. LLM 답변 (응답 캐시 키가 같은 조합은 한 번만)
+        llm_started = time.perf_counter()
+        llm_answers, llm_keys = {}, 0
+        if self.ai_service.use_ai and self.llm_enabled:
+            llm_answers, llm_keys = await self._llm_answers(cell_weather)
+            if len(llm_answers) < llm_keys:
+                logger.warning(
+                    "추천 사전 계산: LLM 답변 %d/%d개만 받음 (나머지 조합은 요청 시 LLM 경로로 응답)",
+                    len(llm_answers), llm_keys
+                )
+        elif self.ai_service.use_ai:
+            logger.warning("MATERIALIZE_LLM=false: LLM 키가 있어 규칙 기반으로 계산한 행은 응답에 쓰지 않습니다.")
+        llm_seconds = time.perf_counter() - llm_started
+
+        # 4. 표에 저장 (응답의 weather_info는 조회할 때 요청 위치로 채움)
+        base_times = self._base_times(base)
+        rows = []
+        for ((nx, ny), weather), answers in zip(cell_weather, rule_results):
+            weather_key = weather_bucket(weather)
+            for (food_type, mood), rule in zip(combos, answers):
+                for num_people in self.people:
+                    preferences = {"food_type": food_type, "mood": mood, "num_people": num_people}
+                    answer = llm_answers.get(recommendation_key(weather, preferences))
+                    source, pool = ("llm", [answer]) if answer is not None else ("rule", rule)
+                    pool = [{k: v for k, v in item.items() if k != "weather_info"} for item in pool]
+                    rows.append((
+                        nx, ny, food_type, mood, people_bucket(num_people), base_times[0],
+                        weather_key, source, json.dumps(pool, ensure_ascii=False)
+                    ))
+        write_started = time.perf_counter()
+        await asyncio.to_thread(self.table.replace, rows, base_times)
+        write_seconds = time.perf_counter() - write_started
+
+        self.builds += 1
+        self.last_build = {
+            "base_time": base_times[0],
+            "target_time": target.isoformat(timespec="minutes"),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "cells": len(cells),
+            "cells_with_forecast": len(cell_weather),
+            "combos_per_cell": len(combos) * len(self.people),
+            "rows": len(rows),
+            "llm": {"keys": llm_keys, "answered": len(llm_answers)},
+            "seconds": {
+                "weather": round(weather_seconds, 3),
+                "rule": round(rule_seconds, 3),
+                "llm": round(llm_seconds, 3),
+                "write": round(write_seconds, 3),
+                "total": round(time.perf_counter() - started, 3),
+            },
+        }
+        logger.info(
+            "추천 사전 계산 완료: 발표분 %s, 격자 %d개, %d행, %.2f초",
+            base_times[0], len(cell_weather), len(rows), self.last_build["seconds"]["total"]
+        )
+        return self.last_build
+
+    async def _rule_answers(self, tasks: List[Tuple]) -> List[List[List[Dict]]]:
+        """격자별 규칙 기반 답변 (MATERIALIZE_PROCESSES개 프로세스, 0이면 스레드 하나)"""
+        if self.processes <= 0 or not tasks:
+            return await asyncio.to_thread(lambda: [rule_answers(task) for task in tasks])
+        loop = asyncio.get_running_loop()
+        # 스레드가 있는 프로세스의 fork는 안전하지 않아 spawn (계산할 때만 띄우고 끝나면 정리)
+        executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            return await asyncio.gather(*(loop.run_in_executor(executor, rule_answers, task) for task in tasks))
+        finally:
+            await asyncio.to_thread(executor.shutdown)
+
+    async def _llm_answers(self, cell_weather: List[Tuple[Tuple[int, int], Dict]]) -> Tuple[Dict[str, Dict], int]:
+        """응답 캐시 키 → LLM 답변, 키 개수 (MATERIALIZE_LLM_CONCURRENCY개 묶음씩 동시 호출)"""
+        items: Dict[str, Tuple[Dict, Dict]] = {}
+        for _, weather in cell_weather:
+            for food_type in self.food_types:
+                for mood in self.moods:
+                    for num_people in self.people:
+                        preferences = {"food_type": food_type, "mood": mood, "num_people": num_people}
+                        items.setdefault(recommendation_key(weather, preferences), (weather, preferences))
+        keys = list(items)
+        size = self.ai_service.llm_batch_size
+        slots = asyncio.Semaphore(self.llm_concurrency)
+        answers: Dict[str, Dict] = {}
+
+        async def ask(chunk: List[str]):
+            async with slots:
+                received = await self.ai_service.batch_answers([items[key] for key in chunk], purpose="materialize")
+            for index, answer in received.items():
+                answers[chunk[index]] = answer
+                await self.ai_service.response_cache.add(chunk[index], dict(answer))
+
+        await asyncio.gather(*(ask(keys[i:i + size]) for i in range(0, len(keys), size)))
+        return answers, len(keys)
+
+    def lookup(self, location: str, weather: Dict, preferences: Optional[Dict]) -> Optional[Dict]:
+        """미리 계산한 답변 중 하나 (없거나 계산할 때와 날씨 구분이 다르면 None)"""
+        if not self.enabled:
+            return None
+        preferences = preferences or {}
+        if preferences.get("moods"):
+            # 다인 모드(사람별 기분)는 조합이 많아 계산하지 않음
+            self.lookups["unsupported"] += 1
+            return None
+        service = self.weather_service
+        try:
+            row = self.table.get(
+                service.get_grid_coords(location),
+                preferences.get("food_type") or ANY_FOOD,
+                preferences.get("mood") or DEFAULT_MOOD,
+                people_bucket(preferences.get("num_people")),
+                self._base_times(service.base_datetime(datetime.now()))
+            )
+        except sqlite3.Error as e:
+            logger.warning("사전 계산 추천 조회 오류: %s", e)
+            row = None
+        if row is None:
+            self.lookups["misses"] += 1
+            return None
+        weather_key, source, answers = row
+        if weather_key != weather_bucket(weather):
+            self.lookups["stale"] += 1
+            return None
+        if source == "rule" and self.ai_service.use_ai:
+            # LLM을 쓸 수 있으면 규칙 기반 답변이 응답 캐시·LLM 답변을 가로채지 않도록
+            self.lookups["rule_only"] += 1
+            return None
+        self.lookups["hits"] += 1
+        return random.choice(json.loads(answers))
+
+    def hit_ratio(self) -> Optional[float]:
+        """실제 요청 중 미리 계산한 답변으로 응답할 수 있었던 비율"""
+        total = sum(self.lookups.values())
+        return round(self.lookups["hits"] / total, 4) if total else None
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._task is not None and not self._task.done(),
+            "next_run": self.next_run.isoformat(timespec="seconds") if self.next_run else None,
+            "last_build": self.last_build,
+            "builds": self.builds,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "table": self.table.stats(),
+            "lookups": dict(self.lookups, hit_ratio=self.hit_ratio()),
+            "processes": self.processes,
+            "llm": {
+                "enabled": self.ai_service.use_ai and self.llm_enabled,
+                "concurrency": self.llm_concurrency,
+            },
+        }
@@ -0,0 +1,162 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "menu_catalog.json")
+
+# 온도 구분
+WARM = "따뜻한"
+COLD = "시원한"
+MILD = "중간"
+
+
+def temperature_band(temp: float, precipitation: str = "없음") -> str:
+    """기온·강수로 온도 구분 결정 (비/눈 오는 날은 국물 요리)"""
+    if precipitation != "없음":
+        return WARM
+    if temp < 10:
+        return WARM
+    if temp > 25:
+        return COLD
+    return MILD
+
+
+class MenuItem:
+    """메뉴 한 개 (불변)"""
+    __slots__ = ("index", "name", "category", "band", "spicy", "reason")
+
+    def __init__(self, index: int, name: str, category: str, band: str, spicy: str, reason: str):
+        object.__setattr__(self, "index", index)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "category", category)
+        object.__setattr__(self, "band", band)
+        object.__setattr__(self, "spicy", spicy)
+        object.__setattr__(self, "reason", reason)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MenuItem is immutable")
+
+    def __repr__(self) -> str:
+        return f"MenuItem({self.name!r}, {self.category!r}, {self.band!r})"
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "category": self.category, "spicy": self.spicy, "reason": self.reason}
+
+
+class MenuCatalog:
+    """한 번 읽어 두고 공유하는 메뉴 카탈로그
+
+    (음식 종류, 온도 구분, 기분, 매운 정도)별 인덱스를 비트마스크(int)로 미리 계산해 두고,
+    후보 선택은 마스크 AND/OR 연산으로 처리합니다. 비트 순서는 카탈로그 파일의 메뉴 순서입니다.
+    """
+
+    def __init__(self, items: Iterable[Dict], mood_affinity: Optional[Dict[str, List[str]]] = None):
+        self.items: Tuple[MenuItem, ...] = tuple(
+            MenuItem(i, item["name"], item["category"], item["band"], item.get("spicy", "보통"), item.get("reason", ""))
+            for i, item in enumerate(items)
+        )
+        self.categories: Tuple[str, ...] = tuple(dict.fromkeys(item.category for item in self.items))
+        self.all_mask = (1 << len(self.items)) - 1
+
+        self.by_category = self._index("category")
+        self.by_band = self._index("band")
+        self.by_spicy = self._index("spicy")
+
+        # 기분 → 어울리는 음식 종류의 메뉴 마스크 (제한 없는 기분은 0)
+        self.by_mood: Dict[str, int] = {}
+        for mood, categories in (mood_affinity or {}).items():
+            mask = 0
+            for category in categories:
+                mask |= self.by_category.get(category, 0)
+            self.by_mood[mood] = mask
+
+        # (음식 종류, 온도 구분) → 후보 마스크. 해당 구분 메뉴가 없는 종류는 "중간" 메뉴로 대체
+        self._candidates: Dict[Tuple[str, str], int] = {}
+        for category, category_mask in self.by_category.items():
+            for band in (WARM, COLD, MILD):
+                mask = category_mask & self.by_band.get(band, 0)
+                if not mask:
+                    mask = category_mask & self.by_band.get(MILD, 0)
+                self._candidates[(category, band)] = mask
+
+        # 후보 마스크 → 메뉴 목록 (조건 조합 수만큼만 생기므로 크기 제한 없음, 스레드에서 불러도 dict 연산 하나씩)
+        self._items_for: Dict[int, Tuple[MenuItem, ...]] = {}
+
+    def _index(self, attribute: str) -> Dict[str, int]:
+        index: Dict[str, int] = {}
+        for item in self.items:
+            key = getattr(item, attribute)
+            index[key] = index.get(key, 0) | (1 << item.index)
+        return index
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "MenuCatalog":
+        """JSON 또는 YAML(.yml/.yaml, PyYAML 필요) 카탈로그 파일 읽기"""
+        path = path or os.getenv("MENU_CATALOG_PATH", DEFAULT_PATH)
+        with open(path, encoding="utf-8") as f:
+            if path.endswith((".yml", ".yaml")):
+                import yaml
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        return cls(data["menus"], data.get("mood_affinity"))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def names(self) -> List[str]:
+        """모든 메뉴명 (중복 제거, 카탈로그 순서)"""
+        return list(dict.fromkeys(item.name for item in self.items))
+
+    def candidate_mask(
+        self,
+        categories: Optional[Iterable[str]],
+        band: str,
+        mood: Optional[str] = None,
+        spicy: Optional[str] = None
+    ) -> int:
+        """조건에 맞는 메뉴 마스크
+
+        categories가 None이면 모든 음식 종류. 기분·매운 정도 조건은 결과가 비지 않을 때만 적용합니다.
+        """
+        mask = 0
+        for category in (self.categories if categories is None else categories):
+            mask |= self._candidates.get((category, band), 0)
+
+        for narrowing in (self.by_mood.get(mood, 0), self.by_spicy.get(spicy, 0)):
+            if narrowing and mask & narrowing:
+                mask &= narrowing
+        return mask
+
+    def select(
+        self,
+        categories: Optional[Iterable[str]],
+        band: str,
+        mood: Optional[str] = None,
+        spicy: Optional[str] = None
+    ) -> Tuple[MenuItem, ...]:
+        """조건에 맞는 후보 메뉴 목록 (카탈로그 순서)"""
+        return self.items_for(self.candidate_mask(
+            tuple(categories) if categories is not None else None, band, mood, spicy
+        ))
+
+    def items_for(self, mask: int) -> Tuple[MenuItem, ...]:
+        """마스크 → 메뉴 목록 (조건 조합이 적으므로 결과를 캐시)"""
+        cached = self._items_for.get(mask)
+        if cached is not None:
+            return cached
+        items = []
+        remaining = mask
+        while remaining:
+            low = remaining & -remaining
+            items.append(self.items[low.bit_length() - 1])
+            remaining ^= low
+        self._items_for[mask] = result = tuple(items)
+        return result
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path: Optional[str] = None) -> MenuCatalog:
+    """프로세스당 한 번만 카탈로그를 읽음"""
+    return MenuCatalog.load(path)
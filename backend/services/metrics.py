@@ -0,0 +1,299 @@
+"""경량 메트릭 (카운터·히스토그램·구간 측정)과 Prometheus 텍스트 형식 출력
+
+핫 패스에서 쓰이므로 외부 라이브러리 없이 사전 + 리스트 연산만 합니다
+(구간 하나 측정 비용은 benchmarks/bench_metrics.py로 확인).
+"""
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import cProfile
+import logging
+import os
+import random
+import re
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 수집 함수: (이름, 종류, 설명, [(레이블, 값)]) 목록 반환
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class Registry:
+    """메트릭과 수집 함수 모음"""
+
+    def __init__(self):
+        self.metrics: List = []
+        self.collectors: List[Collector] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector):
+        """출력할 때마다 호출해 값을 가져올 함수 등록 (기존 stats()를 그대로 내보낼 때)"""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                logger.exception("메트릭 수집 오류")
+                continue
+            for name, kind, help_text, samples in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Counter:
+    """레이블별 누적 카운터 (레이블 값은 위치 인자 순서대로)"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values: Dict[Tuple[str, ...], float] = {}
+        registry.register(self)
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labels, label_values)))} {value}")
+        return lines
+
+
+class Histogram:
+    """레이블별 히스토그램 (구간별 개수, 합계, 개수)"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        registry: Registry = REGISTRY
+    ):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 → [구간별 개수..., +Inf 개수, 합계, 개수]
+        self.series: Dict[Tuple[str, ...], List[float]] = {}
+        registry.register(self)
+
+    def observe(self, value: float, *label_values: str):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self.series.get(label_values)
+        return int(series[-1]) if series else 0
+
+    def total(self, *label_values: str) -> float:
+        series = self.series.get(label_values)
+        return series[-2] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in self.series.items():
+            labels = dict(zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(dict(labels, le=le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {series[-2]}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-1]}")
+        return lines
+
+
+HTTP_SECONDS = Histogram("lunch_http_request_duration_seconds", "엔드포인트별 응답 시간", ("method", "route"))
+HTTP_REQUESTS = Counter("lunch_http_requests_total", "엔드포인트별 요청 수", ("method", "route", "status"))
+SPAN_SECONDS = Histogram("lunch_span_duration_seconds", "처리 구간별 소요 시간", ("span",))
+SPAN_ERRORS = Counter("lunch_span_errors_total", "예외로 끝난 처리 구간 수", ("span",))
+UPSTREAM_ERRORS = Counter("lunch_upstream_errors_total", "외부 API 오류 수", ("upstream", "kind"))
+LLM_TOKENS = Counter(
+    "lunch_llm_tokens_total", "LLM 사용 토큰 수 (response.usage, 스트리밍은 로컬 토크나이저 추정치)", ("purpose", "kind")
+)
+LLM_COST = Histogram(
+    "lunch_llm_request_cost_usd",
+    "LLM 요청당 비용 (USD, 토큰 수 × LLM_PRICE_*_PER_1K)",
+    ("purpose",),
+    buckets=(0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+)
+LLM_PARSE = Counter(
+    "lunch_llm_parse_total", "LLM JSON 응답 해석 결과 (ok, repaired, partial, invalid_json, invalid_schema)", ("purpose", "outcome")
+)
+FALLBACKS = Counter("lunch_fallbacks_total", "LLM 대신 대체 응답을 사용한 횟수", ("kind", "reason"))
+DEDUP = Counter(
+    "lunch_dedup_requests_total", "요청 중복 제거 결과 (executed, inflight, replayed, conflict)", ("route", "result")
+)
+SPECULATIVE = Counter(
+    "lunch_speculative_recipes_total",
+    "/api/lunch 추천 메뉴 레시피 선행 생성 결과 (cached, ready, pending, cancelled, skipped)",
+    ("result",)
+)
+LIVE_MESSAGES = Counter(
+    "lunch_live_messages_total",
+    "실시간 구독 메시지 처리 결과 (sent, conflated, slow_consumer, failed)",
+    ("kind", "result")
+)
+RANKER_DECISIONS = Counter(
+    "lunch_ranker_decisions_total",
+    "랭킹 모델 응답 여부 (model, low_support, low_confidence, explore, no_candidates)",
+    ("decision",)
+)
+RECOMMENDATIONS = Counter(
+    "lunch_recommendations_total", "추천 응답 출처 (model, llm, llm_cache, rule, default)", ("source",)
+)
+FEEDBACK_EVENTS = Counter("lunch_feedback_events_total", "추천 피드백 이벤트 수", ("event",))
+ADMISSION_REQUESTS = Counter(
+    "lunch_admission_requests_total",
+    "요청 수락 제어 결과 (admitted, admitted_after_wait, downgraded, rate_limited, shed_*)",
+    ("class", "result")
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "lunch_admission_wait_seconds",
+    "수락 제어 대기열에서 기다린 시간",
+    ("class",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+DEGRADED = Counter("lunch_degraded_responses_total", "대체 경로 단계별 응답 수 (cache → rule → default)", ("kind", "level"))
+LOOP_LAG_SECONDS = Histogram(
+    "lunch_event_loop_lag_seconds",
+    "이벤트 루프 지연 (예약한 깨어남 시각 대비 늦어진 시간)",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+
+async def monitor_loop_lag(interval: float = 0.1):
+    """interval마다 잠들었다 깨어나며 늦어진 시간을 기록 (블로킹 코드 탐지용)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - start - interval))
+
+
+class span:
+    """with 블록 소요 시간을 SPAN_SECONDS에 기록 (예외로 끝나면 SPAN_ERRORS도 증가)"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "span":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        SPAN_SECONDS.observe(perf_counter() - self.start, self.name)
+        if exc_type is not None:
+            SPAN_ERRORS.inc(self.name)
+        return False
+
+
+class RequestProfiler:
+    """요청 일부를 표본으로 골라 cProfile 결과(.prof)를 저장 (PROFILE_SAMPLE_RATE > 0일 때만)
+
+    cProfile은 스레드 단위로 측정하므로 같은 시간에 처리된 다른 요청의 작업도 함께 기록됩니다.
+    한 번에 한 요청만 측정합니다. 결과는 `python -m pstats 파일` 또는 snakeviz로 확인합니다.
+    """
+
+    def __init__(self, sample_rate: Optional[float] = None, directory: Optional[str] = None):
+        self.sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0")) if sample_rate is None else sample_rate
+        self.directory = directory or os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "lunch-profiles"))
+        self._active = False
+        self.saved = 0
+
+    def start(self) -> Optional[cProfile.Profile]:
+        if self.sample_rate <= 0 or self._active or random.random() >= self.sample_rate:
+            return None
+        self._active = True
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(self, profile: cProfile.Profile, method: str, route: str):
+        profile.disable()
+        self._active = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            name = re.sub(r"[^0-9A-Za-z]+", "_", f"{method}_{route}").strip("_")
+            path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}_{name}_{self.saved}.prof")
+            profile.dump_stats(path)
+            self.saved += 1
+        except OSError:
+            logger.exception("프로파일 저장 오류")
+
+
+class MetricsMiddleware:
+    """엔드포인트(라우트 경로 템플릿)별 응답 시간·상태 코드 기록, 표본 요청 프로파일링 (ASGI 미들웨어)"""
+
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None):
+        self.app = app
+        self.profiler = profiler or RequestProfiler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = perf_counter()
+        profile = self.profiler.start()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 라우트 경로 템플릿 사용 (경로 매개변수·없는 경로로 레이블이 늘어나지 않도록)
+            route = getattr(scope.get("route"), "path", None)
+            if route is None:
+                route = scope["path"] if "endpoint" in scope else "unmatched"
+            HTTP_SECONDS.observe(perf_counter() - start, scope["method"], route)
+            HTTP_REQUESTS.inc(scope["method"], route, str(status))
+            if profile is not None:
+                self.profiler.finish(profile, scope["method"], route)
@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+
+from services.rate_limit import create_rate_limiter
+from services.shared_store import SharedStoreError, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastPrefetcher:
+    """많이 조회되는 격자의 예보를 새 발표분이 나오자마자 미리 받아 두는 백그라운드 작업
+
+    발표 시각 + 반영 지연(WEATHER_PUBLISH_DELAY_MINUTES)마다 조회 수 상위 격자를
+    동시 호출 수와 초당 호출 수(토큰 버킷)를 제한해 갱신합니다.
+    조회 수는 갱신할 때마다 절반으로 줄여 최근 인기 격자를 따라갑니다.
+    """
+
+    def __init__(self, weather_service, seed_locations: Optional[List[str]] = None):
+        self.weather_service = weather_service
+        self.top_cells = int(os.getenv("PREFETCH_TOP_CELLS", "50"))
+        self.concurrency = int(os.getenv("PREFETCH_CONCURRENCY", "4"))
+        # 워커가 여러 개면 호출 한도는 워커 전체 합산
+        self.rate_limiter = create_rate_limiter(
+            "prefetch",
+            rate=float(os.getenv("PREFETCH_RATE_PER_SEC", "5")),
+            burst=float(os.getenv("PREFETCH_BURST", "5"))
+        )
+        self.store = get_shared_store()
+        if seed_locations is None:
+            seed_locations = [
+                name.strip()
+                for name in os.getenv("PREFETCH_SEED_LOCATIONS", "서울,강남,여의도,판교").split(",")
+                if name.strip()
+            ]
+        # 아직 조회 기록이 없을 때도 갱신할 기본 격자
+        self.seed_cells = list(dict.fromkeys(weather_service.get_grid_coords(name) for name in seed_locations))
+
+        self._task: Optional[asyncio.Task] = None
+        self.next_run: Optional[datetime] = None
+        self.last_run: Dict = {}
+        self.last_refreshed: Dict[Tuple[int, int], datetime] = {}
+        self.runs = 0
+        self.skipped = 0
+        self.refreshed = 0
+        self.failed = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def next_run_at(self, now: datetime) -> datetime:
+        """다음 발표분이 API에 반영되는 시각"""
+        service = self.weather_service
+        base = service.base_datetime(now)
+        return service.next_base_datetime(base) + service.publish_delay
+
+    def select_cells(self) -> List[Tuple[int, int]]:
+        """갱신 대상: 조회 수 상위 격자 + 기본 격자"""
+        popular = [cell for cell, _ in self.weather_service.cell_requests.most_common(self.top_cells)]
+        return list(dict.fromkeys(popular + self.seed_cells))[:max(self.top_cells, len(self.seed_cells))]
+
+    async def _run(self):
+        # 시작 직후 현재 발표분부터 채우고, 이후 새 발표분이 반영될 때마다 갱신
+        while True:
+            try:
+                await self.refresh_once()
+            except Exception:
+                logger.exception("예보 선행 갱신 오류")
+            self.next_run = self.next_run_at(datetime.now())
+            delay = (self.next_run - datetime.now()).total_seconds()
+            await asyncio.sleep(max(delay, 0))
+
+    async def _claim(self) -> bool:
+        """워커가 여러 개일 때 이번 발표분 갱신을 맡을 워커 하나만 True (나머지는 공유 캐시 사용)"""
+        if self.store is None:
+            return True
+        service = self.weather_service
+        base = service.base_datetime(datetime.now())
+        ttl = (service.next_base_datetime(base) - base).total_seconds()
+        try:
+            return await self.store.add(f"prefetch:{base:%Y%m%d%H%M}", os.getpid(), ttl=ttl)
+        except SharedStoreError:
+            return True
+
+    async def refresh_once(self) -> Dict:
+        """선택한 격자를 한 번 갱신하고 결과 요약 반환"""
+        if not await self._claim():
+            self.skipped += 1
+            return self.last_run
+        cells = self.select_cells()
+        slots = asyncio.Semaphore(self.concurrency)
+        started_at = datetime.now()
+
+        async def refresh(cell):
+            if self.weather_service.is_warm(*cell):
+                return True
+            async with slots:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                try:
+                    ok = await self.weather_service.refresh(*cell)
+                except Exception:
+                    logger.exception("예보 선행 갱신 오류 %s", cell)
+                    ok = False
+                if ok:
+                    self.last_refreshed[cell] = datetime.now()
+                return ok
+
+        results = await asyncio.gather(*(refresh(cell) for cell in cells))
+        succeeded = sum(results)
+        self.runs += 1
+        self.refreshed += succeeded
+        self.failed += len(results) - succeeded
+
+        # 조회 수 감쇠 (0이 된 격자는 제거)
+        counts = self.weather_service.cell_requests
+        for cell in list(counts):
+            counts[cell] //= 2
+            if not counts[cell]:
+                del counts[cell]
+
+        self.last_run = {
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "cells": len(cells),
+            "refreshed": succeeded,
+            "failed": len(results) - succeeded,
+        }
+        return self.last_run
+
+    def warm_ratio(self) -> Optional[float]:
+        """갱신 대상 격자 중 현재 발표분이 캐시에 있는 비율"""
+        cells = self.select_cells()
+        if not cells:
+            return None
+        warm = sum(self.weather_service.is_warm(*cell) for cell in cells)
+        return round(warm / len(cells), 3)
+
+    def stats(self) -> Dict:
+        cells = self.select_cells()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "next_run": self.next_run.isoformat(timespec="seconds") if self.next_run else None,
+            "last_run": self.last_run,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "warm_ratio": self.warm_ratio(),
+            "cells": [
+                {
+                    "nx": nx,
+                    "ny": ny,
+                    "requests": self.weather_service.cell_requests.get((nx, ny), 0),
+                    "warm": self.weather_service.is_warm(nx, ny),
+                    "last_refreshed": (
+                        self.last_refreshed[(nx, ny)].isoformat(timespec="seconds")
+                        if (nx, ny) in self.last_refreshed else None
+                    ),
+                }
+                for nx, ny in cells
+            ],
+            "rate_limit": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+        }
@@ -0,0 +1,161 @@
+"""프롬프트 컴파일: 고정 system 프롬프트, 공백 정리, 토큰 수 계산, 출력 형식 기반 max_tokens
+
+system 프롬프트는 import 시 한 번 정리해 두고 매 요청 같은 바이트열을 그대로 보냅니다
+(앞부분이 같아야 제공자 쪽 프롬프트 캐시가 적용됨). 요청마다 달라지는 값은 user 메시지에만 넣습니다.
+토큰 수는 tiktoken이 설치되어 있으면 그것으로, 없으면 글자 수 기반 근사치로 셉니다.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import json
+import os
+
+# 메시지 하나당 역할·구분자 토큰, 응답 시작 토큰 (OpenAI chat 형식 기준)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+
+def compact(text: str) -> str:
+    """줄마다 앞뒤 공백 제거, 빈 줄 제거"""
+    return "\n".join(line.strip() for line in text.strip().splitlines() if line.strip())
+
+
+def _approximate_tokens(text: str) -> int:
+    """tiktoken이 없을 때의 근사치: ASCII는 4글자당 1토큰, 한글 등은 글자당 1~2토큰이라 1.5토큰"""
+    ascii_chars = sum(1 for c in text if c < "\x80")
+    return (ascii_chars + 3) // 4 + ((len(text) - ascii_chars) * 3 + 1) // 2
+
+
+@lru_cache(maxsize=None)
+def _tokenizer(model: str) -> Tuple[str, Callable[[str], int]]:
+    try:
+        import tiktoken
+    except ImportError:
+        return "approximate", _approximate_tokens
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return encoding.name, lambda text: len(encoding.encode(text))
+
+
+def tokenizer_name(model: str = "gpt-3.5-turbo") -> str:
+    return _tokenizer(model)[0]
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    return _tokenizer(model)[1](text)
+
+
+def count_message_tokens(messages: List[Dict], model: str = "gpt-3.5-turbo") -> int:
+    """chat 메시지 목록의 프롬프트 토큰 수"""
+    return sum(TOKENS_PER_MESSAGE + count_tokens(m["content"], model) for m in messages) + TOKENS_PER_REPLY
+
+
+RECOMMEND_SYSTEM = compact("""
+    당신은 직장인들을 위한 점심 메뉴 추천 전문가입니다.
+    날씨, 계절, 온도를 고려하여 최적의 메뉴를 추천해주세요.
+    날씨가 추우면 따뜻한 음식, 더우면 시원한 음식을 추천하고,
+    비가 오면 국물 요리를, 맑은 날은 다양한 선택지를 제안해주세요.
+    인원과 기분 상태도 고려해서 추천해주세요.
+    응답은 반드시 다음 구조의 JSON 하나로 해주세요:
+    {"menu": "메뉴명", "category": "한식/중식/일식/양식/분식", "reason": "추천 이유 (100자 이내)", "temperature_match": "온도와의 연관성", "alternatives": ["대체 메뉴1", "대체 메뉴2"]}
+""")
+
+BATCH_SYSTEM = compact("""
+    당신은 직장인들을 위한 점심 메뉴 추천 전문가입니다.
+    번호가 붙은 여러 요청 각각에 대해 날씨, 온도, 인원, 음식 종류, 기분을 고려해 메뉴를 하나씩 추천해주세요.
+    응답은 반드시 다음 구조의 JSON 하나로 해주세요:
+    {"results": [{"index": 요청 번호, "menu": "메뉴명", "category": "한식/중식/일식/양식/분식", "reason": "추천 이유 (100자 이내)", "temperature_match": "온도와의 연관성", "alternatives": ["대체 메뉴1", "대체 메뉴2"]}]}
+""")
+
+RECIPE_SYSTEM = compact("""
+    당신은 요리 전문가입니다. 자세하고 실용적인 레시피를 제공해주세요.
+    응답은 반드시 다음 구조의 JSON 하나로 해주세요:
+    {"menu_name": "메뉴명", "servings": 인분 수, "ingredients": [{"name": "재료명", "amount": "양"}], "steps": ["1단계 설명", "2단계 설명"], "cooking_time": "조리 시간", "difficulty": "쉬움/보통/어려움"}
+""")
+
+# 출력 토큰 추정용 예시 답변 (필드별 일반적인 길이)
+_SAMPLE_RECOMMENDATION = {
+    "menu": "얼큰한 순두부찌개",
+    "category": "한식",
+    "reason": "쌀쌀하고 흐린 날씨에는 뜨끈한 국물이 몸을 데워 주고, 매콤한 맛이 가라앉은 기분을 끌어올려 줍니다. 여럿이 함께 나눠 먹기에도 좋고 가격 부담도 적습니다",
+    "temperature_match": "기온이 낮아 뜨거운 국물 요리가 잘 어울립니다",
+    "alternatives": ["김치찌개", "된장찌개"],
+}
+_SAMPLE_RECIPE = {
+    "menu_name": "얼큰한 순두부찌개",
+    "servings": 1,
+    "ingredients": [{"name": "순두부", "amount": "1봉지(350g)"}] * 10,
+    "steps": ["냄비에 기름을 두르고 다진 마늘과 고춧가루를 약불에서 볶아 고추기름을 냅니다."] * 8,
+    "cooking_time": "약 20분",
+    "difficulty": "쉬움",
+}
+
+
+def _output_tokens(sample, model: str) -> int:
+    return count_tokens(json.dumps(sample, ensure_ascii=False), model)
+
+
+class CompiledPrompt(NamedTuple):
+    messages: List[Dict]
+    prompt_tokens: int
+    max_tokens: int
+
+
+class PromptCompiler:
+    """용도별 메시지와 max_tokens 생성 (출력 예상 토큰 × LLM_OUTPUT_TOKEN_MARGIN)"""
+
+    def __init__(self, model: str = "gpt-3.5-turbo", margin: Optional[float] = None):
+        self.model = model
+        self.margin = margin or float(os.getenv("LLM_OUTPUT_TOKEN_MARGIN", "1.5"))
+        self.recommend_tokens = _output_tokens(_SAMPLE_RECOMMENDATION, model)
+        self.batch_item_tokens = _output_tokens(dict(_SAMPLE_RECOMMENDATION, index=0), model)
+        self.recipe_tokens = _output_tokens(_SAMPLE_RECIPE, model)
+        # 고정 system 프롬프트의 토큰 수는 한 번만 셈
+        self._system_tokens = {
+            system: TOKENS_PER_MESSAGE + count_tokens(system, model)
+            for system in (RECOMMEND_SYSTEM, BATCH_SYSTEM, RECIPE_SYSTEM)
+        }
+
+    def _compile(self, system: str, user: str, expected_output: int) -> CompiledPrompt:
+        prompt_tokens = (
+            self._system_tokens[system] + TOKENS_PER_MESSAGE + count_tokens(user, self.model) + TOKENS_PER_REPLY
+        )
+        return CompiledPrompt(
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            prompt_tokens=prompt_tokens,
+            max_tokens=int(expected_output * self.margin),
+        )
+
+    @staticmethod
+    def _request_line(weather: Dict, preferences: Optional[Dict]) -> str:
+        """요청 하나의 입력값 (한 줄, 없는 값은 생략)"""
+        preferences = preferences or {}
+        parts = [
+            f"위치: {weather.get('location', '서울')}",
+            f"기온: {weather.get('temperature', 20)}°C",
+            f"날씨: {weather.get('sky_condition', '맑음')}",
+            f"강수: {weather.get('precipitation', '없음')}",
+        ]
+        if preferences:
+            parts += [
+                f"인원: {preferences.get('num_people') or 1}명",
+                f"음식 종류: {preferences.get('food_type') or '상관없음'}",
+                f"기분: {preferences.get('mood') or '평범한'}",
+            ]
+            moods = preferences.get("moods") or []
+            if len(moods) > 1:
+                parts.append(f"각 사람의 기분: {', '.join(moods)}")
+        return ", ".join(parts)
+
+    def recommend(self, weather: Dict, preferences: Optional[Dict]) -> CompiledPrompt:
+        return self._compile(RECOMMEND_SYSTEM, self._request_line(weather, preferences), self.recommend_tokens)
+
+    def batch(self, chunk: List[Tuple[Dict, Optional[Dict]]]) -> CompiledPrompt:
+        lines = [f"[{i}] {self._request_line(weather, preferences or {})}" for i, (weather, preferences) in enumerate(chunk)]
+        # 결과 목록 감싸는 부분 몇 토큰 + 항목별 답변
+        expected = 10 + self.batch_item_tokens * len(chunk)
+        return self._compile(BATCH_SYSTEM, "\n".join(lines), expected)
+
+    def recipe(self, menu_name: str, num_servings: int) -> CompiledPrompt:
+        return self._compile(RECIPE_SYSTEM, f"'{menu_name}' {num_servings}인분 레시피", self.recipe_tokens)
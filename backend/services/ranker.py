@@ -0,0 +1,284 @@
+"""피드백으로 학습하는 메뉴 랭킹 모델 (NumPy 로지스틱 회귀)과 LLM 호출 정책
+
+모델: P(좋아함 | 메뉴 d, 온도 구분 b, 기분 m, 음식 종류 f)
+    = sigmoid(w0 + bias[d] + band[d, b] + mood[d, m] + food[d, f])
+메뉴마다 조건별 가중치를 두는 가법 모델이라 (조건 조합 × 메뉴) 점수표를 학습 직후 모두 계산해 두고,
+추천은 점수표 조회(사전 한 번)로 끝납니다. 후보는 규칙 기반과 같은 카탈로그 조건으로 거릅니다.
+
+정책: 그 조건에서 피드백이 RANKER_MIN_SUPPORT개 이상 쌓인 (카탈로그) 메뉴만 후보로 두고,
+1위 확률이 RANKER_MIN_CONFIDENCE 이상이면서 그 조건의 평균 수락률보다 RANKER_MIN_LIFT 이상 높으면
+모델로 응답하고, 아니면 LLM(키가 없으면 규칙 기반)으로 넘깁니다.
+LLM 답변은 대부분 카탈로그에 없는 메뉴라 학습에서 빠지므로, 피드백 수는 학습에 쓴 표본으로만 셉니다.
+RANKER_EXPLORATION_RATE 비율은 확신이 있어도 LLM으로 넘겨 새 메뉴의 피드백을 모읍니다.
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import os
+import random
+import time
+
+import numpy as np
+
+from services.feedback import FeedbackStore, Sample
+from services.menu_catalog import COLD, MILD, WARM, MenuCatalog, MenuItem, temperature_band
+from services.metrics import RANKER_DECISIONS, RECOMMENDATIONS
+
+logger = logging.getLogger(__name__)
+
+BANDS = (WARM, COLD, MILD)
+ANY_FOOD = "상관없음"
+OTHER = "기타"
+
+# 랭킹 조건 (온도 구분, 기분, 음식 종류)
+Context = Tuple[str, str, str]
+
+
+def ranking_context(weather: Dict, preferences: Optional[Dict]) -> Context:
+    """날씨·선호도 → 랭킹 조건 (규칙 기반 후보 선택과 같은 구분)"""
+    band = temperature_band(weather.get("temperature", 20), weather.get("precipitation", "없음"))
+    preferences = preferences or {}
+    return band, preferences.get("mood") or "평범한", preferences.get("food_type") or ANY_FOOD
+
+
+class MenuRanker:
+    """메뉴 점수 모델과 조건별 순위표"""
+
+    def __init__(self, catalog: MenuCatalog, l2: Optional[float] = None, learning_rate: Optional[float] = None):
+        self.catalog = catalog
+        self.menus: List[str] = catalog.names()
+        self.menu_index = {name: i for i, name in enumerate(self.menus)}
+        self.moods: List[str] = list(catalog.by_mood) + [OTHER]
+        self.foods: List[str] = list(catalog.categories) + [ANY_FOOD, OTHER]
+        self.l2 = l2 if l2 is not None else float(os.getenv("RANKER_L2", "0.01"))
+        self.learning_rate = learning_rate if learning_rate is not None else float(os.getenv("RANKER_LEARNING_RATE", "0.5"))
+        n = len(self.menus)
+        self.weights = {
+            "global": np.zeros(1),
+            "bias": np.zeros(n),
+            "band": np.zeros((n, len(BANDS))),
+            "mood": np.zeros((n, len(self.moods))),
+            "food": np.zeros((n, len(self.foods))),
+        }
+        # Adagrad 누적 제곱 기울기 (드문 조건의 가중치는 크게, 자주 본 조건은 작게 갱신)
+        self._squared = {name: np.full_like(w, 1e-8) for name, w in self.weights.items()}
+        # 조건 → [(메뉴, 확률)] 확률 내림차순, (조건, 메뉴)별 학습 표본 수, 조건별 평균 수락률
+        self.tables: Dict[Context, List[Tuple[MenuItem, float]]] = {}
+        self.support: Counter = Counter()
+        self.base_rates: Dict[Context, float] = {}
+        self.samples = 0
+        self.version = 0
+
+    def _mood(self, mood: str) -> int:
+        return self.moods.index(mood) if mood in self.moods else len(self.moods) - 1
+
+    def _food(self, food: str) -> int:
+        return self.foods.index(food) if food in self.foods else len(self.foods) - 1
+
+    def context_key(self, context: Context) -> Context:
+        """점수표·피드백 수의 조건 키 (모르는 기분·음식 종류는 기타)"""
+        band, mood, food = context
+        return band, self.moods[self._mood(mood)], self.foods[self._food(food)]
+
+    def encode(self, samples: Sequence[Sample]) -> Tuple[np.ndarray, ...]:
+        """표본 → (메뉴, 온도 구분, 기분, 음식 종류, 레이블) 인덱스 배열 (카탈로그에 없는 메뉴는 제외)"""
+        rows = [
+            (self.menu_index[s.menu], BANDS.index(s.band), self._mood(s.mood), self._food(s.food_type), s.label)
+            for s in samples if s.menu in self.menu_index and s.band in BANDS
+        ]
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty, empty, np.zeros(0)
+        array = np.array(rows, dtype=np.int64)
+        return array[:, 0], array[:, 1], array[:, 2], array[:, 3], array[:, 4].astype(np.float64)
+
+    def predict(self, d: np.ndarray, b: np.ndarray, m: np.ndarray, f: np.ndarray) -> np.ndarray:
+        w = self.weights
+        logits = w["global"][0] + w["bias"][d] + w["band"][d, b] + w["mood"][d, m] + w["food"][d, f]
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def fit(self, samples: Sequence[Sample], epochs: int = 50) -> float:
+        """현재 가중치에서 이어서 전체 배치 Adagrad로 학습하고 로그 손실 반환"""
+        d, b, m, f, y = self.encode(samples)
+        if not len(y):
+            return float("nan")
+        w = self.weights
+        for _ in range(epochs):
+            error = (self.predict(d, b, m, f) - y) / len(y)
+            grads = {name: self.l2 * weights for name, weights in w.items()}
+            grads["global"] = grads["global"] + error.sum()
+            np.add.at(grads["bias"], d, error)
+            np.add.at(grads["band"], (d, b), error)
+            np.add.at(grads["mood"], (d, m), error)
+            np.add.at(grads["food"], (d, f), error)
+            for name, grad in grads.items():
+                self._squared[name] += grad * grad
+                w[name] -= self.learning_rate * grad / np.sqrt(self._squared[name])
+        p = np.clip(self.predict(d, b, m, f), 1e-7, 1 - 1e-7)
+        self.samples = len(y)
+        # 학습에 쓴 표본만 (카탈로그에 없는 메뉴의 피드백은 어떤 메뉴 가중치도 학습시키지 않음)
+        support: Counter = Counter()
+        totals: Counter = Counter()
+        accepted: Counter = Counter()
+        for menu, band, mood, food, label in zip(d.tolist(), b.tolist(), m.tolist(), f.tolist(), y.tolist()):
+            context = (BANDS[band], self.moods[mood], self.foods[food])
+            support[(context, self.menus[menu])] += 1
+            totals[context] += 1
+            accepted[context] += label
+        self.support = support
+        self.base_rates = {context: accepted[context] / count for context, count in totals.items()}
+        return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+    def build_tables(self):
+        """모든 (온도 구분, 기분, 음식 종류) 조합의 후보 순위표 계산"""
+        tables = {}
+        for band in BANDS:
+            for mood in self.moods:
+                for food in self.foods:
+                    if food == OTHER:
+                        continue
+                    categories = None if food == ANY_FOOD else (food,)
+                    candidates = [
+                        item for item in self.catalog.select(categories, band, None if mood == OTHER else mood)
+                        if item.name in self.menu_index
+                    ]
+                    if not candidates:
+                        continue
+                    d = np.array([self.menu_index[item.name] for item in candidates])
+                    probs = self.predict(
+                        d, np.full(len(d), BANDS.index(band)), np.full(len(d), self._mood(mood)), np.full(len(d), self._food(food))
+                    )
+                    order = np.argsort(-probs, kind="stable")
+                    tables[(band, mood, food)] = [(candidates[i], float(probs[i])) for i in order]
+        self.tables = tables
+        self.version += 1
+
+    def ranked(self, context: Context) -> Optional[List[Tuple[MenuItem, float]]]:
+        band, mood, food = context
+        table = self.tables.get(context)
+        if table is None:
+            table = self.tables.get((band, mood if mood in self.moods else OTHER, food))
+        return table
+
+    def supported(self, context: Context, min_support: int) -> List[Tuple[MenuItem, float]]:
+        """순위표 중 이 조건에서 학습 표본이 min_support개 이상인 메뉴만 (확률 내림차순)"""
+        key = self.context_key(context)
+        return [
+            (item, prob) for item, prob in self.ranked(context) or []
+            if self.support[(key, item.name)] >= min_support
+        ]
+
+    def base_rate(self, context: Context) -> Optional[float]:
+        """이 조건의 학습 표본 평균 수락률 (표본이 없으면 None)"""
+        return self.base_rates.get(self.context_key(context))
+
+
+class RankingPolicy:
+    """랭킹 모델로 응답할지, LLM으로 넘길지 결정하고 모델을 주기적으로 다시 학습"""
+
+    def __init__(self, catalog: MenuCatalog, store: FeedbackStore):
+        self.enabled = os.getenv("RANKER_ENABLED", "true").lower() == "true"
+        self.min_confidence = float(os.getenv("RANKER_MIN_CONFIDENCE", "0.6"))
+        self.min_support = int(os.getenv("RANKER_MIN_SUPPORT", "20"))
+        self.min_lift = float(os.getenv("RANKER_MIN_LIFT", "0.1"))
+        self.exploration_rate = float(os.getenv("RANKER_EXPLORATION_RATE", "0.1"))
+        self.top_k = int(os.getenv("RANKER_TOP_K", "3"))
+        self.train_interval = float(os.getenv("RANKER_TRAIN_INTERVAL", "60"))
+        self.max_samples = int(os.getenv("RANKER_MAX_SAMPLES", "100000"))
+        self.epochs = int(os.getenv("RANKER_EPOCHS", "50"))
+        self.catalog = catalog
+        self.store = store
+        self.model = MenuRanker(catalog)
+        self.model.build_tables()
+        self._trained_event_id = 0
+        self._task: Optional[asyncio.Task] = None
+        self.last_training: Dict = {}
+
+    def decide(self, context: Context) -> Optional[List[Tuple[MenuItem, float]]]:
+        """모델로 응답할 때 후보 상위 top_k [(메뉴, 확률)], LLM·규칙 기반으로 넘길 때 None"""
+        if not self.enabled:
+            return None
+        table = self.model.ranked(context)
+        if not table:
+            RANKER_DECISIONS.inc("no_candidates")
+            return None
+        supported = self.model.supported(context, self.min_support)
+        if not supported:
+            RANKER_DECISIONS.inc("low_support")
+            return None
+        if not self.confident(context, supported[0][1]):
+            RANKER_DECISIONS.inc("low_confidence")
+            return None
+        if random.random() < self.exploration_rate:
+            RANKER_DECISIONS.inc("explore")
+            return None
+        RANKER_DECISIONS.inc("model")
+        return supported[:self.top_k]
+
+    def confident(self, context: Context, prob: float) -> bool:
+        """1위 확률이 기준 이상이고 그 조건의 평균 수락률보다 min_lift 이상 높은지"""
+        base_rate = self.model.base_rate(context)
+        return base_rate is not None and prob >= self.min_confidence and prob - base_rate >= self.min_lift
+
+    def choose(self, ranked: List[Tuple[MenuItem, float]]) -> Tuple[MenuItem, float]:
+        """상위 후보 중 확률에 비례해 하나 선택 (같은 조건이어도 매번 같은 메뉴만 나오지 않도록)"""
+        return random.choices(ranked, weights=[p for _, p in ranked])[0]
+
+    def train(self) -> Dict:
+        """새 피드백이 있으면 이어서 학습하고 점수표 교체 (CPU 작업, 스레드에서 호출)"""
+        last_event_id = self.store.last_event_id()
+        if last_event_id == self._trained_event_id:
+            return self.last_training
+        started = time.perf_counter()
+        samples = self.store.samples(self.max_samples)
+        loss = self.model.fit(samples, self.epochs)
+        self.model.build_tables()
+        self._trained_event_id = last_event_id
+        self.last_training = {
+            "trained_at": time.time(),
+            "samples": len(samples),
+            "log_loss": round(loss, 4) if loss == loss else None,
+            "seconds": round(time.perf_counter() - started, 4),
+            "version": self.model.version,
+        }
+        return self.last_training
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # 시작 직후 쌓인 피드백으로 한 번 학습하고, 이후 주기적으로 새 피드백만 확인
+        while True:
+            try:
+                await asyncio.to_thread(self.train)
+            except Exception:
+                logger.exception("랭킹 모델 학습 오류")
+            await asyncio.sleep(self.train_interval)
+
+    def stats(self) -> Dict:
+        sources = {source: count for (source,), count in sorted(RECOMMENDATIONS.values.items())}
+        total = sum(sources.values())
+        return {
+            "enabled": self.enabled,
+            "min_confidence": self.min_confidence,
+            "min_support": self.min_support,
+            "min_lift": self.min_lift,
+            "exploration_rate": self.exploration_rate,
+            "last_training": self.last_training,
+            "contexts": len(self.model.tables),
+            "decisions": {result: count for (result,), count in sorted(RANKER_DECISIONS.values.items())},
+            "sources": sources,
+            # LLM을 부르지 않은 추천 비율 (llm_cache는 이전 LLM 답변 재사용)
+            "without_llm_ratio": round(1 - sources.get("llm", 0) / total, 4) if total else None,
+        }
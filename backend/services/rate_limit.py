@@ -0,0 +1,113 @@
+from typing import Dict, Optional
+import asyncio
+import logging
+import time
+
+from services.shared_store import SharedStore, SharedStoreError, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """비동기 토큰 버킷 (초당 rate개 충전, 최대 burst개 보관)
+
+    외부 API 호출 한도(예: 공공데이터포털 일일/초당 트래픽)를 넘지 않도록
+    호출 전에 acquire()로 토큰을 얻습니다.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waited = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 있으면 바로 가져가고 True, 없으면 False"""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            self.acquired += 1
+            return True
+        return False
+
+    def retry_after(self, tokens: float = 1.0) -> float:
+        """토큰 tokens개가 모일 때까지 남은 시간(초)"""
+        self._refill()
+        return max(0.0, (tokens - self._tokens) / self.rate)
+
+    async def acquire(self, tokens: float = 1.0):
+        """토큰이 생길 때까지 대기 (대기자는 도착 순서대로)"""
+        async with self._lock:
+            start = time.monotonic()
+            while not self.try_acquire(tokens):
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+            self.waited += time.monotonic() - start
+
+    def stats(self) -> Dict:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "available": round(self._tokens, 2),
+            "acquired": self.acquired,
+            "waited_seconds": round(self.waited, 3),
+        }
+
+
+class SharedTokenBucket:
+    """여러 워커가 함께 쓰는 토큰 버킷 (공유 저장소에서 계산, TokenBucket과 같은 acquire/stats)
+
+    저장소에 연결할 수 없으면 프로세스 내 버킷으로 대신 제한합니다.
+    """
+
+    def __init__(self, store: SharedStore, name: str, rate: float, burst: float = 1.0):
+        self.store = store
+        self.name = name
+        self.local = TokenBucket(rate, burst)
+        self.rate = rate
+        self.burst = self.local.burst
+        self.acquired = 0
+        self.waited = 0.0
+        self.fallbacks = 0
+
+    async def acquire(self, tokens: float = 1.0):
+        start = time.monotonic()
+        try:
+            while True:
+                wait = await self.store.take(self.name, self.rate, self.burst, tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+        except SharedStoreError:
+            self.fallbacks += 1
+            await self.local.acquire(tokens)
+        self.acquired += 1
+        self.waited += time.monotonic() - start
+
+    def stats(self) -> Dict:
+        return {
+            "shared": self.name,
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "waited_seconds": round(self.waited, 3),
+            "fallbacks": self.fallbacks,
+        }
+
+
+def create_rate_limiter(name: str, rate: float, burst: float = 1.0) -> Optional[TokenBucket]:
+    """초당 rate개 제한 (공유 저장소가 있으면 워커 전체 합산). rate가 0 이하이면 제한 없음(None)"""
+    if rate <= 0:
+        return None
+    store = get_shared_store()
+    if store is not None:
+        return SharedTokenBucket(store, name, rate, burst)
+    return TokenBucket(rate, burst)
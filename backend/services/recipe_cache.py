@@ -0,0 +1,135 @@
+from fractions import Fraction
+from typing import Dict, Optional
+import copy
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+
+from services.cache import TTLCache
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "recipe_cache.sqlite3")
+
+# "1 1/2", "1/2", "1.5", "200" 형태의 수량 (범위 "2~3"은 각각 변환)
+NUMBER_PATTERN = re.compile(r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?")
+
+# 사람이 읽기 쉬운 분수로 표기할 값
+COMMON_FRACTIONS = [Fraction(1, 4), Fraction(1, 3), Fraction(1, 2), Fraction(2, 3), Fraction(3, 4)]
+
+
+def normalize_menu_name(menu_name: str) -> str:
+    """캐시 키용 메뉴명 정규화 (유니코드 정규화, 공백 제거, 소문자)"""
+    return "".join(unicodedata.normalize("NFC", menu_name).split()).lower()
+
+
+def _format_quantity(value: Fraction) -> str:
+    if value.denominator == 1:
+        return str(value.numerator)
+    whole, rest = divmod(value, 1)
+    for fraction in COMMON_FRACTIONS:
+        if abs(rest - fraction) < Fraction(1, 50):
+            return f"{whole} {fraction}" if whole else str(fraction)
+    return f"{float(value):.1f}".rstrip("0").rstrip(".")
+
+
+def scale_amount(amount: str, factor: float) -> str:
+    """재료 분량 문자열의 숫자에 factor를 곱함 ("약간" 등 숫자가 없으면 그대로)"""
+    if factor == 1 or not isinstance(amount, str):
+        return amount
+    factor = Fraction(factor).limit_denominator(100)
+
+    def repl(match: re.Match) -> str:
+        value = sum(Fraction(part) for part in match.group().split())
+        return _format_quantity(value * factor)
+
+    return NUMBER_PATTERN.sub(repl, amount)
+
+
+def scale_recipe(recipe: Dict, num_servings: int) -> Dict:
+    """저장된 레시피를 num_servings 인분으로 환산한 복사본 반환"""
+    base_servings = recipe.get("servings") or 1
+    try:
+        factor = num_servings / float(base_servings)
+    except (TypeError, ValueError):
+        factor = num_servings
+
+    scaled = copy.deepcopy(recipe)
+    scaled["servings"] = num_servings
+    for ingredient in scaled.get("ingredients", []):
+        if isinstance(ingredient, dict) and "amount" in ingredient:
+            ingredient["amount"] = scale_amount(ingredient["amount"], factor)
+    return scaled
+
+
+class RecipeCache:
+    """메뉴명 기준 2단계 레시피 캐시 (메모리 LRU + SQLite 파일)
+
+    1인분 기준 레시피를 저장하고, 요청 인분 수로는 scale_recipe()로 환산합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, maxsize: Optional[int] = None):
+        self.path = path or os.getenv("RECIPE_CACHE_PATH", DEFAULT_PATH)
+        self.memory = TTLCache(maxsize=maxsize or int(os.getenv("RECIPE_CACHE_SIZE", "256")))
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS recipes ("
+            " menu_key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, menu_name: str) -> Optional[Dict]:
+        """저장된 기준 레시피 (없으면 None)"""
+        key = normalize_menu_name(menu_name)
+        recipe = self.memory.get(key)
+        if recipe is not None:
+            self.memory_hits += 1
+            return recipe
+
+        row = self._db.execute("SELECT payload FROM recipes WHERE menu_key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        recipe = json.loads(row[0])
+        self.memory.set(key, recipe)
+        self.disk_hits += 1
+        return recipe
+
+    def put(self, menu_name: str, recipe: Dict):
+        key = normalize_menu_name(menu_name)
+        self.memory.set(key, recipe)
+        self._db.execute(
+            "INSERT OR REPLACE INTO recipes (menu_key, payload, created_at) VALUES (?, ?, ?)",
+            (key, json.dumps(recipe, ensure_ascii=False), time.time())
+        )
+        self._db.commit()
+
+    def __contains__(self, menu_name: str) -> bool:
+        key = normalize_menu_name(menu_name)
+        if key in self.memory:
+            return True
+        return self._db.execute("SELECT 1 FROM recipes WHERE menu_key = ?", (key,)).fetchone() is not None
+
+    def stats(self) -> Dict:
+        stored = self._db.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+        return {
+            "memory_size": len(self.memory),
+            "stored": stored,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        self._db.close()
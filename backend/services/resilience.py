@@ -0,0 +1,211 @@
+"""외부 호출 보호: 지연 시간 추적, 헤징(hedged request), 서킷 브레이커"""
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+import asyncio
+import os
+import time
+
+from services.metrics import REGISTRY, Counter
+
+T = TypeVar("T")
+
+# 브레이커 상태 (메트릭 값)
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_TRANSITIONS = Counter(
+    "lunch_circuit_breaker_transitions_total", "서킷 브레이커 상태 전환 횟수", ("breaker", "state")
+)
+HEDGES = Counter("lunch_hedged_requests_total", "헤징 요청 수 (outcome: 먼저 끝난 쪽)", ("purpose", "outcome"))
+
+# 이름 → 브레이커 (메트릭 출력용, 같은 이름은 마지막에 만든 것)
+BREAKERS: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않음"""
+
+
+class LatencyTracker:
+    """최근 성공 호출 지연 시간 (목적별 고정 크기 창)"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def add(self, key: str, seconds: float):
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def quantile(self, key: str, q: float, min_samples: int = 20) -> Optional[float]:
+        """표본이 min_samples개 미만이면 None"""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict:
+        return {
+            key: {
+                "samples": len(samples),
+                "p50": self.quantile(key, 0.5, 1),
+                "p95": self.quantile(key, 0.95, 1),
+            }
+            for key, samples in self._samples.items()
+        }
+
+
+class CircuitBreaker:
+    """최근 호출의 오류·느린 호출 비율로 여닫는 서킷 브레이커
+
+    최근 window개 호출 중 min_calls개 이상이 기록되었고 오류 비율이나 느린 호출 비율이
+    임계값을 넘으면 열립니다. open_seconds가 지나면 반열림(half_open)으로 바뀌어
+    시험 호출을 half_open_calls개까지 허용하고, 모두 성공하면 닫히고 하나라도 실패하면 다시 열립니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: Optional[int] = None,
+        min_calls: Optional[int] = None,
+        failure_ratio: Optional[float] = None,
+        slow_ratio: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        half_open_calls: int = 1
+    ):
+        self.name = name
+        self.window = window or int(os.getenv("BREAKER_WINDOW", "20"))
+        self.min_calls = min_calls or int(os.getenv("BREAKER_MIN_CALLS", "10"))
+        self.failure_ratio = failure_ratio or float(os.getenv("BREAKER_FAILURE_RATIO", "0.5"))
+        self.slow_ratio = slow_ratio or float(os.getenv("BREAKER_SLOW_RATIO", "0.8"))
+        self.open_seconds = open_seconds or float(os.getenv("BREAKER_OPEN_SECONDS", "30"))
+        self.half_open_calls = half_open_calls
+
+        self.state = CLOSED
+        self._calls: Deque[Tuple[bool, bool]] = deque(maxlen=self.window)  # (실패, 느림)
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_successes = 0
+        self.rejected = 0
+        BREAKERS[name] = self
+
+    def _transition(self, state: str):
+        self.state = state
+        BREAKER_TRANSITIONS.inc(self.name, state)
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == HALF_OPEN:
+            self._trials = 0
+            self._trial_successes = 0
+        else:
+            self._calls.clear()
+
+    def _refresh(self):
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    def allow(self) -> bool:
+        """지금 호출해도 되는지 (반열림에서는 시험 호출 수만큼 허용)"""
+        self._refresh()
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and self._trials < self.half_open_calls:
+            self._trials += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """결과 없이 끝난 호출(취소 등)의 시험 호출 자리 반환"""
+        if self.state == HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def record(self, success: bool, slow: bool = False):
+        """호출 결과 기록 (느린 성공은 slow=True)"""
+        if self.state == HALF_OPEN:
+            if not success or slow:
+                self._transition(OPEN)
+            else:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._transition(CLOSED)
+            return
+        if self.state == OPEN:
+            return
+
+        self._calls.append((not success, slow))
+        if len(self._calls) < self.min_calls:
+            return
+        failures = sum(1 for failed, _ in self._calls if failed)
+        slows = sum(1 for _, is_slow in self._calls if is_slow)
+        if failures / len(self._calls) >= self.failure_ratio or slows / len(self._calls) >= self.slow_ratio:
+            self._transition(OPEN)
+
+    def stats(self) -> Dict:
+        self._refresh()
+        return {
+            "state": self.state,
+            "recent_calls": len(self._calls),
+            "recent_failures": sum(1 for failed, _ in self._calls if failed),
+            "recent_slow": sum(1 for _, is_slow in self._calls if is_slow),
+            "rejected": self.rejected,
+        }
+
+
+def _collect_breakers():
+    yield "lunch_circuit_breaker_state", "gauge", "서킷 브레이커 상태 (0 닫힘, 1 반열림, 2 열림)", [
+        ({"breaker": name}, STATE_VALUES[breaker.state]) for name, breaker in BREAKERS.items()
+    ]
+
+
+REGISTRY.register_collector(_collect_breakers)
+
+
+async def hedged(
+    attempt: Callable[[], Awaitable[T]],
+    hedge_after: Optional[float],
+    timeout: float,
+    purpose: str = "call"
+) -> T:
+    """attempt를 실행하고 hedge_after초 안에 끝나지 않으면(또는 먼저 실패하면) 한 번 더 실행해
+    먼저 성공한 결과를 반환합니다. 전체 시간 제한은 timeout초이며, 남은 시도는 취소합니다.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    hedge_at = None if hedge_after is None else loop.time() + hedge_after
+    hedge_started = False
+    pending = {asyncio.ensure_future(attempt()): "primary"}
+    last_error: Optional[BaseException] = None
+
+    try:
+        while True:
+            now = loop.time()
+            if now >= deadline:
+                raise asyncio.TimeoutError()
+            can_hedge = hedge_at is not None and not hedge_started
+            wake = min(deadline, hedge_at) if can_hedge else deadline
+            done, _ = await asyncio.wait(pending, timeout=max(0.0, wake - now), return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                role = pending.pop(task)
+                if task.exception() is None:
+                    if hedge_started:
+                        HEDGES.inc(purpose, f"{role}_won")
+                    return task.result()
+                last_error = task.exception()
+
+            # 첫 시도가 실패했거나 헤징 시각이 지나면 예비 요청 시작 (한 번만)
+            if can_hedge and (not pending or loop.time() >= hedge_at):
+                hedge_started = True
+                HEDGES.inc(purpose, "started")
+                pending[asyncio.ensure_future(attempt())] = "hedge"
+            elif not pending:
+                raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,191 @@
+from typing import Dict, List, Optional
+import json
+import logging
+import os
+import random
+
+from services.cache import TTLCache
+from services.menu_catalog import temperature_band
+from services.shared_store import SharedStore, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+
+def weather_bucket(weather: Dict) -> str:
+    """날씨를 양자화한 구분 (규칙 기반 추천과 같은 온도 구분, 하늘 상태, 강수 형태)"""
+    temp = weather.get("temperature")
+    precipitation = weather.get("precipitation") or "없음"
+    band = temperature_band(temp if temp is not None else 20, precipitation)
+    return "|".join([band, weather.get("sky_condition") or "", precipitation])
+
+
+def people_bucket(num_people: Optional[int]) -> str:
+    """인원 구분: 1명/2~4명/5명 이상"""
+    num_people = num_people or 1
+    return "1" if num_people <= 1 else "2-4" if num_people <= 4 else "5+"
+
+
+def recommendation_key(weather: Dict, preferences: Optional[Dict]) -> str:
+    """추천 입력을 양자화한 캐시 키
+
+    기온은 규칙 기반 추천과 같은 구간(10°C/25°C 기준 온도 구분)으로, 인원은 1명/2~4명/5명 이상으로 묶습니다.
+    """
+    preferences = preferences or {}
+    moods = ",".join(sorted(set(preferences.get("moods") or [])))
+
+    return "|".join([
+        weather_bucket(weather),
+        preferences.get("food_type") or "상관없음",
+        preferences.get("mood") or "평범한",
+        people_bucket(preferences.get("num_people")),
+        moods,
+    ])
+
+
+class MemoryPoolBackend:
+    """프로세스 내 응답 풀 저장소 (키 단위 TTL, 키 개수 LRU 제한)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.ttl = ttl
+        self._pools = TTLCache(maxsize=maxsize)
+
+    async def get_pool(self, key: str) -> List[Dict]:
+        return self._pools.get(key) or []
+
+    async def add(self, key: str, answer: Dict, pool_size: int):
+        pool = self._pools.get(key)
+        if pool is None:
+            # 풀의 TTL은 첫 답변 시점부터
+            self._pools.set(key, [answer], ttl=self.ttl)
+        elif len(pool) < pool_size:
+            pool.append(answer)
+
+    def size(self) -> Optional[int]:
+        return len(self._pools)
+
+
+class RedisPoolBackend:
+    """Redis 호환 서버 응답 풀 저장소 (리스트 + EXPIRE, 크기 제한은 서버 maxmemory 정책)"""
+
+    PREFIX = "lunch:recommend:"
+
+    def __init__(self, url: str, ttl: float):
+        import redis.asyncio as redis
+        self.ttl = int(ttl)
+        self._redis = redis.from_url(url, decode_responses=True)
+
+    async def get_pool(self, key: str) -> List[Dict]:
+        values = await self._redis.lrange(self.PREFIX + key, 0, -1)
+        return [json.loads(value) for value in values]
+
+    async def add(self, key: str, answer: Dict, pool_size: int):
+        name = self.PREFIX + key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(name, json.dumps(answer, ensure_ascii=False))
+            pipe.ltrim(name, 0, pool_size - 1)
+            pipe.ttl(name)
+            _, _, ttl = await pipe.execute()
+        if ttl < 0:
+            # 풀의 TTL은 첫 답변 시점부터
+            await self._redis.expire(name, self.ttl)
+
+    def size(self) -> Optional[int]:
+        # 키 개수는 서버 쪽에서 확인 (SCAN 비용 회피)
+        return None
+
+
+class SharedPoolBackend:
+    """워커 공유 저장소 응답 풀 (serve.py로 여러 워커를 띄울 때)"""
+
+    PREFIX = "recommend:"
+
+    def __init__(self, store: SharedStore, ttl: float):
+        self.ttl = ttl
+        self._store = store
+
+    async def get_pool(self, key: str) -> List[Dict]:
+        return await self._store.pool_get(self.PREFIX + key)
+
+    async def add(self, key: str, answer: Dict, pool_size: int):
+        await self._store.pool_add(self.PREFIX + key, answer, pool_size, self.ttl)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class RecommendationCache:
+    """양자화된 추천 입력별로 LLM 답변 풀을 모아 두고 무작위로 꺼내 쓰는 캐시
+
+    풀에 pool_size개가 모이기 전까지는 LLM을 호출해 답변을 채우고,
+    다 모인 뒤에는 풀에서 무작위로 골라 응답합니다 (다양성 유지).
+    """
+
+    def __init__(self, backend=None, pool_size: Optional[int] = None):
+        self.pool_size = pool_size or int(os.getenv("RECOMMEND_CACHE_POOL_SIZE", "3"))
+        self.backend = backend or self._create_backend()
+        self.hits = 0
+        self.misses = 0
+        self.degraded_hits = 0
+        self.errors = 0
+
+    def _create_backend(self):
+        ttl = float(os.getenv("RECOMMEND_CACHE_TTL", "3600"))
+        backend = os.getenv("RECOMMEND_CACHE_BACKEND", "memory")
+        if backend == "shared":
+            store = get_shared_store()
+            if store is not None:
+                return SharedPoolBackend(store, ttl)
+            logger.warning("SHARED_STORE_ADDRESS가 없어 메모리 추천 캐시를 사용합니다.")
+        if backend == "redis":
+            try:
+                return RedisPoolBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"), ttl)
+            except ImportError:
+                logger.warning("redis 패키지가 없어 메모리 추천 캐시를 사용합니다.")
+        return MemoryPoolBackend(int(os.getenv("RECOMMEND_CACHE_SIZE", "4096")), ttl)
+
+    async def lookup(self, key: str) -> Optional[Dict]:
+        """풀이 다 찼으면 그중 하나(복사본), 아니면 None"""
+        try:
+            pool = await self.backend.get_pool(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("추천 캐시 조회 오류: %s", e)
+            return None
+
+        if len(pool) >= self.pool_size:
+            self.hits += 1
+            return dict(random.choice(pool))
+        self.misses += 1
+        return None
+
+    async def lookup_any(self, key: str) -> Optional[Dict]:
+        """풀이 다 차지 않았어도 모인 답변 중 하나 (LLM 호출 실패 시 대체용)"""
+        try:
+            pool = await self.backend.get_pool(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("추천 캐시 조회 오류: %s", e)
+            return None
+
+        if not pool:
+            return None
+        self.degraded_hits += 1
+        return dict(random.choice(pool))
+
+    async def add(self, key: str, answer: Dict):
+        try:
+            await self.backend.add(key, answer, self.pool_size)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("추천 캐시 저장 오류: %s", e)
+
+    def stats(self) -> Dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "keys": self.backend.size(),
+            "pool_size": self.pool_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "degraded_hits": self.degraded_hits,
+            "errors": self.errors,
+        }
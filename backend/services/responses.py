@@ -0,0 +1,47 @@
+"""응답 직렬화(orjson)와 압축(gzip, brotli)
+
+orjson, brotli-asgi는 선택 의존성입니다. 설치되어 있지 않으면 표준 JSONResponse와 gzip을 사용합니다.
+"""
+from typing import Iterable, Optional
+import os
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import orjson  # noqa: F401
+    DefaultJSONResponse = ORJSONResponse
+except ImportError:
+    DefaultJSONResponse = JSONResponse
+
+# 조각마다 바로 보내야 하는 스트리밍(SSE) 경로는 압축하지 않음
+STREAMING_PATHS = ("/api/recipe/stream",)
+
+
+class CompressionMiddleware:
+    """Accept-Encoding에 따라 br(brotli-asgi 설치 시) 또는 gzip으로 응답 압축
+
+    minimum_size(바이트, 기본 COMPRESSION_MIN_SIZE)보다 작은 응답과 exclude_paths는 그대로 보냅니다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: Optional[int] = None,
+        exclude_paths: Iterable[str] = STREAMING_PATHS
+    ):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+        minimum_size = minimum_size or int(os.getenv("COMPRESSION_MIN_SIZE", "500"))
+        try:
+            from brotli_asgi import BrotliMiddleware
+            self.compressed = BrotliMiddleware(app, minimum_size=minimum_size, gzip_fallback=True)
+        except ImportError:
+            self.compressed = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"] not in self.exclude_paths:
+            await self.compressed(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
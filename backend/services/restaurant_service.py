@@ -0,0 +1,272 @@
+"""음식점 검색 (카카오 로컬 키워드 검색 API 프록시)
+
+검색 결과는 (메뉴, geohash 셀) 단위로 캐시합니다. 셀 중심에서 요청 반경 + 셀 반경만큼 검색해 두므로
+같은 셀의 사용자는 같은 결과를 쓰고, 주변 셀의 결과가 요청 원을 완전히 덮으면 그 결과도 재사용합니다.
+응답은 요청 위치 기준 거리순으로 정렬해 페이지 단위로 나눕니다.
+"""
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import math
+import os
+
+import httpx
+import numpy as np
+
+from services import geohash
+from services.area_index import load_area_index
+from services.cache import SingleFlight, TTLCache
+from services.config import Settings, get_settings
+from services.http_client import create_http_client, request_with_retry
+from services.metrics import UPSTREAM_ERRORS, span
+from services.rate_limit import create_rate_limiter
+from services.recipe_cache import normalize_menu_name
+from services.shared_store import SharedStoreError, get_shared_store
+
+logger = logging.getLogger(__name__)
+
+# 카카오 키워드 검색: 페이지당 최대 15건, 최대 45건(3페이지), 반경 최대 20km
+KAKAO_PAGE_SIZE = 15
+KAKAO_MAX_RADIUS = 20000
+# 음식점 카테고리 그룹 코드
+FOOD_CATEGORY = "FD6"
+
+
+class RestaurantSearchError(Exception):
+    """카카오 API를 쓸 수 없거나 검색에 실패한 경우"""
+
+
+class PlaceSet:
+    """한 번의 검색 결과 (검색 중심, 검색 반경, 빠짐없이 포함된 반경, 장소 목록)
+
+    결과가 최대 건수에서 잘렸으면 covered는 가장 먼 장소까지의 거리입니다 (그 안쪽은 빠짐없음).
+    """
+
+    def __init__(self, lat: float, lon: float, radius: float, covered: float, places: List[Dict]):
+        self.lat = lat
+        self.lon = lon
+        self.radius = radius
+        self.covered = covered
+        self.places = places
+        self.coords = np.array([(p["lat"], p["lon"]) for p in places], dtype=np.float64).reshape(-1, 2)
+
+    def covers(self, lat: float, lon: float, radius: float) -> bool:
+        """(lat, lon) 중심 radius 원 안의 장소가 모두 들어 있는지"""
+        return geohash.distance(self.lat, self.lon, lat, lon) + radius <= self.covered
+
+    def nearest(self, lat: float, lon: float, radius: float) -> List[Dict]:
+        """radius 안의 장소를 (lat, lon)에서 가까운 순서로 (distance 필드 추가)"""
+        if not self.places:
+            return []
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(self.coords[:, 0]), np.radians(self.coords[:, 1])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        distances = 2 * geohash.EARTH_RADIUS * np.arcsin(np.sqrt(a))
+        inside = np.flatnonzero(distances <= radius)
+        order = inside[np.argsort(distances[inside], kind="stable")]
+        return [dict(self.places[i], distance=int(round(distances[i]))) for i in order]
+
+    def to_dict(self) -> Dict:
+        return {"lat": self.lat, "lon": self.lon, "radius": self.radius, "covered": self.covered, "places": self.places}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PlaceSet":
+        return cls(data["lat"], data["lon"], data["radius"], data["covered"], data["places"])
+
+
+def _place(document: Dict) -> Dict:
+    """카카오 검색 결과 한 건 → 응답용 장소"""
+    return {
+        "id": document.get("id"),
+        "name": document.get("place_name"),
+        "category": document.get("category_name"),
+        "phone": document.get("phone"),
+        "address": document.get("address_name"),
+        "road_address": document.get("road_address_name"),
+        "lat": float(document["y"]),
+        "lon": float(document["x"]),
+        "url": document.get("place_url"),
+    }
+
+
+class RestaurantService:
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        self.api_key = settings.kakao_rest_api_key
+        self.base_url = settings.kakao_api_base_url
+        # 캐시 셀 크기 (geohash 정밀도, 7이면 약 150m 셀)
+        self.precision = int(os.getenv("RESTAURANT_GEOHASH_PRECISION", "7"))
+        # 셀마다 최소 이 반경(m)으로 검색해 둠, 요청 반경 상한
+        self.fetch_radius = float(os.getenv("RESTAURANT_FETCH_RADIUS", "1000"))
+        self.max_radius = float(os.getenv("RESTAURANT_MAX_RADIUS", "5000"))
+        self.max_pages = int(os.getenv("RESTAURANT_MAX_PAGES", "3"))
+        self.ttl = float(os.getenv("RESTAURANT_CACHE_TTL", "21600"))
+        # (메뉴, 셀) → PlaceSet
+        self.cache = TTLCache(maxsize=int(os.getenv("RESTAURANT_CACHE_SIZE", "4096")))
+        self._inflight = SingleFlight()
+        self.store = get_shared_store()
+        # 카카오 API 초당 호출 수 제한 (워커 전체 합산, 0이면 제한 없음)
+        self.rate_limiter = create_rate_limiter(
+            "kakao",
+            rate=float(os.getenv("KAKAO_RATE_PER_SEC", "0")),
+            burst=float(os.getenv("KAKAO_BURST", "10"))
+        )
+        self.area_index = load_area_index()
+        # 공유 HTTP 클라이언트 (main.py lifespan에서 주입, 없으면 처음 사용 시 생성)
+        self.client: Optional[httpx.AsyncClient] = None
+        self.neighbor_hits = 0
+        self.upstream_calls = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = create_http_client()
+        return self.client
+
+    def resolve_location(self, location: str) -> Optional[Tuple[float, float]]:
+        """위치명 → (위도, 경도). 찾지 못하면 None"""
+        area = self.area_index.resolve(location)
+        return (area.lat, area.lon) if area is not None else None
+
+    async def search(
+        self,
+        menu: str,
+        lat: float,
+        lon: float,
+        radius: Optional[float] = None,
+        page: int = 1,
+        size: int = KAKAO_PAGE_SIZE
+    ) -> Dict:
+        """(lat, lon)에서 radius(m) 안의 menu 음식점을 거리순으로 page번째 size건"""
+        if not self.api_key:
+            raise RestaurantSearchError("카카오 API 키가 설정되지 않았습니다.")
+        radius = min(radius or self.fetch_radius, self.max_radius)
+        places = await self._place_set(menu, lat, lon, radius)
+        with span("restaurant.sort"):
+            matches = places.nearest(lat, lon, radius)
+        start = (page - 1) * size
+        return {
+            "menu": menu,
+            "center": {"lat": lat, "lon": lon},
+            "radius": radius,
+            "page": page,
+            "size": size,
+            "total": len(matches),
+            "is_end": start + size >= len(matches),
+            # 카카오 최대 건수에서 잘려 반경 안의 일부만 있는 경우 false
+            "complete": places.covers(lat, lon, radius),
+            "places": matches[start:start + size],
+        }
+
+    async def _place_set(self, menu: str, lat: float, lon: float, radius: float) -> PlaceSet:
+        """캐시(이 셀 → 주변 셀 → 공유 저장소) 또는 카카오 검색으로 요청 원을 포함하는 결과"""
+        menu_key = normalize_menu_name(menu)
+        cell = geohash.encode(lat, lon, self.precision)
+        # 이 셀의 결과는 검색 반경이 충분하면 사용 (잘린 결과여도 더 받을 수 없음)
+        own = self.cache.get((menu_key, cell))
+        if own is not None and own.radius >= radius + geohash.cell_radius(self.precision, lat):
+            return own
+        # 주변 셀 결과는 요청 원을 빠짐없이 덮을 때만 사용 (적중/미스 통계는 이 셀 기준)
+        for neighbor in geohash.neighbors(cell):
+            found = self.cache.lookup((menu_key, neighbor), count=False)
+            if found is not None and found[1] and found[0].covers(lat, lon, radius):
+                self.neighbor_hits += 1
+                return found[0]
+
+        fetch_radius = self._fetch_radius(radius, lat)
+        found = await self._shared_get(menu_key, cell)
+        if found is not None and found.radius >= fetch_radius:
+            self.cache.set((menu_key, cell), found, ttl=self.ttl)
+            return found
+        return await self._inflight.do(
+            (menu_key, cell, fetch_radius),
+            lambda: self._fetch_cell(menu, menu_key, cell, fetch_radius)
+        )
+
+    def _fetch_radius(self, radius: float, lat: float) -> float:
+        """셀 안 어디서든 radius 원을 덮는 검색 반경 (500m 단위 올림, 카카오 상한 이하)"""
+        needed = max(radius, self.fetch_radius) + geohash.cell_radius(self.precision, lat)
+        return float(min(math.ceil(needed / 500) * 500, KAKAO_MAX_RADIUS))
+
+    async def _fetch_cell(self, menu: str, menu_key: str, cell: str, fetch_radius: float) -> PlaceSet:
+        """셀 중심에서 fetch_radius로 검색해 캐시에 저장"""
+        lat, lon = geohash.decode(cell)
+        params = {
+            "query": menu,
+            "x": f"{lon:.6f}",
+            "y": f"{lat:.6f}",
+            "radius": str(int(fetch_radius)),
+            "sort": "distance",
+            "category_group_code": FOOD_CATEGORY,
+            "size": str(KAKAO_PAGE_SIZE),
+        }
+        with span("restaurant.fetch"):
+            first = await self._fetch_page(params, 1)
+            if first is None:
+                raise RestaurantSearchError("음식점 검색에 실패했습니다.")
+            pages = [first]
+            meta = first.get("meta", {})
+            page_count = min(self.max_pages, -(-int(meta.get("pageable_count") or 0) // KAKAO_PAGE_SIZE))
+            if not meta.get("is_end", True) and page_count > 1:
+                pages += await asyncio.gather(*(self._fetch_page(params, page) for page in range(2, page_count + 1)))
+                if any(page is None for page in pages):
+                    raise RestaurantSearchError("음식점 검색에 실패했습니다.")
+
+        places = list({
+            document["id"]: _place(document)
+            for page in pages for document in page.get("documents", [])
+        }.values())
+        complete = bool(pages[-1].get("meta", {}).get("is_end", True))
+        covered = fetch_radius if complete or not places else max(
+            geohash.distance(lat, lon, p["lat"], p["lon"]) for p in places
+        )
+        result = PlaceSet(lat, lon, fetch_radius, covered, places)
+        self.cache.set((menu_key, cell), result, ttl=self.ttl)
+        if self.store is not None:
+            try:
+                await self.store.set(self._shared_key(menu_key, cell), result.to_dict(), ttl=self.ttl)
+            except SharedStoreError:
+                pass
+        return result
+
+    async def _fetch_page(self, params: Dict, page: int) -> Optional[Dict]:
+        """키워드 검색 한 페이지. 실패 시 None"""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        self.upstream_calls += 1
+        try:
+            response = await request_with_retry(
+                self._get_client(),
+                "GET",
+                f"{self.base_url}/v2/local/search/keyword.json",
+                params=dict(params, page=str(page)),
+                headers={"Authorization": f"KakaoAK {self.api_key}"}
+            )
+        except httpx.HTTPError as e:
+            UPSTREAM_ERRORS.inc("kakao", type(e).__name__)
+            logger.warning("카카오 API 오류: %s", e)
+            return None
+        if response.status_code != 200:
+            UPSTREAM_ERRORS.inc("kakao", f"http_{response.status_code}")
+            return None
+        return response.json()
+
+    def _shared_key(self, menu_key: str, cell: str) -> str:
+        return f"restaurant:{menu_key}:{cell}"
+
+    async def _shared_get(self, menu_key: str, cell: str) -> Optional[PlaceSet]:
+        """다른 워커가 저장한 같은 셀의 결과 (없거나 저장소 오류면 None)"""
+        if self.store is None:
+            return None
+        try:
+            data = await self.store.get(self._shared_key(menu_key, cell))
+        except SharedStoreError:
+            return None
+        return PlaceSet.from_dict(data) if data is not None else None
+
+    def stats(self) -> Dict:
+        return dict(
+            self.cache.stats(),
+            neighbor_hits=self.neighbor_hits,
+            upstream_calls=self.upstream_calls,
+            precision=self.precision,
+        )
@@ -0,0 +1,279 @@
+"""여러 워커 프로세스가 함께 쓰는 로컬 키-값 저장소 (유닉스 소켓/TCP, 한 줄 JSON 프로토콜)
+
+serve.py가 저장소 프로세스를 하나 띄우고 SHARED_STORE_ADDRESS로 주소를 워커에 알려 줍니다.
+워커는 예보 캐시, 추천 답변 풀, 외부 API 호출 한도(토큰 버킷), 실시간 그룹 알림(채널)을 이 저장소로 공유합니다.
+주소가 없거나 저장소에 연결할 수 없으면 호출하는 쪽에서 프로세스 내 동작으로 대체합니다.
+
+    python -m services.shared_store unix:/tmp/lunch-store.sock
+"""
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+from services.cache import TTLCache
+from services.metrics import UPSTREAM_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# 한 줄(요청/응답) 최대 크기 (예보 시계열 하나가 수십 KB)
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+class SharedStoreError(Exception):
+    """저장소 연결·응답 오류"""
+
+
+def _parse_address(address: str) -> Tuple[str, Any]:
+    """"unix:/경로" 또는 "호스트:포트" → (종류, 주소)"""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+class SharedStoreServer:
+    """저장소 서버 (단일 이벤트 루프에서 처리하므로 연산마다 원자적)"""
+
+    def __init__(self, maxsize: Optional[int] = None):
+        maxsize = maxsize or int(os.getenv("SHARED_STORE_SIZE", "65536"))
+        self.values = TTLCache(maxsize=maxsize)
+        self.pools = TTLCache(maxsize=maxsize)
+        # 버킷 이름 → [남은 토큰, 마지막 충전 시각]
+        self.buckets: Dict[str, List[float]] = {}
+        # 채널 이름 → 최근 메시지 [(순번, 메시지)] (순번은 저장소 전체에서 증가)
+        self.channels: Dict[str, Deque[Tuple[int, Any]]] = {}
+        self.sequence = 0
+        self.requests = 0
+
+    def op_get(self, key: str) -> Any:
+        return self.values.get(key)
+
+    def op_set(self, key: str, value: Any, expires_at: Optional[float] = None, ttl: Optional[float] = None) -> bool:
+        self.values.set(key, value, expires_at=expires_at, ttl=ttl)
+        return True
+
+    def op_add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """키가 없을 때만 저장 (임대·선출용). 저장했으면 True"""
+        if self.values.get(key) is not None:
+            return False
+        self.values.set(key, value, ttl=ttl)
+        return True
+
+    def op_delete(self, key: str) -> bool:
+        return self.values.pop(key) is not None
+
+    def op_pool_get(self, key: str) -> List:
+        return self.pools.get(key) or []
+
+    def op_pool_add(self, key: str, value: Any, limit: int, ttl: float) -> int:
+        """풀에 limit개까지 추가 (풀의 TTL은 첫 값 저장 시점부터)"""
+        pool = self.pools.get(key)
+        if pool is None:
+            self.pools.set(key, [value], ttl=ttl)
+            return 1
+        if len(pool) < limit:
+            pool.append(value)
+        return len(pool)
+
+    def op_take(self, bucket: str, rate: float, burst: float, tokens: float = 1.0) -> float:
+        """토큰 버킷에서 tokens개를 가져가면 0, 모자라면 기다려야 할 시간(초)"""
+        now = time.monotonic()
+        state = self.buckets.get(bucket)
+        if state is None:
+            state = self.buckets[bucket] = [burst, now]
+        state[0] = min(burst, state[0] + (now - state[1]) * rate)
+        state[1] = now
+        if state[0] >= tokens:
+            state[0] -= tokens
+            return 0.0
+        return (tokens - state[0]) / rate
+
+    def op_publish(self, channel: str, message: Any, limit: int = 1024) -> int:
+        """채널에 메시지 추가 (최근 limit개만 보관). 메시지 순번 반환"""
+        self.sequence += 1
+        log = self.channels.get(channel)
+        if log is None or log.maxlen != limit:
+            log = self.channels[channel] = deque(log or (), maxlen=limit)
+        log.append((self.sequence, message))
+        return self.sequence
+
+    def op_poll(self, channel: str, after: Optional[int] = None) -> Dict:
+        """순번 after 다음 메시지와 현재 순번 (after가 없으면 메시지 없이 현재 순번만)"""
+        log = self.channels.get(channel, ())
+        messages = [message for sequence, message in log if after is not None and sequence > after]
+        return {"sequence": self.sequence, "messages": messages}
+
+    def op_stats(self) -> Dict:
+        return {
+            "values": len(self.values),
+            "pools": len(self.pools),
+            "channels": {name: len(log) for name, log in self.channels.items()},
+            "buckets": {name: round(state[0], 2) for name, state in self.buckets.items()},
+            "requests": self.requests,
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.requests += 1
+                try:
+                    request = json.loads(line)
+                    handler = getattr(self, "op_" + request.pop("op"))
+                    response = {"ok": True, "value": handler(**request)}
+                except Exception as e:
+                    response = {"ok": False, "error": repr(e)}
+                writer.write(json.dumps(response, ensure_ascii=False).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, address: str):
+        kind, target = _parse_address(address)
+        if kind == "unix":
+            if os.path.exists(target):
+                os.unlink(target)
+            server = await asyncio.start_unix_server(self.handle, path=target, limit=LINE_LIMIT)
+            # 같은 사용자 프로세스만 접근
+            os.chmod(target, 0o600)
+        else:
+            server = await asyncio.start_server(self.handle, *target, limit=LINE_LIMIT)
+        logger.info("공유 저장소 시작: %s", address)
+        async with server:
+            await server.serve_forever()
+
+
+def run_server(address: str):
+    """저장소 서버 실행 (serve.py에서 별도 프로세스로 호출)"""
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(SharedStoreServer().serve(address))
+    except KeyboardInterrupt:
+        pass
+
+
+class SharedStore:
+    """저장소 클라이언트 (연결 풀 재사용, 호출마다 시간 제한)"""
+
+    def __init__(self, address: str, timeout: Optional[float] = None, max_connections: Optional[int] = None):
+        self.address = address
+        self.timeout = timeout or float(os.getenv("SHARED_STORE_TIMEOUT", "0.5"))
+        self.max_connections = max_connections or int(os.getenv("SHARED_STORE_CONNECTIONS", "8"))
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.calls = 0
+        self.errors = 0
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        kind, target = _parse_address(self.address)
+        if kind == "unix":
+            return await asyncio.open_unix_connection(target, limit=LINE_LIMIT)
+        return await asyncio.open_connection(*target, limit=LINE_LIMIT)
+
+    def _bind_loop(self):
+        # 연결은 만든 이벤트 루프에서만 쓸 수 있음 (warm_recipes.py처럼 asyncio.run을 여러 번 쓰는 경우)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle = []
+            self._slots = asyncio.Semaphore(self.max_connections)
+
+    async def call(self, op: str, **kwargs) -> Any:
+        self._bind_loop()
+        self.calls += 1
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(self._connect(), timeout=self.timeout)
+                reader, writer = connection
+                writer.write(json.dumps(dict(kwargs, op=op), ensure_ascii=False).encode() + b"\n")
+                line = await asyncio.wait_for(reader.readline(), timeout=self.timeout)
+                if not line:
+                    raise ConnectionResetError("저장소 연결이 끊겼습니다.")
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                # 응답을 못 읽은 연결은 버림
+                if connection is not None:
+                    connection[1].close()
+                self.errors += 1
+                UPSTREAM_ERRORS.inc("store", type(e).__name__)
+                raise SharedStoreError(repr(e)) from e
+            except BaseException:
+                if connection is not None:
+                    connection[1].close()
+                raise
+            self._idle.append(connection)
+
+        response = json.loads(line)
+        if not response["ok"]:
+            self.errors += 1
+            raise SharedStoreError(response["error"])
+        return response["value"]
+
+    async def get(self, key: str) -> Any:
+        return await self.call("get", key=key)
+
+    async def set(self, key: str, value: Any, expires_at: Optional[float] = None, ttl: Optional[float] = None):
+        await self.call("set", key=key, value=value, expires_at=expires_at, ttl=ttl)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return await self.call("add", key=key, value=value, ttl=ttl)
+
+    async def delete(self, key: str) -> bool:
+        return await self.call("delete", key=key)
+
+    async def pool_get(self, key: str) -> List:
+        return await self.call("pool_get", key=key)
+
+    async def pool_add(self, key: str, value: Any, limit: int, ttl: float) -> int:
+        return await self.call("pool_add", key=key, value=value, limit=limit, ttl=ttl)
+
+    async def take(self, bucket: str, rate: float, burst: float, tokens: float = 1.0) -> float:
+        return await self.call("take", bucket=bucket, rate=rate, burst=burst, tokens=tokens)
+
+    async def publish(self, channel: str, message: Any, limit: int = 1024) -> int:
+        return await self.call("publish", channel=channel, message=message, limit=limit)
+
+    async def poll(self, channel: str, after: Optional[int] = None) -> Dict:
+        return await self.call("poll", channel=channel, after=after)
+
+    async def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+    def stats(self) -> Dict:
+        return {
+            "address": self.address,
+            "calls": self.calls,
+            "errors": self.errors,
+            "idle_connections": len(self._idle),
+        }
+
+
+_store: Optional[SharedStore] = None
+
+
+def get_shared_store() -> Optional[SharedStore]:
+    """SHARED_STORE_ADDRESS가 지정되어 있으면 프로세스 공용 클라이언트, 아니면 None"""
+    global _store
+    address = os.getenv("SHARED_STORE_ADDRESS")
+    if not address:
+        return None
+    if _store is None or _store.address != address:
+        _store = SharedStore(address)
+    return _store
+
+
+if __name__ == "__main__":
+    run_server(sys.argv[1] if len(sys.argv) > 1 else os.getenv("SHARED_STORE_ADDRESS", "127.0.0.1:9400"))
@@ -1,126 +1,317 @@
 import httpx
-from typing import Dict, Optional
-from datetime import datetime
+from collections import Counter
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
+from services.cache import SingleFlight, TTLCache
+from services.http_client import create_http_client, request_with_retry
+from services.area_index import load_area_index
+from services.config import Settings, get_settings
+from services.kma_grid import grid_coords
+from services.forecast_series import ForecastSeries
+from services.metrics import UPSTREAM_ERRORS, span
+from services.rate_limit import create_rate_limiter
+from services.shared_store import SharedStoreError, get_shared_store
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 위치를 찾지 못했을 때의 격자 (서울)
+DEFAULT_GRID = (60, 127)
+
+# 단기예보 발표 시각 (05시, 11시, 17시, 23시)
+BASE_HOURS = (5, 11, 17, 23)
+
+# 점심 시각 (추천용 날씨는 이 시각의 예보 사용)
+LUNCH_HOUR = 12
+
+
+def lunch_time(now: Optional[datetime] = None) -> datetime:
+    """추천에 쓸 예보 시각: 점심 전이면 오늘 점심, 지났으면 지금"""
+    now = now or datetime.now()
+    if now.hour < LUNCH_HOUR:
+        return now.replace(hour=LUNCH_HOUR, minute=0, second=0, microsecond=0)
+    return now
 
 class WeatherService:
-    def __init__(self):
-        self.api_key = os.getenv("WEATHER_API_KEY")
-        self.base_url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        self.api_key = settings.weather_api_key
+        self.base_url = settings.weather_api_base_url
+        # 발표 시각 이후 API에 반영되기까지의 지연 (분)
+        self.publish_delay = timedelta(minutes=settings.weather_publish_delay_minutes)
+        # 단기예보 한 페이지 행 수 (발표분 전체가 보통 한두 페이지)
+        self.page_size = settings.weather_page_size
+        # (nx, ny, base_date, base_time) → 발표분 전체 예보 시계열. 다음 발표분 제공 시 만료
+        self.forecast_cache = TTLCache(
+            maxsize=settings.weather_cache_size,
+            stale_ttl=settings.weather_cache_stale_seconds
+        )
+        self._inflight = SingleFlight()
+        # 워커가 여러 개일 때 예보를 함께 쓰는 저장소 (serve.py, 없으면 None)
+        self.store = get_shared_store()
+        # 다른 워커가 같은 예보를 받는 중일 때 기다릴 최대 시간 (초)
+        self.shared_wait = float(os.getenv("WEATHER_SHARED_WAIT_SECONDS", "5"))
+        # 기상청 API 초당 호출 수 제한 (워커 전체 합산, 0이면 제한 없음)
+        self.rate_limiter = create_rate_limiter(
+            "kma",
+            rate=float(os.getenv("WEATHER_RATE_PER_SEC", "0")),
+            burst=float(os.getenv("WEATHER_BURST", "10"))
+        )
+        self._background_tasks = set()
+        # 격자별 조회 횟수 (예보 선행 갱신 대상 선정용)
+        self.cell_requests: Counter = Counter()
+        # 행정구역 이름 → 격자 색인 (메모리 매핑)
+        self.area_index = load_area_index()
+        # 공유 HTTP 클라이언트 (main.py lifespan에서 주입, 없으면 처음 사용 시 생성)
+        self.client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = create_http_client()
+        return self.client
     
     def get_grid_coords(self, location: str) -> tuple:
-        """위치명을 기상청 격자 좌표로 변환 (간단한 예시)"""
-        location_grid = {
-            "서울": (60, 127),
-            "강남": (61, 126),
-            "여의도": (58, 126),
-            "판교": (62, 123),
-            "부산": (98, 76),
-            "대구": (89, 90),
-            "인천": (55, 124),
-            "광주": (58, 74),
-            "대전": (67, 100),
-            "울산": (102, 84),
-            "세종": (66, 103),
-        }
-        return location_grid.get(location, (60, 127))  # 기본값: 서울
+        """위치명(시/군/구/동, 통칭)을 기상청 격자 좌표로 변환"""
+        area = self.area_index.resolve(location)
+        if area is None:
+            return DEFAULT_GRID  # 기본값: 서울
+        return area.nx, area.ny
+    
+    def base_datetime(self, now: datetime) -> datetime:
+        """now 시점에 조회 가능한 가장 최근 발표 시각 (발표 지연 반영)"""
+        available = now - self.publish_delay
+        for hour in reversed(BASE_HOURS):
+            if available.hour >= hour:
+                return available.replace(hour=hour, minute=0, second=0, microsecond=0)
+        # 첫 발표 이전이면 전날 마지막 발표 사용
+        previous_day = available - timedelta(days=1)
+        return previous_day.replace(hour=BASE_HOURS[-1], minute=0, second=0, microsecond=0)
+    
+    def next_base_datetime(self, base: datetime) -> datetime:
+        """base 다음 발표 시각"""
+        for hour in BASE_HOURS:
+            if hour > base.hour:
+                return base.replace(hour=hour)
+        return (base + timedelta(days=1)).replace(hour=BASE_HOURS[0])
     
-    async def get_weather(self, location: str = "서울") -> Dict:
-        """기상청 API로 날씨 정보 조회"""
+    def previous_base_datetime(self, base: datetime) -> datetime:
+        """base 직전 발표 시각"""
+        for hour in reversed(BASE_HOURS):
+            if hour < base.hour:
+                return base.replace(hour=hour)
+        return (base - timedelta(days=1)).replace(hour=BASE_HOURS[-1])
+    
+    def _cache_key(self, nx: int, ny: int, base: datetime) -> tuple:
+        return (nx, ny, base.strftime("%Y%m%d"), base.strftime("%H%M"))
+    
+    async def get_weather(
+        self,
+        location: str = "서울",
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        at: Optional[datetime] = None
+    ) -> Dict:
+        """기상청 API로 날씨 정보 조회 (격자·발표 시각 단위 캐시)
+        
+        lat/lon을 주면 위치명 대신 위경도로 격자를 계산합니다.
+        at(기본: 지금)과 가장 가까운 예보 시각의 값을 반환하며, 같은 발표분 안의 다른 시각은 캐시에서 바로 응답합니다.
+        """
         try:
-            nx, ny = self.get_grid_coords(location)
-            
-            # 현재 시각 기준으로 base_date, base_time 설정
+            if lat is not None and lon is not None:
+                nx, ny = grid_coords(lat, lon)
+            else:
+                nx, ny = self.get_grid_coords(location)
+            self.cell_requests[(nx, ny)] += 1
             now = datetime.now()
-            base_date = now.strftime("%Y%m%d")
-            base_time = "0500"  # 기상청 발표 시간 (05시, 11시, 17시, 23시)
+            at = at or now
+            if at.tzinfo is not None:
+                # 예보 시각은 현지 시각 기준
+                at = at.astimezone().replace(tzinfo=None)
+            base = self.base_datetime(now)
+            key = self._cache_key(nx, ny, base)
             
-            # 현재 시간에 따라 적절한 base_time 선택
-            hour = now.hour
-            if hour < 5:
-                base_time = "2300"
-                # 전날 날짜로 변경 필요
-            elif hour < 11:
-                base_time = "0500"
-            elif hour < 17:
-                base_time = "1100"
-            elif hour < 23:
-                base_time = "1700"
-            else:
-                base_time = "2300"
+            # 1. 이번 발표분 캐시
+            forecast = self.forecast_cache.get(key)
+            if forecast is not None:
+                return dict(forecast.at(at), location=location)
             
-            params = {
-                "serviceKey": self.api_key,
-                "pageNo": "1",
-                "numOfRows": "100",
-                "dataType": "JSON",
-                "base_date": base_date,
-                "base_time": base_time,
-                "nx": nx,
-                "ny": ny
-            }
+            # 2. 직전 발표분이 남아 있으면 바로 응답하고 백그라운드에서 갱신
+            previous = self.forecast_cache.lookup(
+                self._cache_key(nx, ny, self.previous_base_datetime(base)),
+                count=False
+            )
+            if previous is not None:
+                self.forecast_cache.stale_hits += 1
+                self._refresh_in_background(key, base)
+                return dict(previous[0].at(at), location=location)
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/getVilageFcst",
-                    params=params,
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # 데이터 파싱
-                    if "response" in data and "body" in data["response"]:
-                        items = data["response"]["body"]["items"]["item"]
-                        
-                        # 필요한 정보 추출
-                        weather_data = {
-                            "location": location,
-                            "temperature": None,
-                            "sky_condition": None,
-                            "precipitation": None,
-                            "humidity": None,
-                        }
-                        
-                        for item in items:
-                            category = item["category"]
-                            value = item["fcstValue"]
-                            
-                            if category == "TMP":  # 기온
-                                weather_data["temperature"] = float(value)
-                            elif category == "SKY":  # 하늘 상태
-                                sky_codes = {
-                                    "1": "맑음",
-                                    "3": "구름많음",
-                                    "4": "흐림"
-                                }
-                                weather_data["sky_condition"] = sky_codes.get(value, "알 수 없음")
-                            elif category == "PTY":  # 강수 형태
-                                pty_codes = {
-                                    "0": "없음",
-                                    "1": "비",
-                                    "2": "비/눈",
-                                    "3": "눈",
-                                    "4": "소나기"
-                                }
-                                weather_data["precipitation"] = pty_codes.get(value, "없음")
-                            elif category == "REH":  # 습도
-                                weather_data["humidity"] = int(value)
-                        
-                        return weather_data
-                
-                # API 호출 실패 시 더미 데이터 반환
-                return self._get_dummy_weather(location)
+            # 3. 동시 요청은 하나의 기상청 호출을 공유
+            forecast = await self._inflight.do(key, lambda: self._fetch_forecast(key, base))
+            if forecast is not None:
+                return dict(forecast.at(at), location=location)
+            
+            # API 호출 실패 시 더미 데이터 반환
+            return self._get_dummy_weather(location)
                 
-        except Exception as e:
-            print(f"날씨 API 오류: {str(e)}")
+        except Exception:
+            logger.exception("날씨 조회 오류")
             # 오류 발생 시 더미 데이터 반환
             return self._get_dummy_weather(location)
     
+    async def get_weather_batch(self, locations: List[str], at: Optional[datetime] = None) -> List[Dict]:
+        """여러 위치의 날씨 조회 (같은 격자는 한 번만 조회, 결과는 입력 순서대로)"""
+        cells = {}
+        for location in locations:
+            cells.setdefault(self.get_grid_coords(location), location)
+        
+        forecasts = await asyncio.gather(*(self.get_weather(location, at=at) for location in cells.values()))
+        by_cell = dict(zip(cells.keys(), forecasts))
+        return [
+            dict(by_cell[self.get_grid_coords(location)], location=location)
+            for location in locations
+        ]
+    
+    def is_warm(self, nx: int, ny: int, now: Optional[datetime] = None) -> bool:
+        """격자의 현재 발표분 예보가 캐시에 있는지"""
+        key = self._cache_key(nx, ny, self.base_datetime(now or datetime.now()))
+        found = self.forecast_cache.lookup(key, count=False)
+        return found is not None and found[1]
+    
+    async def refresh(self, nx: int, ny: int) -> bool:
+        """격자의 현재 발표분 예보를 미리 받아 캐시에 저장 (이미 있으면 생략)"""
+        base = self.base_datetime(datetime.now())
+        key = self._cache_key(nx, ny, base)
+        if self.is_warm(nx, ny):
+            return True
+        forecast = await self._inflight.do(key, lambda: self._fetch_forecast(key, base))
+        return forecast is not None
+    
+    async def forecast_at(self, nx: int, ny: int, at: datetime) -> Optional[Dict]:
+        """격자의 현재 발표분 예보 중 at과 가장 가까운 시각의 날씨 (조회 수에 넣지 않음, 실패 시 None)"""
+        base = self.base_datetime(datetime.now())
+        key = self._cache_key(nx, ny, base)
+        found = self.forecast_cache.lookup(key, count=False)
+        if found is not None and found[1]:
+            forecast = found[0]
+        else:
+            forecast = await self._inflight.do(key, lambda: self._fetch_forecast(key, base))
+        return None if forecast is None else forecast.at(at)
+
+    def _refresh_in_background(self, key: tuple, base: datetime):
+        """캐시 갱신 작업을 백그라운드로 시작 (이미 진행 중이면 공유)"""
+        task = self._inflight.start(key, lambda: self._fetch_forecast(key, base))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _fetch_page(self, params: Dict, page: int) -> Optional[Dict]:
+        """단기예보 한 페이지 조회. 실패 시 None"""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        try:
+            response = await request_with_retry(
+                self._get_client(),
+                "GET",
+                f"{self.base_url}/getVilageFcst",
+                params=dict(params, pageNo=str(page))
+            )
+        except httpx.HTTPError as e:
+            UPSTREAM_ERRORS.inc("kma", type(e).__name__)
+            logger.warning("날씨 API 오류: %s", e)
+            return None
+        
+        if response.status_code != 200:
+            UPSTREAM_ERRORS.inc("kma", f"http_{response.status_code}")
+            return None
+        
+        data = response.json()
+        if "response" not in data or "body" not in data["response"]:
+            UPSTREAM_ERRORS.inc("kma", "no_body")
+            return None
+        body = data["response"]["body"]
+        # 자료가 없으면 items가 빈 값으로 옴
+        if not body.get("items"):
+            UPSTREAM_ERRORS.inc("kma", "no_data")
+            return None
+        return body
+    
+    def _shared_key(self, key: tuple) -> str:
+        return "forecast:{}:{}:{}{}".format(*key)
+    
+    async def _fetch_forecast(self, key: tuple, base: datetime) -> Optional[ForecastSeries]:
+        """발표분 예보를 캐시에 저장하고 반환. 실패 시 None
+        
+        공유 저장소가 있으면 다른 워커가 받아 둔 예보를 먼저 찾고, 같은 예보는 워커 하나만 기상청에서 받습니다.
+        """
+        # 다음 발표분이 제공되는 시각에 만료
+        expires_at = (self.next_base_datetime(base) + self.publish_delay).timestamp()
+        if self.store is None:
+            series = await self._fetch_from_api(key)
+        else:
+            series = await self._fetch_shared(key, expires_at)
+        if series is not None:
+            self.forecast_cache.set(key, series, expires_at=expires_at)
+        return series
+    
+    async def _fetch_shared(self, key: tuple, expires_at: float) -> Optional[ForecastSeries]:
+        """공유 저장소 → (조회 담당을 맡으면) 기상청 API 순서로 조회. 저장소 오류 시 직접 조회"""
+        shared_key = self._shared_key(key)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.shared_wait
+        try:
+            while True:
+                data = await self.store.get(shared_key)
+                if data is not None:
+                    return ForecastSeries.from_dict(data)
+                # 조회 담당 임대: 먼저 잡은 워커만 호출하고 나머지는 저장될 때까지 대기
+                if await self.store.add("lock:" + shared_key, os.getpid(), ttl=self.shared_wait):
+                    break
+                if loop.time() >= deadline:
+                    break
+                await asyncio.sleep(0.05)
+        except SharedStoreError:
+            return await self._fetch_from_api(key)
+        
+        series = await self._fetch_from_api(key)
+        try:
+            if series is not None:
+                await self.store.set(shared_key, series.to_dict(), expires_at=expires_at)
+            await self.store.delete("lock:" + shared_key)
+        except SharedStoreError:
+            pass
+        return series
+    
+    async def _fetch_from_api(self, key: tuple) -> Optional[ForecastSeries]:
+        """기상청 단기예보 발표분 전체(모든 페이지) 조회 후 시계열로 변환. 실패 시 None"""
+        nx, ny, base_date, base_time = key
+        params = {
+            "serviceKey": self.api_key,
+            "numOfRows": str(self.page_size),
+            "dataType": "JSON",
+            "base_date": base_date,
+            "base_time": base_time,
+            "nx": nx,
+            "ny": ny
+        }
+        
+        with span("weather.fetch"):
+            first = await self._fetch_page(params, 1)
+            if first is None:
+                return None
+            
+            # 나머지 페이지는 동시에 조회
+            pages = [first]
+            page_count = -(-int(first.get("totalCount") or 0) // self.page_size)
+            if page_count > 1:
+                pages += await asyncio.gather(*(self._fetch_page(params, page) for page in range(2, page_count + 1)))
+                if any(page is None for page in pages):
+                    return None
+        
+        with span("weather.parse"):
+            items = [item for page in pages for item in page["items"]["item"]]
+            return ForecastSeries.from_items(items)
+    
     def _get_dummy_weather(self, location: str) -> Dict:
         """테스트용 더미 날씨 데이터"""
         return {
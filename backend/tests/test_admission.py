@@ -0,0 +1,145 @@
+"""services/admission.py: 대기열 밀어내기, 대기 중 마감, 자리 받은 뒤 취소, 스트리밍 응답의 처리 시간"""
+import asyncio
+
+import pytest
+
+from services.admission import INTERACTIVE, LLM, AdmissionController, AdmissionMiddleware
+from services.metrics import ADMISSION_REQUESTS
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    monkeypatch.setenv("ADMISSION_INTERACTIVE_INFLIGHT", "1")
+    monkeypatch.setenv("ADMISSION_LLM_INFLIGHT", "1")
+    monkeypatch.setenv("ADMISSION_QUEUE_SIZE", "1")
+    return AdmissionController()
+
+
+def shed(name: str, result: str) -> int:
+    return ADMISSION_REQUESTS.values.get((name, result), 0)
+
+
+def test_evicts_lower_priority_waiter(controller):
+    async def scenario():
+        assert await controller.acquire(LLM) == (True, 0.0)
+        assert await controller.acquire(INTERACTIVE) == (True, 0.0)
+        evicted = shed(LLM, "shed_evicted")
+
+        llm_waiter = asyncio.ensure_future(controller.acquire(LLM))
+        await asyncio.sleep(0)
+        assert len(controller.classes[LLM].queue) == 1
+
+        # 대기열이 가득 찼으므로 날씨 요청이 추천 요청을 밀어내고 들어감
+        interactive_waiter = asyncio.ensure_future(controller.acquire(INTERACTIVE))
+        admitted, _ = await llm_waiter
+        assert not admitted
+        assert shed(LLM, "shed_evicted") == evicted + 1
+        assert not controller.classes[LLM].queue
+        assert len(controller.classes[INTERACTIVE].queue) == 1
+
+        controller.release(INTERACTIVE, 0.01)
+        admitted, waited = await interactive_waiter
+        assert admitted and waited >= 0
+        assert controller.classes[INTERACTIVE].inflight == 1
+
+    asyncio.run(scenario())
+
+
+def test_same_priority_is_not_evicted(controller):
+    async def scenario():
+        await controller.acquire(LLM)
+        first = asyncio.ensure_future(controller.acquire(LLM))
+        await asyncio.sleep(0)
+        full = shed(LLM, "shed_queue_full")
+        assert (await controller.acquire(LLM))[0] is False
+        assert shed(LLM, "shed_queue_full") == full + 1
+        controller.release(LLM, 0.01)
+        assert (await first)[0] is True
+
+    asyncio.run(scenario())
+
+
+def test_deadline_expires_while_queued(controller):
+    controller.classes[LLM].deadline = 0.05
+
+    async def scenario():
+        await controller.acquire(LLM)
+        expired = shed(LLM, "shed_deadline")
+        admitted, retry_after = await controller.acquire(LLM)
+        assert not admitted and retry_after > 0
+        assert shed(LLM, "shed_deadline") == expired + 1
+        assert not controller.classes[LLM].queue
+
+        # 마감이 지난 요청은 자리가 나도 배정하지 않음
+        controller.release(LLM, 0.01)
+        assert controller.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_after_grant_releases_slot(controller):
+    async def scenario():
+        await controller.acquire(LLM)
+        waiter = asyncio.ensure_future(controller.acquire(LLM))
+        await asyncio.sleep(0)
+
+        # 자리를 배정한 직후(기다리던 쪽이 깨어나기 전) 연결이 끊김
+        controller.release(LLM, 0.01)
+        assert controller.classes[LLM].inflight == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.classes[LLM].inflight == 0
+        assert controller.inflight == 0
+        assert not controller.classes[LLM].queue
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_while_queued_leaves_queue(controller):
+    async def scenario():
+        await controller.acquire(LLM)
+        waiter = asyncio.ensure_future(controller.acquire(LLM))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert not controller.classes[LLM].queue
+        assert controller.classes[LLM].inflight == 1
+
+    asyncio.run(scenario())
+
+
+def make_app(content_type: bytes, chunks: int, delay: float, inside: list, controller: AdmissionController):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", content_type)]})
+        for _ in range(chunks):
+            await asyncio.sleep(delay)
+            # 응답을 보내는 동안 자리를 잡고 있는지
+            inside.append(controller.classes[LLM].inflight)
+            await send({"type": "http.response.body", "body": b"data: x\n\n", "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+async def call(middleware, path: str):
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await middleware({"type": "http", "path": path, "headers": [], "client": ("127.0.0.1", 1)}, receive, send)
+
+
+@pytest.mark.parametrize("content_type, path, counted", [
+    (b"application/json", "/api/recipe", True),
+    (b"text/event-stream; charset=utf-8", "/api/recipe/stream", False),
+])
+def test_streaming_response_holds_slot_without_service_time(controller, content_type, path, counted):
+    inside = []
+    middleware = AdmissionMiddleware(make_app(content_type, 3, 0.02, inside, controller), controller)
+    asyncio.run(call(middleware, path))
+    assert inside == [1, 1, 1]
+    assert controller.inflight == 0
+    assert (controller.classes[LLM].service_time > 0) == counted
@@ -0,0 +1,16 @@
+"""services/ai_service.py: 재사용 답변의 기온 설명"""
+import pytest
+
+from services.ai_service import temperature_match
+
+
+@pytest.mark.parametrize("weather, expected", [
+    ({"temperature": 3, "precipitation": "없음"}, "쌀쌀한 날씨(3°C)에 따뜻한 음식으로 몸을 녹이세요"),
+    ({"temperature": 30}, "더운 날씨(30°C)에 시원한 음식으로 더위를 식히세요"),
+    ({"temperature": 18, "precipitation": "비"}, "적당한 날씨(18°C)에 어떤 메뉴든 좋습니다. 비가 내리니 따뜻한 국물 요리가 제격입니다"),
+    # 예보에 기온·강수 값이 없는 행 (ForecastSeries.at이 None을 돌려줌)
+    ({"temperature": None, "precipitation": None}, "적당한 날씨(20°C)에 어떤 메뉴든 좋습니다"),
+    ({}, "적당한 날씨(20°C)에 어떤 메뉴든 좋습니다"),
+])
+def test_temperature_match(weather, expected):
+    assert temperature_match(weather) == expected
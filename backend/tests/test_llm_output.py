@@ -0,0 +1,122 @@
+"""services/llm_output.py: 깨진 LLM JSON 복구와 일괄 응답 항목 검증"""
+import json
+
+import pytest
+
+from services.llm_output import (
+    BatchRecommendation,
+    Recipe,
+    _close_truncated,
+    _drop_trailing_commas,
+    parse_items,
+    parse_json,
+    parse_model,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # 완성된 JSON은 그대로, 뒤의 설명은 버림
+    ('{"a": 1}', '{"a": 1}'),
+    ('{"a": 1} 이상입니다.', '{"a": 1}'),
+    ('', ''),
+    # 문자열 안에서 잘림: 그 값과 키를 버림
+    ('{"a": "hel', '{}'),
+    ('{"a": 1, "b": "wor', '{"a": 1}'),
+    ('{"a": "q\\"uo', '{}'),
+    ('["ab", "c', '["ab"]'),
+    # 숫자 안에서 잘림: 뒤에 숫자가 더 있었을 수 있으므로 버림
+    ('{"a": 12', '{}'),
+    ('{"a": -1.5e', '{}'),
+    ('[1, 2, 3', '[1, 2]'),
+    # 끝난 숫자 뒤 공백에서 잘림은 유지
+    ('{"a": 12 ', '{"a": 12}'),
+    # true/false/null 안에서 잘림
+    ('{"a": 1, "b": tru', '{"a": 1}'),
+    ('{"a": nul', '{}'),
+    # 키 안, 키 뒤, 콜론 뒤에서 잘림
+    ('{"a": 1, "b', '{"a": 1}'),
+    ('{"a": 1, "b"', '{"a": 1}'),
+    ('{"a": 1, "b":', '{"a": 1}'),
+    ('{"a": {"b": "c"}, ', '{"a": {"b": "c"}}'),
+    # 문자열 안의 괄호는 구조로 보지 않음
+    ('{"a": "x}y", "b": [1, 2', '{"a": "x}y", "b": [1]}'),
+    ('{"a": "]"', '{"a": "]"}'),
+    ('{"a": [1, "b', '{"a": [1]}'),
+    # 중첩 목록의 마지막 항목 안에서 잘림
+    ('{"a": [{"x": 1}, {"x": 2', '{"a": [{"x": 1}, {}]}'),
+])
+def test_close_truncated(text, expected):
+    assert _close_truncated(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": [1, 2,],}', '{"a": [1, 2]}'),
+    ('[ {"a":1} , ]', '[ {"a":1}  ]'),
+    ('{"a": 1,\n}', '{"a": 1\n}'),
+    # 문자열 안의 ",]"와 이스케이프된 따옴표·역슬래시는 그대로
+    ('{"a": ",]", "b": [1 , ] }', '{"a": ",]", "b": [1  ] }'),
+    ('{"a": "\\",}", "b": 1,}', '{"a": "\\",}", "b": 1}'),
+    ('{"a": "\\\\", "b": 1,}', '{"a": "\\\\", "b": 1}'),
+    ('{"a": [1, 2]}', '{"a": [1, 2]}'),
+])
+def test_drop_trailing_commas(text, expected):
+    assert _drop_trailing_commas(text) == expected
+    json.loads(expected)
+
+
+@pytest.mark.parametrize("text, expected, outcome", [
+    ('{"menu": "비빔밥"}', {"menu": "비빔밥"}, "ok"),
+    # 코드 펜스와 앞뒤 설명
+    ('```json\n{"menu": "비빔밥"}\n```', {"menu": "비빔밥"}, "repaired"),
+    ('추천입니다:\n```\n{"menu": "비빔밥"}\n```\n맛있게 드세요', {"menu": "비빔밥"}, "repaired"),
+    ('```JSON\n{"menu": "비빔밥"', {"menu": "비빔밥"}, "repaired"),
+    ('물론이죠! {"menu": "비빔밥"}', {"menu": "비빔밥"}, "repaired"),
+    # 끝 쉼표 + 잘림
+    ('```json\n{"menu": "비빔밥", "alternatives": ["냉면",]}\n```', {"menu": "비빔밥", "alternatives": ["냉면"]}, "repaired"),
+    ('{"menu": "비빔밥", "alternatives": ["냉면", "국', {"menu": "비빔밥", "alternatives": ["냉면"]}, "repaired"),
+    ('', None, "invalid_json"),
+    (None, None, "invalid_json"),
+    ('메뉴를 찾지 못했습니다.', None, "invalid_json"),
+])
+def test_parse_json(text, expected, outcome):
+    assert parse_json(text) == (expected, outcome)
+
+
+@pytest.mark.parametrize("text, outcome, has_steps", [
+    ('{"menu_name": "김치찌개", "ingredients": [{"name": "김치"}], "steps": ["끓인다"]}', "ok", True),
+    # 조리 단계 중간에서 잘림: 완성된 단계까지만
+    ('{"menu_name": "김치찌개", "ingredients": [{"name": "김치"}], "steps": ["썬다", "끓', "repaired", True),
+    # 첫 단계 안에서 잘리면 단계가 비어 스키마 오류
+    ('{"menu_name": "김치찌개", "ingredients": [{"name": "김치"}], "steps": ["끓', "invalid_schema", False),
+])
+def test_parse_model_truncated_recipe(text, outcome, has_steps):
+    recipe, result = parse_model(text, Recipe, "test", non_empty=("ingredients", "steps"))
+    assert result == outcome
+    assert (recipe is not None and bool(recipe["steps"])) == has_steps
+
+
+def _item(index: int) -> str:
+    return json.dumps({"index": index, "menu": f"메뉴{index}"}, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("text, outcome, indexes", [
+    ('{"items": [%s, %s]}' % (_item(0), _item(1)), "ok", [0, 1]),
+    ('{"items": [%s, %s,]}' % (_item(0), _item(1)), "repaired", [0, 1]),
+    ('```json\n{"items": [%s]}\n```' % _item(0), "repaired", [0]),
+    # 일부 항목만 스키마에 맞음
+    ('{"items": [%s, {"index": 1}]}' % _item(0), "partial", [0]),
+    ('{"items": [%s, "메뉴1"]}' % _item(0), "partial", [0]),
+    # 마지막 항목 안에서 잘림: 완성된 항목만
+    ('{"items": [%s, {"index": 1, "menu": "메' % _item(0), "partial", [0]),
+    ('{"items": [%s, %s' % (_item(0), _item(1)), "repaired", [0, 1]),
+    ('{"items": [{"index": 0, "me', "invalid_schema", []),
+    # 키가 없거나 목록이 아님
+    ('{"other": []}', "invalid_schema", []),
+    ('{"items": "메뉴"}', "invalid_schema", []),
+    ('[%s]' % _item(0), "invalid_schema", []),
+    ('형식을 지킬 수 없습니다', "invalid_json", []),
+])
+def test_parse_items(text, outcome, indexes):
+    items, result = parse_items(text, "items", BatchRecommendation, "test")
+    assert result == outcome
+    assert [item["index"] for item in items] == indexes
@@ -0,0 +1,20 @@
+"""레시피 캐시 예열: 메뉴 카탈로그의 모든 메뉴 레시피를 미리 생성
+
+실행 (backend 디렉터리에서):
+    python warm_recipes.py
+"""
+import asyncio
+import json
+from services.ai_service import AIService
+
+async def main():
+    ai_service = AIService()
+    if not ai_service.use_ai:
+        print("OpenAI API 키가 없어 레시피를 생성할 수 없습니다.")
+        return
+    result = await ai_service.warm_recipe_cache(ai_service.catalog.names())
+    result["cache"] = ai_service.recipe_cache.stats()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,13 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import HomePage from './components/HomePage';
 import PreferenceSelection from './components/PreferenceSelection';
 import ResultPage from './components/ResultPage';
 import RecipePage from './components/RecipePage';
 import RestaurantPage from './components/RestaurantPage';
-import { weatherAPI, recommendAPI, recipeAPI } from './services/api';
+import { weatherAPI, lunchAPI, recipeAPI, feedbackAPI, subscribeLive } from './services/api';
+
+// 주소의 ?group= 값이 같은 사람끼리 추천 결과를 함께 받음 (다인 모드)
+const groupId = new URLSearchParams(window.location.search).get('group');
 
 function App() {
   const [currentPage, setCurrentPage] = useState('home');
@@ -13,12 +16,43 @@ function App() {
   const [weather, setWeather] = useState(null);
   const [recommendation, setRecommendation] = useState(null);
   const [recipe, setRecipe] = useState(null);
+  // 추천과 함께 받아 둔 추천 메뉴 레시피
+  const [prefetchedRecipe, setPrefetchedRecipe] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  // 지금 추천에 긍정 피드백(다음 단계, 레시피, 음식점)을 보냈는지 (아니면 처음으로 갈 때 reject)
+  const accepted = useRef(false);
+
+  const showRecommendation = (data) => {
+    setRecommendation(data);
+    accepted.current = false;
+  };
 
-  // 앱 시작 시 날씨 정보 가져오기
+  const sendFeedback = (event) => {
+    if (event !== 'reject') accepted.current = true;
+    feedbackAPI.send(recommendation?.recommendation_id, event);
+  };
+
+  // 위치의 날씨를 실시간으로 구독 (연결할 수 없으면 한 번 조회)
   useEffect(() => {
-    fetchWeather();
+    let received = false;
+    return subscribeLive({
+      location,
+      group: groupId,
+      onWeather: (data) => {
+        received = true;
+        // 같은 격자 구독자에게 같은 메시지가 가므로 위치명은 이 화면의 값 사용
+        setWeather({ ...data, location });
+      },
+      onRecommendation: (data) => {
+        showRecommendation(data);
+        setPrefetchedRecipe(null);
+        setCurrentPage('result');
+      },
+      onError: () => {
+        if (!received) fetchWeather();
+      }
+    });
   }, [location]);
 
   const fetchWeather = async () => {
@@ -45,11 +79,16 @@ function App() {
         food_type: preferences.foodType,
         mood: preferences.mood,
         num_people: preferences.numPeople,
-        moods: preferences.moods
+        moods: preferences.moods,
+        num_servings: mode === 'single' ? 1 : preferences.numPeople,
+        group_id: mode === 'single' ? null : groupId,
+        include_recipe: true
       };
 
-      const response = await recommendAPI.getRecommendation(requestData);
-      setRecommendation(response.data);
+      const response = await lunchAPI.getLunch(requestData);
+      setWeather(response.data.weather);
+      showRecommendation(response.data.recommendation);
+      setPrefetchedRecipe(response.data.recipe);
       setCurrentPage('result');
     } catch (err) {
       setError('추천을 가져오는데 실패했습니다.');
@@ -60,6 +99,12 @@ function App() {
   };
 
   const handleGetRecipe = async (menuName) => {
+    if (menuName === recommendation?.menu) sendFeedback('recipe_click');
+    if (prefetchedRecipe && menuName === recommendation?.menu) {
+      setRecipe(prefetchedRecipe);
+      setCurrentPage('recipe');
+      return;
+    }
     setLoading(true);
     try {
       const numServings = mode === 'single' ? 1 : recommendation?.weather_info?.num_people || 1;
@@ -75,14 +120,17 @@ function App() {
   };
 
   const handleFindRestaurant = (menuName) => {
+    sendFeedback('restaurant_click');
     setCurrentPage('restaurant');
   };
 
   const handleBack = () => {
+    if (currentPage === 'result' && !accepted.current) sendFeedback('reject');
     setCurrentPage('home');
     setMode(null);
     setRecommendation(null);
     setRecipe(null);
+    setPrefetchedRecipe(null);
   };
 
   const handleBackToPreference = () => {
@@ -136,6 +184,7 @@ function App() {
           recommendation={recommendation}
           weather={weather}
           onBack={handleBack}
+          onAccept={() => sendFeedback('accept')}
           onGetRecipe={handleGetRecipe}
           onFindRestaurant={handleFindRestaurant}
         />
@@ -1,19 +1,26 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
+import { restaurantAPI } from '../services/api';
 
 const RestaurantPage = ({ menuName, location, onBack }) => {
   const [isMapLoaded, setIsMapLoaded] = useState(false);
   const [error, setError] = useState(null);
+  const [places, setPlaces] = useState([]);
+  const [page, setPage] = useState(1);
+  const [isEnd, setIsEnd] = useState(true);
+  const [isSearching, setIsSearching] = useState(false);
+  const [searchError, setSearchError] = useState(null);
+  const mapRef = useRef(null);
+  const markersRef = useRef([]);
 
   useEffect(() => {
-    // 카카오맵 API 스크립트 로드
+    // 카카오맵 API 스크립트 로드 (지도 표시만, 검색은 백엔드 /api/restaurants)
     const script = document.createElement('script');
-    script.src = `//dapi.kakao.com/v2/maps/sdk.js?appkey=YOUR_KAKAO_API_KEY&libraries=services&autoload=false`;
+    script.src = `//dapi.kakao.com/v2/maps/sdk.js?appkey=YOUR_KAKAO_API_KEY&autoload=false`;
     script.async = true;
     
     script.onload = () => {
       window.kakao.maps.load(() => {
         setIsMapLoaded(true);
-        initMap();
       });
     };
 
@@ -26,51 +33,73 @@ const RestaurantPage = ({ menuName, location, onBack }) => {
     return () => {
       document.head.removeChild(script);
     };
+  }, []);
+
+  useEffect(() => {
+    setPlaces([]);
+    setPage(1);
   }, [menuName, location]);
 
-  const initMap = () => {
+  useEffect(() => {
+    if (!menuName) return;
+    let cancelled = false;
+    setIsSearching(true);
+    setSearchError(null);
+    restaurantAPI.search(menuName, location, { page })
+      .then((result) => {
+        if (cancelled) return;
+        setPlaces((prev) => (page === 1 ? result.data.places : [...prev, ...result.data.places]));
+        setIsEnd(result.data.is_end);
+      })
+      .catch((err) => {
+        if (!cancelled) setSearchError(err.response?.data?.detail || '음식점을 검색할 수 없습니다.');
+      })
+      .finally(() => {
+        if (!cancelled) setIsSearching(false);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [menuName, location, page]);
+
+  useEffect(() => {
+    if (isMapLoaded) drawMarkers();
+  }, [isMapLoaded, places]);
+
+  const drawMarkers = () => {
     const container = document.getElementById('map');
     if (!container) return;
 
-    const options = {
-      center: new window.kakao.maps.LatLng(37.5665, 126.9780), // 서울 기본 좌표
-      level: 3
-    };
+    if (!mapRef.current) {
+      mapRef.current = new window.kakao.maps.Map(container, {
+        center: new window.kakao.maps.LatLng(37.5665, 126.9780), // 서울 기본 좌표
+        level: 4
+      });
+    }
+    const map = mapRef.current;
+
+    markersRef.current.forEach((marker) => marker.setMap(null));
+    markersRef.current = places.map((place, index) => {
+      const marker = new window.kakao.maps.Marker({
+        position: new window.kakao.maps.LatLng(place.lat, place.lon),
+        map: map
+      });
 
-    const map = new window.kakao.maps.Map(container, options);
-    
-    // 장소 검색 객체 생성
-    const ps = new window.kakao.maps.services.Places();
-
-    // 키워드로 장소 검색
-    ps.keywordSearch(menuName, (data, status) => {
-      if (status === window.kakao.maps.services.Status.OK) {
-        // 검색 결과를 지도에 표시
-        data.slice(0, 5).forEach((place, index) => {
-          const markerPosition = new window.kakao.maps.LatLng(place.y, place.x);
-          
-          const marker = new window.kakao.maps.Marker({
-            position: markerPosition,
-            map: map
-          });
-
-          // 인포윈도우 생성
-          const infowindow = new window.kakao.maps.InfoWindow({
-            content: `<div style="padding:5px;font-size:12px;">${index + 1}. ${place.place_name}</div>`
-          });
-
-          window.kakao.maps.event.addListener(marker, 'click', () => {
-            infowindow.open(map, marker);
-          });
-        });
-
-        // 첫 번째 결과로 지도 중심 이동
-        if (data.length > 0) {
-          const firstPlace = data[0];
-          map.setCenter(new window.kakao.maps.LatLng(firstPlace.y, firstPlace.x));
-        }
-      }
+      // 인포윈도우 생성
+      const infowindow = new window.kakao.maps.InfoWindow({
+        content: `<div style="padding:5px;font-size:12px;">${index + 1}. ${place.name} (${place.distance}m)</div>`
+      });
+
+      window.kakao.maps.event.addListener(marker, 'click', () => {
+        infowindow.open(map, marker);
+      });
+      return marker;
     });
+
+    // 가장 가까운 결과로 지도 중심 이동
+    if (places.length > 0) {
+      map.setCenter(new window.kakao.maps.LatLng(places[0].lat, places[0].lon));
+    }
   };
 
   return (
@@ -102,15 +131,58 @@ const RestaurantPage = ({ menuName, location, onBack }) => {
                   </p>
                 </div>
               </div>
-            ) : !isMapLoaded ? (
-              <div className="h-96 flex items-center justify-center bg-gray-100">
-                <div className="text-center">
-                  <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-orange-500 mx-auto mb-4"></div>
-                  <p className="text-gray-600">지도를 불러오는 중...</p>
-                </div>
-              </div>
             ) : (
-              <div id="map" className="w-full h-96"></div>
+              <>
+                <div id="map" className="w-full h-96"></div>
+                {!isMapLoaded && (
+                  <div className="absolute inset-0 flex items-center justify-center bg-gray-100">
+                    <div className="text-center">
+                      <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-orange-500 mx-auto mb-4"></div>
+                      <p className="text-gray-600">지도를 불러오는 중...</p>
+                    </div>
+                  </div>
+                )}
+              </>
+            )}
+          </div>
+
+          {/* 음식점 목록 (가까운 순) */}
+          <div className="p-6">
+            {searchError ? (
+              <p className="text-gray-600">{searchError}</p>
+            ) : places.length === 0 && !isSearching ? (
+              <p className="text-gray-600">주변에서 {menuName} 음식점을 찾지 못했습니다.</p>
+            ) : (
+              <ul className="divide-y divide-gray-200">
+                {places.map((place, index) => (
+                  <li key={place.id} className="py-3 flex justify-between items-start">
+                    <div>
+                      <a
+                        href={place.url}
+                        target="_blank"
+                        rel="noreferrer"
+                        className="font-semibold text-gray-800 hover:text-orange-500"
+                      >
+                        {index + 1}. {place.name}
+                      </a>
+                      <p className="text-sm text-gray-500">{place.road_address || place.address}</p>
+                      {place.phone && <p className="text-sm text-gray-500">{place.phone}</p>}
+                    </div>
+                    <span className="text-sm text-orange-500 font-semibold whitespace-nowrap ml-4">
+                      {place.distance}m
+                    </span>
+                  </li>
+                ))}
+              </ul>
+            )}
+            {isSearching && <p className="text-gray-500 mt-2">검색 중...</p>}
+            {!isSearching && !isEnd && (
+              <button
+                onClick={() => setPage(page + 1)}
+                className="mt-4 w-full bg-gray-100 text-gray-700 py-2 rounded-lg hover:bg-gray-200"
+              >
+                더 보기
+              </button>
             )}
           </div>
 
@@ -118,13 +190,13 @@ const RestaurantPage = ({ menuName, location, onBack }) => {
           <div className="p-6 bg-gray-50">
             <div className="bg-blue-50 border-l-4 border-blue-400 p-4 rounded">
               <p className="text-sm text-gray-700">
-                <span className="font-semibold">💡 Tip:</span> 지도에서 마커를 클릭하면 식당 정보를 확인할 수 있습니다.
+                <span className="font-semibold">💡 Tip:</span> 지도에서 마커를 클릭하면 식당 이름과 거리를 확인할 수 있습니다.
               </p>
             </div>
             
             <div className="mt-4 bg-yellow-50 border-l-4 border-yellow-400 p-4 rounded">
               <p className="text-sm text-gray-700">
-                <span className="font-semibold">⚠️ 참고:</span> 카카오맵 API 키를 설정하면 실제 주변 식당 정보가 표시됩니다.
+                <span className="font-semibold">⚠️ 참고:</span> 지도를 표시하려면 카카오맵 JavaScript 키가, 음식점 검색에는 백엔드의 KAKAO_REST_API_KEY가 필요합니다.
               </p>
             </div>
           </div>
@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 
-const ResultPage = ({ recommendation, weather, onBack, onGetRecipe, onFindRestaurant }) => {
+const ResultPage = ({ recommendation, weather, onBack, onAccept, onGetRecipe, onFindRestaurant }) => {
   const [showOptions, setShowOptions] = useState(false);
 
   if (!recommendation) return null;
@@ -90,7 +90,10 @@ const ResultPage = ({ recommendation, weather, onBack, onGetRecipe, onFindRestau
         {/* 선택 버튼 */}
         {!showOptions ? (
           <button
-            onClick={() => setShowOptions(true)}
+            onClick={() => {
+              setShowOptions(true);
+              onAccept?.();
+            }}
             className="w-full bg-gradient-to-r from-purple-500 to-pink-500 text-white py-4 rounded-lg font-bold text-xl hover:from-purple-600 hover:to-pink-600 transition-all transform hover:scale-105 shadow-lg"
           >
             다음 단계 ➡️
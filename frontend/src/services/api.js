@@ -9,6 +9,34 @@ const api = axios.create({
   },
 });
 
+// 같은 요청을 다시 보낼 때(네트워크 오류 재시도) 같은 키를 쓰면 서버가 한 번만 처리하고 결과를 재사용
+const newIdempotencyKey = () =>
+  (globalThis.crypto?.randomUUID?.() ?? `${Date.now()}-${Math.random().toString(36).slice(2)}`);
+
+// 서버가 혼잡하다고 응답(429)하면 Retry-After만큼(최대 이 시간, 초) 기다렸다가 다시 요청
+const MAX_RETRY_AFTER_SECONDS = 5;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const postIdempotent = async (url, data, retries = 1) => {
+  const headers = { 'Idempotency-Key': newIdempotencyKey() };
+  for (let attempt = 0; ; attempt += 1) {
+    try {
+      return await api.post(url, data, { headers });
+    } catch (err) {
+      if (attempt >= retries) throw err;
+      if (err.response?.status === 429) {
+        const retryAfter = Number(err.response.headers['retry-after'] || 1);
+        if (retryAfter > MAX_RETRY_AFTER_SECONDS) throw err;
+        await sleep(retryAfter * 1000);
+        continue;
+      }
+      // 그 밖에는 응답을 받지 못한 경우만 같은 키로 재시도
+      if (err.response) throw err;
+    }
+  }
+};
+
 export const weatherAPI = {
   getWeather: async (location) => {
     const response = await api.get(`/api/weather?location=${location}`);
@@ -18,14 +46,22 @@ export const weatherAPI = {
 
 export const recommendAPI = {
   getRecommendation: async (data) => {
-    const response = await api.post('/api/recommend', data);
+    const response = await postIdempotent('/api/recommend', data);
+    return response.data;
+  },
+};
+
+// 날씨 + 추천 + 추천 메뉴 레시피를 한 번에 (레시피가 제때 준비되지 않으면 recipe는 null)
+export const lunchAPI = {
+  getLunch: async (data) => {
+    const response = await postIdempotent('/api/lunch', data);
     return response.data;
   },
 };
 
 export const recipeAPI = {
   getRecipe: async (menuName, numServings = 1) => {
-    const response = await api.post('/api/recipe', {
+    const response = await postIdempotent('/api/recipe', {
       menu_name: menuName,
       num_servings: numServings
     });
@@ -33,5 +69,68 @@ export const recipeAPI = {
   },
 };
 
+// 추천 피드백 (accept, reject, recipe_click, restaurant_click: 랭킹 모델 학습 데이터, 실패해도 무시)
+export const feedbackAPI = {
+  send: async (recommendationId, event) => {
+    if (!recommendationId) return;
+    try {
+      await api.post('/api/feedback', { recommendation_id: recommendationId, event });
+    } catch (err) {
+      console.error('피드백 전송 실패:', err);
+    }
+  },
+};
+
+// 주변 음식점 (백엔드가 카카오 검색 결과를 위치별로 캐시, 거리순 페이지)
+export const restaurantAPI = {
+  search: async (menu, location, { page = 1, size = 15, radius } = {}) => {
+    const response = await api.get('/api/restaurants', {
+      params: { menu, location, page, size, radius }
+    });
+    return response.data;
+  },
+};
+
+// 실시간 알림 (WebSocket /ws/live): 위치 격자의 날씨 변경, 그룹 추천 결과
+// 연결이 끊기면 다시 연결하고, 반환한 함수를 호출하면 구독 종료
+export const subscribeLive = ({ location, group, onWeather, onRecommendation, onError }) => {
+  const params = new URLSearchParams();
+  if (location) params.set('location', location);
+  if (group) params.set('group', group);
+  const url = `${API_BASE_URL.replace(/^http/, 'ws')}/ws/live?${params}`;
+  let socket = null;
+  let stopped = false;
+  let retryDelay = 1000;
+
+  const connect = () => {
+    socket = new WebSocket(url);
+    socket.onopen = () => {
+      retryDelay = 1000;
+    };
+    socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === 'weather') onWeather?.(message.data);
+      if (message.type === 'recommendation') onRecommendation?.(message.data);
+    };
+    socket.onclose = (event) => {
+      if (stopped) return;
+      // 그룹 인원 초과(1008)는 다시 연결하지 않음
+      if (event.code === 1008) {
+        onError?.(event.reason || '그룹에 참가할 수 없습니다.');
+        return;
+      }
+      onError?.('실시간 연결이 끊어졌습니다.');
+      setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, 30000);
+    };
+  };
+
+  connect();
+  return () => {
+    stopped = true;
+    socket?.close();
+  };
+};
+
 export default api;
 